@@ -0,0 +1,274 @@
+# BatchRunner.py
+# ===========================================================
+# Summarize every tracked repository in one pipelined run
+# -----------------------------------------------------------
+# - Fetch stage: several repos are fetched from GitHub at the same
+#   time (Summarizer.fetch_jobs) and handed over through a bounded
+#   queue, so fetching never runs far ahead of the model
+# - Inference stage: takes whatever repos are ready (up to
+#   infer_batch_repos) and generates their summaries as one batch
+#   (Summarizer.generate_jobs) while the next repos are fetched
+# - Summaries that an API request is already computing are not
+#   generated again: the run takes that request's result, and API
+#   requests for a repo the run is working on wait for the run
+#   (Summarizer.claim_jobs / in_flight)
+# - Progress is saved after every repo (summaries/_batch/progress.json);
+#   an interrupted run resumes with the repos it had not finished
+# - Ends with a throughput report (repos/hour, output tokens/sec)
+#
+# Usage:
+#   python BatchRunner.py [--repos owner/repo ...] [--modes readme commits ...]
+#                         [--fetch-workers 4] [--queue-size 4] [--infer-batch-repos 1]
+#                         [--force] [--no-resume]
+# ===========================================================
+
+import argparse
+import os
+import queue
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from DAL.BatchProgress_Repository import BatchProgressRepository
+from DAL.GithubRepositoriesList_Repository import get_repositories
+from Summarizer import SUMMARY_MODES, Summarizer
+
+BATCH_FETCH_WORKERS = int(os.getenv("BATCH_FETCH_WORKERS", "4"))
+BATCH_QUEUE_SIZE = int(os.getenv("BATCH_QUEUE_SIZE", "4"))
+BATCH_INFER_REPOS = int(os.getenv("BATCH_INFER_REPOS", "1"))
+
+
+class BatchRunner:
+    def __init__(self,
+                 summarizer: Optional[Summarizer] = None,
+                 fetch_workers: int = BATCH_FETCH_WORKERS,
+                 queue_size: int = BATCH_QUEUE_SIZE,
+                 infer_batch_repos: int = BATCH_INFER_REPOS,
+                 progress: Optional[BatchProgressRepository] = None):
+        self.summarizer = summarizer or Summarizer()
+        self.fetch_workers = max(1, fetch_workers)
+        self.queue_size = max(1, queue_size)
+        self.infer_batch_repos = max(1, infer_batch_repos)
+        self.progress = progress or BatchProgressRepository()
+
+    def run(self, repositories: Optional[List[str]] = None, modes=SUMMARY_MODES,
+            force: bool = False, resume: bool = True) -> dict:
+        """
+        Summarize the given repos ("owner/repo"; default: the tracked list).
+        Returns the throughput report.
+        """
+        # Listed twice, a repo's second fetch would wait on the claim of its first
+        repositories = list(dict.fromkeys(repositories or get_repositories()))
+        invalid = [name for name in repositories if not _is_repo_name(name)]
+        if invalid:
+            raise ValueError(f"Expected owner/repo names, got: {', '.join(map(repr, invalid))}")
+        state = self._load_or_start(modes, resume)
+        todo = [name for name in repositories if name not in state["done"]]
+        skipped = len(repositories) - len(todo)
+        if skipped:
+            print(f"⏩ Resuming run {state['run_id']}: {skipped} repo(s) already done", flush=True)
+        print(f"🚀 Batch run {state['run_id']}: {len(todo)} repo(s), modes {list(modes)}", flush=True)
+
+        # (repo_name, owned jobs, prepared jobs or None, jobs computed elsewhere, fetch seconds, error)
+        ready: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stats = {"started": time.time(), "infer_seconds": 0.0, "output_tokens": 0,
+                 "generated": 0, "reused": 0, "shared": 0, "processed": 0}
+
+        stop = threading.Event()
+        pool = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix="batch-fetch")
+        try:
+            for name in todo:
+                pool.submit(self._fetch, name, modes, force, ready, stop)
+
+            while stats["processed"] < len(todo):
+                items = [ready.get()]
+                # Repos that are already fetched join the same generation batch
+                while len(items) < self.infer_batch_repos:
+                    try:
+                        items.append(ready.get_nowait())
+                    except queue.Empty:
+                        break
+                self._infer(items, force, state, stats, len(todo))
+        finally:
+            # On an interrupt, fetch workers waiting for queue space give up
+            stop.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+            # Fetched but never generated: let requests waiting for these take over
+            while not ready.empty():
+                self.summarizer.settle_jobs(ready.get_nowait()[1], error=KeyboardInterrupt())
+
+        state["finished"] = True
+        self.progress.save(state)
+        report = self._report(state, stats, len(todo))
+        self._print_report(report)
+        return report
+
+    # -------------------------------------------------------
+    # Stages
+    # -------------------------------------------------------
+    def _fetch(self, name: str, modes, force: bool, ready: queue.Queue, stop: threading.Event):
+        started = time.time()
+        # Every repo hands over exactly one item, or run() would wait for it forever
+        item = (name, [], None, [], 0.0, "fetch did not complete")
+        owned = []
+        try:
+            owner, repo = name.split("/", 1)
+            # Jobs another request is computing are not fetched; their results are awaited in _infer
+            owned, waiting = self.summarizer.claim_jobs([(owner, repo, mode) for mode in modes], force)
+            prepared = self.summarizer.fetch_jobs([key for key, _ in owned], force)
+            item = (name, owned, prepared, waiting, time.time() - started, None)
+        except BaseException as ex:
+            self.summarizer.settle_jobs(owned, error=ex)
+            item = (name, [], None, [], time.time() - started, str(ex) or type(ex).__name__)
+        finally:
+            self._hand_over(item, ready, stop)
+
+    def _hand_over(self, item: tuple, ready: queue.Queue, stop: threading.Event):
+        # Blocks while the queue is full (inference is behind), so fetching does not run ahead
+        while not stop.is_set():
+            try:
+                ready.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+        self.summarizer.settle_jobs(item[1], error=KeyboardInterrupt())  # run stopped
+
+    def _infer(self, items: list, force: bool, state: dict, stats: dict, total: int):
+        fetched = [item for item in items if not item[5]]
+        for name, _, _, _, _, error in items:
+            if error:
+                self._mark_failed(name, f"fetch: {error}", state, stats, total)
+
+        if not fetched:
+            return
+        started = time.time()
+        try:
+            self.summarizer.generate_jobs([job for item in fetched for job in item[2]])
+        except BaseException as ex:
+            for item in fetched:
+                self.summarizer.settle_jobs(item[1], error=ex)
+            if not isinstance(ex, Exception):
+                raise
+            for item in fetched:
+                self._mark_failed(item[0], f"inference: {ex}", state, stats, total)
+            return
+        for _, owned, prepared, _, _, _ in fetched:
+            self.summarizer.settle_jobs(owned, [job["response"] for job in prepared])
+        infer_seconds = time.time() - started
+        stats["infer_seconds"] += infer_seconds
+
+        for name, _, prepared, waiting, fetch_seconds, _ in fetched:
+            try:
+                shared = self._await_shared(waiting, force)
+            except Exception as ex:
+                self._mark_failed(name, f"shared request: {ex}", state, stats, total)
+                continue
+            tokens = sum(job["output_tokens"] for job in prepared)
+            generated = sum(1 for job in prepared if job["prompt"] is not None and not job["unchanged"])
+            stats["output_tokens"] += tokens
+            stats["generated"] += generated
+            stats["reused"] += sum(1 for job in prepared if job["unchanged"])
+            stats["shared"] += shared
+            stats["processed"] += 1
+            state["done"][name] = {
+                "fetch_seconds": round(fetch_seconds, 2),
+                "infer_seconds": round(infer_seconds, 2),  # shared by the repos of one batch
+                "output_tokens": tokens,
+                "generated": generated,
+            }
+            state["failed"].pop(name, None)
+            self.progress.save(state)
+            print(f"✅ [{stats['processed']}/{total}] {name}: fetch {fetch_seconds:.1f}s, "
+                  f"infer {infer_seconds:.1f}s, {generated} generated, {tokens} tokens", flush=True)
+
+    def _await_shared(self, waiting: list, force: bool) -> int:
+        """Wait for this repo's jobs that other requests were computing; returns how many there were."""
+        _, retry = self.summarizer.await_jobs(waiting, force)
+        if retry:
+            # The other request gave up, or did not force: compute these here
+            self.summarizer.summarize_batch(retry, force)
+        return len(waiting)
+
+    def _mark_failed(self, name: str, error: str, state: dict, stats: dict, total: int):
+        stats["processed"] += 1
+        state["failed"][name] = error
+        self.progress.save(state)
+        print(f"❌ [{stats['processed']}/{total}] {name}: {error}", flush=True)
+
+    # -------------------------------------------------------
+    # Progress / report
+    # -------------------------------------------------------
+    def _load_or_start(self, modes, resume: bool) -> dict:
+        state = self.progress.load() if resume else None
+        if state and not state.get("finished") and state.get("modes") == list(modes):
+            return state
+        return self.progress.start(modes)
+
+    @staticmethod
+    def _report(state: dict, stats: dict, total: int) -> dict:
+        elapsed = time.time() - stats["started"]
+        succeeded = total - sum(1 for name in state["failed"] if name not in state["done"])
+        return {
+            "run_id": state["run_id"],
+            "repos": total,
+            "succeeded": succeeded,
+            "failed": dict(state["failed"]),
+            "summaries_generated": stats["generated"],
+            "summaries_reused": stats["reused"],
+            "summaries_shared": stats["shared"],
+            "elapsed_seconds": round(elapsed, 1),
+            "inference_seconds": round(stats["infer_seconds"], 1),
+            "output_tokens": stats["output_tokens"],
+            "repos_per_hour": round(succeeded / elapsed * 3600, 1) if elapsed > 0 else 0.0,
+            "tokens_per_second": round(stats["output_tokens"] / elapsed, 1) if elapsed > 0 else 0.0,
+            "inference_tokens_per_second": (round(stats["output_tokens"] / stats["infer_seconds"], 1)
+                                            if stats["infer_seconds"] > 0 else 0.0),
+        }
+
+    @staticmethod
+    def _print_report(report: dict):
+        print("", flush=True)
+        print("📊 Batch run report", flush=True)
+        print(f"   repos:        {report['succeeded']}/{report['repos']} succeeded, "
+              f"{len(report['failed'])} failed", flush=True)
+        print(f"   summaries:    {report['summaries_generated']} generated, "
+              f"{report['summaries_reused']} unchanged, "
+              f"{report['summaries_shared']} from concurrent requests", flush=True)
+        print(f"   elapsed:      {report['elapsed_seconds']}s "
+              f"({report['inference_seconds']}s in inference)", flush=True)
+        print(f"   throughput:   {report['repos_per_hour']} repos/hour, "
+              f"{report['tokens_per_second']} tokens/sec "
+              f"({report['inference_tokens_per_second']} tokens/sec while generating)", flush=True)
+
+
+def _is_repo_name(name) -> bool:
+    parts = name.split("/") if isinstance(name, str) else []
+    return len(parts) == 2 and all(part.strip() for part in parts)
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description="Summarize the tracked GitHub repositories.")
+    parser.add_argument("--repos", nargs="*", help="owner/repo names (default: tracked repository list)")
+    parser.add_argument("--modes", nargs="*", default=list(SUMMARY_MODES), choices=SUMMARY_MODES)
+    parser.add_argument("--fetch-workers", type=int, default=BATCH_FETCH_WORKERS,
+                        help="repos fetched from GitHub at the same time")
+    parser.add_argument("--queue-size", type=int, default=BATCH_QUEUE_SIZE,
+                        help="fetched repos waiting for inference before fetching pauses")
+    parser.add_argument("--infer-batch-repos", type=int, default=BATCH_INFER_REPOS,
+                        help="ready repos generated together in one batch")
+    parser.add_argument("--force", action="store_true", help="regenerate even when inputs are unchanged")
+    parser.add_argument("--no-resume", action="store_true", help="start a new run instead of resuming")
+    args = parser.parse_args(argv)
+    invalid = [name for name in args.repos or [] if not _is_repo_name(name)]
+    if invalid:
+        parser.error(f"--repos expects owner/repo names, got: {', '.join(invalid)}")
+
+    runner = BatchRunner(fetch_workers=args.fetch_workers, queue_size=args.queue_size,
+                         infer_batch_repos=args.infer_batch_repos)
+    return runner.run(args.repos, modes=tuple(args.modes), force=args.force, resume=not args.no_resume)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# DAL/BatchProgress_Repository.py
+
+import os
+import json
+import threading
+import time
+
+class BatchProgressRepository:
+    """
+    Progress of the current batch run, so an interrupted run can resume
+    where it stopped. Stored in one file:
+        summaries/_batch/progress.json
+    {
+        "run_id": "20261017-142501",
+        "started_at": 1760700301.2,
+        "finished": false,
+        "modes": ["readme", "commits", "issues", "pulls"],
+        "done": {"owner/repo": {"fetch_seconds": 1.2, "infer_seconds": 30.5, "output_tokens": 812}},
+        "failed": {"owner/repo": "error message"}
+    }
+    """
+
+    def __init__(self, base_dir=os.path.join("summaries", "_batch")):
+        self.base_dir = base_dir
+        self._lock = threading.Lock()
+
+    def _get_file_path(self) -> str:
+        os.makedirs(self.base_dir, exist_ok=True)
+        return os.path.join(self.base_dir, "progress.json")
+
+    def load(self):
+        """
+        Returns the stored progress, or None if there is none (or it is unreadable).
+        """
+        file_path = self._get_file_path()
+        if not os.path.exists(file_path):
+            return None
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            print("⚠️ Batch progress file unreadable, starting a new run.", flush=True)
+            return None
+
+    def start(self, modes: list) -> dict:
+        progress = {
+            "run_id": time.strftime("%Y%m%d-%H%M%S"),
+            "started_at": time.time(),
+            "finished": False,
+            "modes": list(modes),
+            "done": {},
+            "failed": {},
+        }
+        self.save(progress)
+        return progress
+
+    def save(self, progress: dict):
+        with self._lock:
+            file_path = self._get_file_path()
+
+            # Write then rename, so a crash never leaves a half-written file
+            tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(progress, f, indent=4)
+            os.replace(tmp_path, file_path)
@@ -0,0 +1,114 @@
+# DAL/Cassette_Repository.py
+
+import os
+import json
+import hashlib
+import threading
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+# Transport-level headers that no longer match once the body is stored decoded
+_DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie")
+
+class CassetteRepository:
+    """
+    Recorded GitHub API interactions, for replaying them offline.
+    One JSON file per cassette:
+        cassettes/<name>.json
+    {
+        "base_url": "https://api.github.com",
+        "interactions": [
+            {
+                "request": {"method": "GET", "path": "/repos/o/r", "query": "per_page=10", "body": null},
+                "response": {"status": 200, "headers": {...}, "body": "..."}
+            }
+        ]
+    }
+    Request headers (and so credentials) are never stored.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._data = self._load()
+        self._index = {}   # key → recorded responses, in recording order
+        self._cursor = {}  # key → index of the next response to replay
+        for entry in self.interactions:
+            self._add_to_index(entry)
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.file_path):
+            return {"base_url": None, "interactions": []}
+        with open(self.file_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @property
+    def base_url(self) -> str:
+        return self._data.get("base_url")
+
+    @property
+    def interactions(self) -> list:
+        return self._data["interactions"]
+
+    @staticmethod
+    def make_key(method: str, path: str, query: str, body) -> str:
+        """Method + path + query (parameter order ignored) + hash of the JSON body, if any."""
+        query = urlencode(sorted(parse_qsl(query or "", keep_blank_values=True)))
+        key = f"{method.upper()} {path}?{query}"
+        if body:
+            normalized = json.dumps(json.loads(body) if isinstance(body, (str, bytes)) else body, sort_keys=True)
+            key += " " + hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+        return key
+
+    def record(self, response):
+        """
+        Append an httpx response. 304s are skipped: replay answers conditional
+        requests itself from the recorded validators.
+        """
+        if response.status_code == 304:
+            return
+        request = response.request
+        url = urlsplit(str(request.url))
+        body = request.content.decode("utf-8") if request.content else None
+        entry = {
+            "request": {"method": request.method, "path": url.path, "query": url.query, "body": body},
+            "response": {
+                "status": response.status_code,
+                "headers": {name: value for name, value in response.headers.items()
+                            if name.lower() not in _DROPPED_HEADERS},
+                "body": response.text,
+            },
+        }
+        with self._lock:
+            if not self._data.get("base_url"):
+                self._data["base_url"] = f"{url.scheme}://{url.netloc}"
+            self.interactions.append(entry)
+            self._add_to_index(entry)
+            self._save()
+
+    def next_response(self, method: str, path: str, query: str, body):
+        """
+        Recorded response for a request, or None. Repeated requests get the
+        recorded answers in order; the last one is repeated after that.
+        """
+        key = self.make_key(method, path, query, body)
+        with self._lock:
+            responses = self._index.get(key)
+            if not responses:
+                return None
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            return responses[min(index, len(responses) - 1)]
+
+    def _add_to_index(self, entry: dict):
+        request = entry["request"]
+        key = self.make_key(request["method"], request["path"], request["query"], request["body"])
+        self._index.setdefault(key, []).append(entry["response"])
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+
+        # Write then rename, so readers never see a half-written file
+        tmp_path = f"{self.file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, indent=4)
+        os.replace(tmp_path, self.file_path)
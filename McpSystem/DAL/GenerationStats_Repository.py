@@ -0,0 +1,58 @@
+# DAL/GenerationStats_Repository.py
+
+import os
+import json
+import threading
+
+class GenerationStatsRepository:
+    """
+    Keeps the output length (in tokens) of recent summaries per mode.
+    Stored in one file:
+        summaries/_stats/generation_lengths.json
+    {
+        "<mode>": [{"tokens": 312, "truncated": false}, ...]
+    }
+    """
+
+    def __init__(self, base_dir=os.path.join("summaries", "_stats"), max_samples=100):
+        self.base_dir = base_dir
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+
+    def _get_file_path(self) -> str:
+        os.makedirs(self.base_dir, exist_ok=True)
+        return os.path.join(self.base_dir, "generation_lengths.json")
+
+    def _load_all(self) -> dict:
+        file_path = self._get_file_path()
+        if not os.path.exists(file_path):
+            return {}
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            print("⚠️ Generation stats file unreadable, starting over.", flush=True)
+            return {}
+
+    def record_length(self, mode: str, tokens: int, truncated: bool):
+        """
+        Append one sample for the mode, keeping only the newest max_samples.
+        """
+        with self._lock:
+            data = self._load_all()
+            samples = data.setdefault(mode, [])
+            samples.append({"tokens": tokens, "truncated": truncated})
+            data[mode] = samples[-self.max_samples:]
+
+            file_path = self._get_file_path()
+            tmp_path = f"{file_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4)
+            os.replace(tmp_path, file_path)
+
+    def get_samples(self, mode: str) -> list:
+        """
+        Returns the recorded samples for a mode (oldest first), or [] if none.
+        """
+        with self._lock:
+            return self._load_all().get(mode, [])
@@ -0,0 +1,58 @@
+# DAL/HttpCache_Repository.py
+
+import os
+import json
+import hashlib
+import threading
+
+class HttpCacheRepository:
+    """
+    Stores GitHub API responses with their validators (ETag / Last-Modified)
+    so later requests can be revalidated instead of downloaded again.
+    Files are stored under:
+        cache/http/<key[:2]>/<key>.json
+    {
+        "url": "...",
+        "etag": "...",
+        "last_modified": "...",
+        "headers": {...},
+        "body": "..."
+    }
+    """
+
+    def __init__(self, base_dir=os.path.join("cache", "http")):
+        self.base_dir = base_dir
+
+    @staticmethod
+    def make_key(url: str, variant: str = "") -> str:
+        """
+        variant separates responses that differ per caller for the same URL
+        (e.g. a hash of the credential in use).
+        """
+        return hashlib.sha256(f"{variant}|{url}".encode("utf-8")).hexdigest()
+
+    def _get_file_path(self, key: str) -> str:
+        return os.path.join(self.base_dir, key[:2], f"{key}.json")
+
+    def load_entry(self, key: str):
+        """
+        Returns the cached entry, or None if there is none (or it is unreadable).
+        """
+        file_path = self._get_file_path(key)
+        if not os.path.exists(file_path):
+            return None
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_entry(self, key: str, entry: dict):
+        file_path = self._get_file_path(key)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        # Write then rename, so readers never see a half-written file
+        tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, file_path)
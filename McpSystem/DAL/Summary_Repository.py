@@ -2,6 +2,7 @@
 
 import os
 import json
+import threading
 from datetime import datetime
 
 class SummaryRepository:
@@ -27,15 +28,22 @@ class SummaryRepository:
         data should now be a dict:
         {
             "metadata": {},
-            "summary": "..."
+            "summary": "...",
+            "high_water": ...,      # where the next incremental fetch starts
+            "fingerprint": "...",   # hash of the inputs the summary was generated from
+            "version": "..."        # model + prompt version
         }
         """
         folder_path = os.path.join("summaries", repo_name)
         os.makedirs(folder_path, exist_ok=True)
 
         file_path = os.path.join(folder_path, f"{summary_type}_summary.json")
-        with open(file_path, "w", encoding="utf-8") as f:
+
+        # Write then rename, so a reader never sees a half-written file
+        tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=4)
+        os.replace(tmp_path, file_path)
 
     def load_summary(self, repo_name: str, summary_type: str):
         """
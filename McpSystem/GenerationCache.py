@@ -0,0 +1,134 @@
+# GenerationCache.py
+# Role: Content-addressed cache of generated text.
+#
+# Keys are a SHA-256 over everything that determines the output
+# (model, adapter, precision, prompt, sampling params, seed). Two tiers:
+#   - memory: bounded LRU of recent entries
+#   - disk:   one JSON file per key under cache_dir, evicted oldest-first
+#             once the tier grows past max_disk_bytes
+# Only deterministic generations (greedy, or sampling with a fixed seed)
+# should be stored, otherwise a hit would not match a fresh run.
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Optional
+
+DEFAULT_CACHE_DIR = os.path.join("cache", "generations")
+
+
+class GenerationCache:
+    def __init__(self,
+                 cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_memory_items: int = 256,
+                 max_disk_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = None  # computed lazily on first write
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(**parts) -> str:
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # -------------------------------------------------------
+    # Lookup / store
+    # -------------------------------------------------------
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = json.load(f)["text"]
+            os.utime(path)  # mark as recently used for eviction order
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self._remember(key, text)
+        return text
+
+    def put(self, key: str, text: str):
+        with self._lock:
+            self._remember(key, text)
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "text": text, "created_at": time.time()}, f)
+        existing = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(tmp_path, path)  # atomic, safe with several workers sharing the directory
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += os.path.getsize(path) - existing
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def stats(self) -> dict:
+        return {
+            "memory_items": len(self._memory),
+            "disk_bytes": self._disk_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    # -------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _remember(self, key: str, text: str):
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _disk_entries(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, st.st_mtime, st.st_size
+
+    def _scan_disk_bytes(self) -> int:
+        return sum(size for _, _, size in self._disk_entries())
+
+    def _evict_disk(self):
+        """Remove least recently used files until the tier is back to 90% of its limit."""
+        target = int(self.max_disk_bytes * 0.9)
+        for path, _, size in sorted(self._disk_entries(), key=lambda entry: entry[1]):
+            if self._disk_bytes <= target:
+                break
+            try:
+                os.remove(path)
+                self._disk_bytes -= size
+            except OSError:
+                pass
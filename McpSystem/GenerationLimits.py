@@ -0,0 +1,141 @@
+# GenerationLimits.py
+# Role: Decide when a summary is done.
+#
+#   - SectionStopper: stop criterion for the ModelCore decode loop. Every
+#     summary template ends with a known section ("Final Verdict",
+#     "Overall Impact", ...); once that section has content and is closed
+#     (blank line or a new heading), the answer is complete. Restarting the
+#     template from the first heading counts as done too.
+#   - AdaptiveTokenBudget: max_new_tokens per mode, learned from the lengths
+#     of past summaries instead of a flat 400.
+#   - finalize_summary: cleanup of the decoded text (drop repeated template,
+#     drop a half-written last line when the budget ran out).
+
+import math
+import re
+
+from typing import Dict, List, Optional
+
+from DAL.GenerationStats_Repository import GenerationStatsRepository
+from PromptTemplates import SECTION_HEADERS
+
+# Budget used until a mode has enough recorded samples
+DEFAULT_MAX_NEW_TOKENS = 400
+
+# Learned budgets are kept inside these bounds
+MIN_MAX_NEW_TOKENS = 160
+MAX_MAX_NEW_TOKENS = 768
+
+# Samples needed before the learned budget replaces the default
+MIN_SAMPLES = 5
+
+# Headroom over the 95th percentile of past lengths
+BUDGET_HEADROOM = 1.2
+
+# A line that starts a new section: markdown heading or bold label
+_HEADING_LINE = re.compile(r"^\s*(#{1,6}\s|\*\*)")
+
+
+def _heading_pattern(header: str):
+    """
+    A heading line for one section: "## ✅ Header", "**1. 🚀 Header**",
+    "1. **Header:**", "#### Header: 9/10", "## Header (1–10 score)".
+    The header must open the heading text, so body lines that merely
+    mention a section name do not count.
+    """
+    return re.compile(
+        r"^[ \t]*(?:#{1,6}[ \t]+|\*\*|\d+[.)][ \t]+)"   # heading / bold / numbered line
+        r"[^\w\n]*(?:\d+[.)][ \t]*)?[^\w\n]*"          # number, emoji, bold markers
+        rf"{re.escape(header)}\b"
+        r"(?:[ \t]*[:(/–-][^\n]*)?[ \t*:]*$",          # optional suffix, closing markers
+        re.MULTILINE | re.IGNORECASE,
+    )
+
+
+class SectionStopper:
+    """
+    Stop check for one summary mode. Called by ModelCore with the text decoded
+    so far each time a line is completed; returns True when the answer is done.
+    """
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        headers = SECTION_HEADERS[mode]
+        self._first = _heading_pattern(headers[0])
+        self._final = _heading_pattern(headers[-1])
+
+    def __repr__(self) -> str:
+        # Stable text, part of the generation cache key
+        return f"SectionStopper({self.mode!r})"
+
+    def __call__(self, text: str) -> bool:
+        if len(self._first.findall(text)) > 1:
+            return True  # model started the template over
+
+        match = None
+        for match in self._final.finditer(text):
+            pass
+        if match is None:
+            return False
+
+        lines = text[match.end():].split("\n")
+        seen_content = False
+        for line in lines[:-1]:  # the last entry is the line still being written
+            if not line.strip():
+                if seen_content:
+                    return True  # blank line after content closes the section
+                continue
+            if seen_content and _HEADING_LINE.match(line):
+                return True  # a new section started after the final one
+            seen_content = True
+        return False
+
+
+class AdaptiveTokenBudget:
+    """
+    max_new_tokens per mode from the 95th percentile of recent output lengths.
+    Truncated samples only tell us the real length was larger, so they count
+    with extra weight to push the budget up.
+    """
+
+    def __init__(self, repository: Optional[GenerationStatsRepository] = None):
+        self.repository = repository or GenerationStatsRepository()
+        self._budgets: Dict[str, int] = {}
+
+    def max_new_tokens(self, mode: str) -> int:
+        if mode not in self._budgets:
+            self._budgets[mode] = self._learn(self.repository.get_samples(mode))
+        return self._budgets[mode]
+
+    def record(self, mode: str, tokens: int, truncated: bool):
+        self.repository.record_length(mode, tokens, truncated)
+        self._budgets.pop(mode, None)  # relearn on next use
+
+    @staticmethod
+    def _learn(samples: List[dict]) -> int:
+        if len(samples) < MIN_SAMPLES:
+            return DEFAULT_MAX_NEW_TOKENS
+
+        lengths = sorted(
+            int(s["tokens"] * (1.5 if s.get("truncated") else 1.0)) for s in samples
+        )
+        p95 = lengths[min(len(lengths) - 1, math.ceil(0.95 * len(lengths)) - 1)]
+        budget = int(p95 * BUDGET_HEADROOM)
+        return max(MIN_MAX_NEW_TOKENS, min(MAX_MAX_NEW_TOKENS, budget))
+
+
+def finalize_summary(text: str, mode: str, truncated: bool) -> str:
+    """
+    Drop a restarted template (second copy of the first heading) and, when the
+    budget cut the answer off, the unfinished last line.
+    """
+    first = _heading_pattern(SECTION_HEADERS[mode][0])
+    matches = list(first.finditer(text))
+    if len(matches) > 1:
+        text = text[:matches[1].start()]
+        truncated = False  # everything before the repeat is complete
+
+    text = text.rstrip()
+    if truncated and "\n" in text:
+        text = text[:text.rfind("\n")].rstrip()
+    return text
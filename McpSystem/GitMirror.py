@@ -0,0 +1,163 @@
+# GitMirror.py
+# ===========================================================
+# Local git mirrors as a source of commit history
+# -----------------------------------------------------------
+# - One partial (blobless) bare clone per tracked repo under
+#   cache/git/<owner>/<repo>.git: commits and trees only, so even
+#   large repos stay small on disk
+# - Later calls update it with an incremental `git fetch`, at most
+#   once per GIT_FETCH_INTERVAL_SECONDS
+# - History is read with `git log` from disk: no API quota, no page
+#   limit, and per-commit file changes (read from the trees, so no
+#   blob is ever downloaded; hence file counts, not line counts)
+# - Enabled with GITHUB_COMMIT_SOURCE=git (default api).
+#   GIT_CLONE_URL may point at another host or a local folder of
+#   bare repos (<folder>/<owner>/<repo>.git)
+# ===========================================================
+
+import base64
+import os
+import subprocess
+import threading
+import time
+
+from typing import Dict, List, Optional
+
+# "api" (REST / GraphQL) or "git" (local mirror)
+GITHUB_COMMIT_SOURCE = os.getenv("GITHUB_COMMIT_SOURCE", "api").lower()
+
+GIT_CLONE_URL = os.getenv("GIT_CLONE_URL", "https://github.com")
+GIT_MIRROR_DIR = os.getenv("GIT_MIRROR_DIR", os.path.join("cache", "git"))
+GIT_FETCH_INTERVAL_SECONDS = float(os.getenv("GIT_FETCH_INTERVAL_SECONDS", "300"))
+GIT_TIMEOUT_SECONDS = float(os.getenv("GIT_TIMEOUT_SECONDS", "600"))
+
+# Commits read per summary; PromptBuilder still trims to the token budget
+GIT_COMMIT_HISTORY_LIMIT = int(os.getenv("GIT_COMMIT_HISTORY_LIMIT", "100"))
+
+# Separators for parsing `git log` output (record / field)
+_RS, _FS = "\x1e", "\x1f"
+
+
+class GitMirrorError(Exception):
+    pass
+
+
+class GitMirror:
+    def __init__(self,
+                 base_dir: str = GIT_MIRROR_DIR,
+                 clone_url: str = GIT_CLONE_URL,
+                 fetch_interval: float = GIT_FETCH_INTERVAL_SECONDS,
+                 token: Optional[str] = None):
+        self.base_dir = base_dir
+        self.clone_url = clone_url.rstrip("/")
+        self.fetch_interval = fetch_interval
+        self.token = token if token is not None else os.getenv("GITHUB_TOKEN")
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self._fetched_at: Dict[str, float] = {}
+
+    # -------------------------------------------------------
+    # Mirror management
+    # -------------------------------------------------------
+    def mirror_path(self, owner: str, repo: str) -> str:
+        return os.path.join(self.base_dir, owner, f"{repo}.git")
+
+    def sync(self, owner: str, repo: str, force: bool = False) -> str:
+        """Clone the repo on first use, fetch new commits afterwards. Returns the mirror path."""
+        path = self.mirror_path(owner, repo)
+        with self._lock_for(path):
+            if not os.path.isdir(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                print(f"📥 Cloning {owner}/{repo} (blobless) into {path}", flush=True)
+                self._git(None, "clone", "--bare", "--filter=blob:none", "--no-tags",
+                          self.remote_url(owner, repo), path)
+                # A bare clone has no fetch refspec; keep branches up to date on fetch
+                self._git(path, "config", "remote.origin.fetch", "+refs/heads/*:refs/heads/*")
+                self._fetched_at[path] = time.time()
+            elif force or time.time() - self._fetched_at.get(path, 0.0) >= self.fetch_interval:
+                self._git(path, "fetch", "--prune", "--no-tags", "--filter=blob:none", "origin")
+                self._fetched_at[path] = time.time()
+        return path
+
+    def remote_url(self, owner: str, repo: str) -> str:
+        return f"{self.clone_url}/{owner}/{repo}.git"
+
+    # -------------------------------------------------------
+    # History
+    # -------------------------------------------------------
+    def get_commit_items(self, owner: str, repo: str, limit: int = GIT_COMMIT_HISTORY_LIMIT,
+                         since: str = None, stop_sha: str = None) -> List[dict]:
+        """
+        Newest commits of the default branch first, same shape as
+        GithubApi.get_commit_items_async plus the changed files:
+        {"sha", "message", "date", "files": [{"status", "path"}], "stats": {...}}.
+        stop_sha / since: only commits after a previous high-water mark.
+        """
+        path = self.sync(owner, repo)
+        args = ["log", f"--max-count={limit}", "--no-renames", "--name-status",
+                f"--format={_RS}%H{_FS}%cI{_FS}%B{_FS}"]
+        if stop_sha and self._has_commit(path, stop_sha):
+            args.append(f"{stop_sha}..HEAD")
+        else:
+            if since:
+                args.append(f"--since={since}")
+            args.append("HEAD")
+
+        with self._lock_for(path):
+            output = self._git(path, *args)
+        return [self._parse_commit(record) for record in output.split(_RS) if record.strip()]
+
+    @staticmethod
+    def _parse_commit(record: str) -> dict:
+        sha, date, message, changes = record.split(_FS, 3)
+        files = []
+        for line in changes.strip().splitlines():
+            status, _, file_path = line.partition("\t")
+            if file_path:
+                files.append({"status": status, "path": file_path})
+        stats = {"files_changed": len(files)}
+        for status, name in (("A", "added"), ("M", "modified"), ("D", "deleted")):
+            stats[name] = sum(1 for f in files if f["status"].startswith(status))
+        return {"sha": sha, "message": message.strip(), "date": date, "files": files, "stats": stats}
+
+    def _has_commit(self, path: str, sha: str) -> bool:
+        try:
+            self._git(path, "cat-file", "-e", f"{sha}^{{commit}}")
+            return True
+        except GitMirrorError:
+            return False
+
+    # -------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------
+    def _lock_for(self, path: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def _git(self, path: Optional[str], *args: str) -> str:
+        command = ["git"] + (["-C", path] if path else []) + list(args)
+        env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+        if self.token and self.clone_url.startswith("https://"):
+            # Passed through the environment so the token never shows up in the process list
+            basic = base64.b64encode(f"x-access-token:{self.token}".encode("utf-8")).decode("ascii")
+            env.update({"GIT_CONFIG_COUNT": "1",
+                        "GIT_CONFIG_KEY_0": "http.extraHeader",
+                        "GIT_CONFIG_VALUE_0": f"Authorization: Basic {basic}"})
+        try:
+            result = subprocess.run(command, env=env, capture_output=True, text=True,
+                                    encoding="utf-8", errors="replace", timeout=GIT_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            raise GitMirrorError(f"git {args[0]} timed out after {GIT_TIMEOUT_SECONDS:.0f}s")
+        if result.returncode != 0:
+            raise GitMirrorError(f"git {args[0]} failed ({result.returncode}): {result.stderr.strip()}")
+        return result.stdout
+
+
+# Shared mirror, created on first use
+_mirror: GitMirror = None
+
+def get_git_mirror() -> GitMirror:
+    global _mirror
+    if _mirror is None:
+        _mirror = GitMirror()
+    return _mirror
@@ -1,81 +1,477 @@
 ﻿# GithubApi.py
 
-import requests
+import asyncio
 import base64
+import hashlib
+import os
 
-# Optional: Add your token here or load from environment variable later
-GITHUB_TOKEN = None  # or: os.getenv("GITHUB_TOKEN")
+from GitMirror import GITHUB_COMMIT_SOURCE, GIT_COMMIT_HISTORY_LIMIT, get_git_mirror
+from GithubClient import GithubClient
+from GithubCredentials import CredentialPool, load_credentials_from_env
 
-BASE_URL = "https://api.github.com"
+# Credentials come from GITHUB_TOKENS / GITHUB_TOKEN / GITHUB_APP_* (see GithubCredentials)
 
-def get_repo_metadata(owner, repo):
-    url = f"https://api.github.com/repos/{owner}/{repo}"
-    response = requests.get(url)
-    if response.status_code != 200:
-        return None
+# Overridable to point at a replay server (GithubReplayServer) or GitHub Enterprise
+BASE_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+
+# Largest page GitHub serves for list endpoints
+MAX_PER_PAGE = 100
+
+# Coarse guard on issue/PR body size; PromptBuilder trims to the real token budget
+MAX_BODY_CHARS = 1000
+
+# "rest" (one call per input) or "graphql" (many repos per query; needs a credential)
+GITHUB_FETCH_MODE = os.getenv("GITHUB_FETCH_MODE", "rest").lower()
+
+# GraphQL batching: keep every query well below GitHub's node limit and timeouts
+GRAPHQL_MAX_NODES_PER_QUERY = 1000
+GRAPHQL_MAX_REPOS_PER_QUERY = 10
+
+# README paths tried by the GraphQL fetch (REST /readme finds it by itself)
+GRAPHQL_README_PATHS = ("README.md", "README", "README.rst", "README.txt", "readme.md")
+
+class GithubApiError(Exception):
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"GitHub API Error {status_code}: {text}")
+        self.status_code = status_code
+
+# Shared pooled client, created on first request
+_client: GithubClient = None
+
+def get_github_client() -> GithubClient:
+    global _client
+    if _client is None:
+        credentials = load_credentials_from_env()
+        print(f"🔑 GitHub credentials: {len(credentials) or 'none (anonymous)'}", flush=True)
+        _client = GithubClient(BASE_URL, credentials=CredentialPool(credentials))
+    return _client
 
-    data = response.json()
+def _headers() -> dict:
+    # Authorization is added per request by the client's credential pool
+    return {"Accept": "application/vnd.github+json"}
+
+# ===========================================================
+# Async API (awaitable from any event loop)
+# ===========================================================
+async def get_repo_metadata_async(owner, repo):
+    # Errors raise like every other getter (used to return None and crash callers later)
+    data = await _make_request(f"/repos/{owner}/{repo}")
     return {
         "full_name": data.get("full_name", ""),
         "description": data.get("description", ""),
         "stars": data.get("stargazers_count", 0),
         "forks": data.get("forks_count", 0),
         "open_issues": data.get("open_issues_count", 0),
-        "language": data.get("language", ""),
+        "language": data.get("language") or "",  # null when GitHub detected none
         "license": data.get("license", {}).get("name", "Unknown") if data.get("license") else "Unknown",
         "updated_at": data.get("updated_at", ""),
         "watchers": data.get("subscribers_count", 0),
     }
 
-def _make_request(endpoint: str):
+async def _make_request(endpoint: str, params: dict = None):
     """
     Internal helper: makes an authenticated or anonymous HTTP request to GitHub API.
     """
-    headers = {"Accept": "application/vnd.github+json"}
-    if GITHUB_TOKEN:
-        headers["Authorization"] = f"Bearer {GITHUB_TOKEN}"
-
-    response = requests.get(f"{BASE_URL}{endpoint}", headers=headers)
+    response = await get_github_client().get(endpoint, headers=_headers(), params=params)
     if response.status_code != 200:
-        raise Exception(f"GitHub API Error {response.status_code}: {response.text}")
+        raise GithubApiError(response.status_code, response.text)
     return response.json()
 
-def get_readme(owner: str, repo: str) -> str:
-    data = _make_request(f"/repos/{owner}/{repo}/readme")
+async def _paginate_async(endpoint: str, per_page: int, params: dict = None):
+    """
+    Lazily yield the items of a list endpoint page by page.
+    per_page is sent to GitHub (max 100) and the next page is only requested
+    (via the Link header) when the caller keeps iterating.
+    """
+    client = get_github_client()
+    url, page_params = endpoint, {**(params or {}), "per_page": min(max(per_page, 1), MAX_PER_PAGE)}
+    while url:
+        response = await client.get(url, headers=_headers(), params=page_params)
+        if response.status_code != 200:
+            raise GithubApiError(response.status_code, response.text)
+        for item in response.json():
+            yield item
+        url = response.links.get("next", {}).get("url")
+        page_params = None  # the next URL already carries the query string
+
+async def get_readme_async(owner: str, repo: str) -> str:
+    data = await _make_request(f"/repos/{owner}/{repo}/readme")
 
     if "content" in data:
         return base64.b64decode(data["content"]).decode("utf-8")
     else:
         return "(No README found for this repository)"
 
-def get_commits(owner: str, repo: str, limit: int = 10) -> list[str]:
-    data = _make_request(f"/repos/{owner}/{repo}/commits")
+async def get_commit_items_async(owner: str, repo: str, limit: int = 10,
+                                 since: str = None, stop_sha: str = None) -> list[dict]:
+    """
+    Newest commits first as {"sha", "message", "date"}.
+    since (ISO time) / stop_sha: only commits after a previous high-water mark.
+    With GITHUB_COMMIT_SOURCE=git they come from the local mirror (plus changed files).
+    """
+    if GITHUB_COMMIT_SOURCE == "git":
+        return await asyncio.to_thread(get_git_mirror().get_commit_items, owner, repo, limit, since, stop_sha)
 
+    params = {"since": since} if since else None
     commits = []
-    for item in data[:limit]:
-        message = item.get("commit", {}).get("message", "")
-        commits.append(message)
+    async for item in _paginate_async(f"/repos/{owner}/{repo}/commits", per_page=limit, params=params):
+        if stop_sha and item.get("sha") == stop_sha:
+            break
+        commit = item.get("commit", {})
+        commits.append({
+            "sha": item.get("sha"),
+            "message": commit.get("message", ""),
+            "date": (commit.get("committer") or {}).get("date"),
+        })
+        if len(commits) >= limit:
+            break
     return commits
 
-def get_issues(owner: str, repo: str, limit: int = 10) -> list[str]:
-    data = _make_request(f"/repos/{owner}/{repo}/issues")
-
+async def get_issue_items_async(owner: str, repo: str, limit: int = 10, since: str = None,
+                                seen=()) -> list[dict]:
+    """
+    Open issues as {"number", "text", "updated_at"}.
+    With since, only those updated since then, oldest update first, so a window
+    cut off by limit continues where it stopped next time; seen: numbers already
+    summarized at exactly since (GitHub's since filter includes that instant).
+    """
+    params = {"since": since, "sort": "updated", "direction": "asc"} if since else None
     issues = []
-    for item in data[:limit]:
+    # The issues endpoint also lists pull requests, so ask for a few extra per page
+    async for item in _paginate_async(f"/repos/{owner}/{repo}/issues", per_page=limit * 2, params=params):
         # Exclude pull requests (GitHub treats them as issues with "pull_request" key)
         if "pull_request" in item:
             continue
+        if since and not _is_newer(item, since, seen):
+            continue
         title = item.get("title", "")
         body = item.get("body", "") or ""
-        issues.append(f"{title} - {body[:100]}")  # Truncate body for prompt safety
+        # Truncate body for prompt safety
+        issues.append({"number": item.get("number"), "text": f"{title} - {body[:MAX_BODY_CHARS]}",
+                       "updated_at": item.get("updated_at")})
+        if len(issues) >= limit:
+            break
     return issues
 
-def get_pull_requests(owner: str, repo: str, limit: int = 10) -> list[str]:
-    data = _make_request(f"/repos/{owner}/{repo}/pulls")
-
+async def get_pull_request_items_async(owner: str, repo: str, limit: int = 10, since: str = None,
+                                       seen=()) -> list[dict]:
+    """
+    Open pull requests as {"number", "text", "updated_at"}.
+    With since (and seen), the same window as get_issue_items_async: the pulls
+    endpoint has no since filter, so it is read newest update first until older
+    ones show up, and the oldest limit updates of that window are returned.
+    """
+    if since:
+        params, per_page = {"sort": "updated", "direction": "desc"}, 100
+    else:
+        params, per_page = None, limit
     prs = []
-    for item in data[:limit]:
+    async for item in _paginate_async(f"/repos/{owner}/{repo}/pulls", per_page=per_page, params=params):
+        if since and (item.get("updated_at") or "") < since:
+            break
+        if since and not _is_newer(item, since, seen):
+            continue
         title = item.get("title", "")
         body = item.get("body", "") or ""
-        prs.append(f"{title} - {body[:100]}")
+        prs.append({"number": item.get("number"), "text": f"{title} - {body[:MAX_BODY_CHARS]}",
+                    "updated_at": item.get("updated_at")})
+        if not since and len(prs) >= limit:
+            break
+    if since:
+        prs = sorted(prs, key=lambda pr: pr["updated_at"] or "")[:limit]
     return prs
+
+async def get_commits_async(owner: str, repo: str, limit: int = 10) -> list[str]:
+    return [_commit_line(commit) for commit in await get_commit_items_async(owner, repo, limit)]
+
+async def get_issues_async(owner: str, repo: str, limit: int = 10) -> list[str]:
+    return [issue["text"] for issue in await get_issue_items_async(owner, repo, limit)]
+
+async def get_pull_requests_async(owner: str, repo: str, limit: int = 10) -> list[str]:
+    return [pr["text"] for pr in await get_pull_request_items_async(owner, repo, limit)]
+
+async def get_repo_snapshot_async(owner: str, repo: str,
+                                  modes=("readme", "commits", "issues", "pulls"),
+                                  marks: dict = None) -> dict:
+    """
+    Fetch metadata plus the inputs of the given summary modes concurrently.
+    Returns {"metadata": ..., "<mode>": ..., "high_water": {"<mode>": mark},
+             "inputs": {"<mode>": [identifiers]}}.
+    marks: high-water marks of a previous run per mode; when given, only newer
+    commits / issues / PRs are returned for that mode.
+    inputs identify exactly what was fetched (README hash, commit SHAs,
+    issue / PR number@updated_at), for fingerprinting summaries.
+    """
+    marks = marks or {}
+    commit_mark = marks.get("commits") or {}
+    issue_since, issue_seen = _split_updated_mark(marks.get("issues"))
+    pull_since, pull_seen = _split_updated_mark(marks.get("pulls"))
+
+    fetchers = {
+        "readme": lambda: get_readme_async(owner, repo),
+        "commits": lambda: get_commit_items_async(owner, repo, limit=_commit_limit(),
+                                                  since=commit_mark.get("date"), stop_sha=commit_mark.get("sha")),
+        "issues": lambda: get_issue_items_async(owner, repo, since=issue_since, seen=issue_seen),
+        "pulls": lambda: get_pull_request_items_async(owner, repo, since=pull_since, seen=pull_seen),
+    }
+    names = [mode for mode in fetchers if mode in modes]
+    results = await asyncio.gather(
+        get_repo_metadata_async(owner, repo),
+        *[fetchers[mode]() for mode in names],
+    )
+
+    snapshot = {"metadata": results[0], "high_water": {}, "inputs": {}}
+    for mode, data in zip(names, results[1:]):
+        if mode == "readme":
+            snapshot["readme"] = data
+            snapshot["high_water"]["readme"] = _content_hash(data)
+            snapshot["inputs"]["readme"] = [snapshot["high_water"]["readme"]]
+        elif mode == "commits":
+            _apply_commits(snapshot, data, marks.get("commits"))
+        else:
+            snapshot[mode] = [item["text"] for item in data]
+            snapshot["high_water"][mode] = _updated_mark(data, marks.get(mode))
+            snapshot["inputs"][mode] = [f"#{item['number']}@{item['updated_at']}" for item in data]
+    return snapshot
+
+async def get_repo_snapshots_async(wanted: dict, marks: dict = None) -> dict:
+    """
+    wanted: {(owner, repo): modes}. All repos are fetched at the same time.
+    marks (optional): {(owner, repo): {mode: high-water mark}} from a previous run.
+    Returns {(owner, repo): snapshot}.
+    """
+    marks = marks or {}
+    snapshots = {}
+    if GITHUB_FETCH_MODE == "graphql":
+        # GraphQL fetches full snapshots; incremental repos still go through REST
+        full = {key: modes for key, modes in wanted.items() if not marks.get(key)}
+        if full:
+            snapshots.update(await _graphql_snapshots_with_git_commits(full))
+        wanted = {key: modes for key, modes in wanted.items() if key not in full}
+
+    keys = list(wanted)
+    results = await asyncio.gather(
+        *[get_repo_snapshot_async(owner, repo, wanted[(owner, repo)], marks.get((owner, repo)))
+          for owner, repo in keys]
+    )
+    snapshots.update(zip(keys, results))
+    return snapshots
+
+async def _graphql_snapshots_with_git_commits(wanted: dict) -> dict:
+    """GraphQL snapshots; commits come from the local mirror instead when it is the commit source."""
+    if GITHUB_COMMIT_SOURCE != "git":
+        return await get_repo_snapshots_graphql_async(wanted)
+
+    # The metadata-only selection of a repo without other modes is still a valid query
+    snapshots = await get_repo_snapshots_graphql_async(
+        {key: [mode for mode in modes if mode != "commits"] for key, modes in wanted.items()})
+    keys = [key for key, modes in wanted.items() if "commits" in modes]
+    results = await asyncio.gather(*[get_commit_items_async(owner, repo, limit=_commit_limit())
+                                     for owner, repo in keys])
+    for key, commits in zip(keys, results):
+        _apply_commits(snapshots[key], commits, None)
+    return snapshots
+
+def _commit_limit() -> int:
+    # The mirror costs no quota, so read deeper history from it
+    return GIT_COMMIT_HISTORY_LIMIT if GITHUB_COMMIT_SOURCE == "git" else 10
+
+def _apply_commits(snapshot: dict, commits: list, previous_mark):
+    snapshot["commits"] = [_commit_line(commit) for commit in commits]
+    snapshot["inputs"]["commits"] = [commit["sha"] for commit in commits]
+    snapshot["high_water"]["commits"] = (
+        {"sha": commits[0]["sha"], "date": commits[0]["date"]} if commits else previous_mark)
+
+def _commit_line(commit: dict) -> str:
+    """Commit message as given to the prompt, with its file changes when known (git source)."""
+    stats = commit.get("stats")
+    if not stats or not stats["files_changed"]:
+        return commit["message"]
+    paths = [f["path"] for f in commit["files"][:3]]
+    more = f", +{stats['files_changed'] - len(paths)} more" if stats["files_changed"] > len(paths) else ""
+    return (f"{commit['message']} [{stats['files_changed']} files: {stats['added']} added, "
+            f"{stats['modified']} modified, {stats['deleted']} deleted; {', '.join(paths)}{more}]")
+
+def _updated_mark(items: list, previous_mark):
+    """
+    High-water mark of issues / PRs: the latest server updated_at among the
+    fetched items, plus the numbers updated at exactly that time (the next
+    since filter includes that instant). Nothing fetched keeps the old mark.
+    """
+    stamps = [item["updated_at"] for item in items if item.get("updated_at")]
+    if not stamps:
+        return previous_mark
+    latest = max(stamps)
+    numbers = {item["number"] for item in items if item.get("updated_at") == latest}
+    previous_since, previous_seen = _split_updated_mark(previous_mark)
+    if previous_since == latest:
+        numbers |= previous_seen
+    return {"updated_at": latest, "numbers": sorted(numbers)}
+
+def _split_updated_mark(mark) -> tuple:
+    """(since, numbers already seen at since) of an issues / PRs mark; a plain string is an older mark."""
+    if not mark:
+        return None, set()
+    if isinstance(mark, str):
+        return mark, set()
+    return mark.get("updated_at"), set(mark.get("numbers") or [])
+
+def _is_newer(item: dict, since: str, seen) -> bool:
+    updated_at = item.get("updated_at") or ""
+    return updated_at > since or (updated_at == since and item.get("number") not in seen)
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+# ===========================================================
+# GraphQL bulk fetch (same shapes as the REST getters)
+# ===========================================================
+_GRAPHQL_FIELDS = {
+    "metadata": """
+        nameWithOwner description stargazerCount forkCount updatedAt
+        openIssues: issues(states: OPEN) { totalCount }
+        openPulls: pullRequests(states: OPEN) { totalCount }
+        primaryLanguage { name }
+        licenseInfo { name }
+        watchers { totalCount }""",
+    "commits": """
+        defaultBranchRef { target { ... on Commit { history(first: %(limit)d) { nodes { oid message committedDate } } } } }""",
+    "issues": """
+        issues(first: %(limit)d, states: OPEN, orderBy: {field: CREATED_AT, direction: DESC}) { nodes { number title body updatedAt } }""",
+    "pulls": """
+        pullRequests(first: %(limit)d, states: OPEN, orderBy: {field: CREATED_AT, direction: DESC}) { nodes { number title body updatedAt } }""",
+}
+
+def _graphql_repo_selection(modes, limit: int) -> str:
+    fields = [_GRAPHQL_FIELDS["metadata"]]
+    fields += [_GRAPHQL_FIELDS[mode] % {"limit": limit} for mode in ("commits", "issues", "pulls") if mode in modes]
+    if "readme" in modes:
+        fields += [f'readme{i}: object(expression: "HEAD:{path}") {{ ... on Blob {{ text }} }}'
+                   for i, path in enumerate(GRAPHQL_README_PATHS)]
+    return "\n".join(fields)
+
+def _graphql_nodes_per_repo(modes, limit: int) -> int:
+    """Rough node count GitHub charges a repository block with."""
+    return 1 + limit * len([mode for mode in ("commits", "issues", "pulls") if mode in modes])
+
+def _graphql_snapshot(node: dict, modes) -> dict:
+    """Convert one repository block to the dicts / lists the REST getters return."""
+    snapshot = {"high_water": {}, "inputs": {}, "metadata": {
+        "full_name": node.get("nameWithOwner", ""),
+        "description": node.get("description", ""),
+        "stars": node.get("stargazerCount", 0),
+        "forks": node.get("forkCount", 0),
+        # REST open_issues_count includes open pull requests
+        "open_issues": node["openIssues"]["totalCount"] + node["openPulls"]["totalCount"],
+        "language": (node.get("primaryLanguage") or {}).get("name") or "",  # same as REST
+        "license": (node.get("licenseInfo") or {}).get("name", "Unknown"),
+        "updated_at": node.get("updatedAt", ""),
+        "watchers": node["watchers"]["totalCount"],
+    }}
+
+    if "readme" in modes:
+        blobs = [node.get(f"readme{i}") for i in range(len(GRAPHQL_README_PATHS))]
+        texts = [blob["text"] for blob in blobs if blob and blob.get("text") is not None]
+        snapshot["readme"] = texts[0] if texts else "(No README found for this repository)"
+        snapshot["high_water"]["readme"] = _content_hash(snapshot["readme"])
+        snapshot["inputs"]["readme"] = [snapshot["high_water"]["readme"]]
+    if "commits" in modes:
+        target = (node.get("defaultBranchRef") or {}).get("target") or {}
+        history = target.get("history", {}).get("nodes", [])
+        snapshot["commits"] = [c["message"] for c in history]
+        snapshot["inputs"]["commits"] = [c["oid"] for c in history]
+        snapshot["high_water"]["commits"] = (
+            {"sha": history[0]["oid"], "date": history[0]["committedDate"]} if history else None)
+    if "issues" in modes:
+        snapshot["issues"] = [f"{i['title']} - {(i.get('body') or '')[:MAX_BODY_CHARS]}"
+                              for i in node["issues"]["nodes"]]
+        snapshot["high_water"]["issues"] = _updated_mark(
+            [{"number": i["number"], "updated_at": i["updatedAt"]} for i in node["issues"]["nodes"]], None)
+        snapshot["inputs"]["issues"] = [f"#{i['number']}@{i['updatedAt']}" for i in node["issues"]["nodes"]]
+    if "pulls" in modes:
+        snapshot["pulls"] = [f"{p['title']} - {(p.get('body') or '')[:MAX_BODY_CHARS]}"
+                             for p in node["pullRequests"]["nodes"]]
+        snapshot["high_water"]["pulls"] = _updated_mark(
+            [{"number": p["number"], "updated_at": p["updatedAt"]} for p in node["pullRequests"]["nodes"]], None)
+        snapshot["inputs"]["pulls"] = [f"#{p['number']}@{p['updatedAt']}" for p in node["pullRequests"]["nodes"]]
+    return snapshot
+
+async def _graphql_query_batch(batch: list, limit: int) -> dict:
+    """One GraphQL query for a batch of ((owner, repo), modes)."""
+    variables, blocks, params = {}, [], []
+    for i, ((owner, repo), modes) in enumerate(batch):
+        variables[f"o{i}"], variables[f"n{i}"] = owner, repo
+        params.append(f"$o{i}: String!, $n{i}: String!")
+        blocks.append(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ {_graphql_repo_selection(modes, limit)} }}")
+    query = f"query({', '.join(params)}) {{ rateLimit {{ cost remaining }} {' '.join(blocks)} }}"
+    response = await get_github_client().post("/graphql", json={"query": query, "variables": variables},
+                                              headers=_headers())
+    if response.status_code != 200:
+        raise GithubApiError(response.status_code, response.text)
+    payload = response.json()
+    data = payload.get("data") or {}
+
+    snapshots = {}
+    for i, ((owner, repo), modes) in enumerate(batch):
+        node = data.get(f"r{i}")
+        if node is None:
+            errors = [e.get("message") for e in payload.get("errors", [])]
+            raise GithubApiError(404, f"{owner}/{repo} not available via GraphQL: {errors}")
+        snapshots[(owner, repo)] = _graphql_snapshot(node, modes)
+
+    cost = data.get("rateLimit") or {}
+    print(f"🧬 GraphQL: {len(batch)} repo(s), cost {cost.get('cost')}, {cost.get('remaining')} points left",
+          flush=True)
+    return snapshots
+
+async def get_repo_snapshots_graphql_async(wanted: dict, limit: int = 10) -> dict:
+    """
+    Same result as get_repo_snapshots_async, fetched with as few GraphQL queries as
+    possible: repos are packed into batches bounded by an estimated node count.
+    GitHub's GraphQL API does not accept anonymous requests.
+    """
+    batches, current, nodes = [], [], 0
+    for key, modes in wanted.items():
+        cost = _graphql_nodes_per_repo(modes, limit)
+        if current and (nodes + cost > GRAPHQL_MAX_NODES_PER_QUERY or len(current) >= GRAPHQL_MAX_REPOS_PER_QUERY):
+            batches.append(current)
+            current, nodes = [], 0
+        current.append((key, modes))
+        nodes += cost
+    if current:
+        batches.append(current)
+
+    results = await asyncio.gather(*[_graphql_query_batch(batch, limit) for batch in batches])
+    snapshots = {}
+    for result in results:
+        snapshots.update(result)
+    return snapshots
+
+# ===========================================================
+# Sync wrappers (block the calling thread, not the client loop)
+# ===========================================================
+def get_repo_metadata(owner, repo):
+    return get_github_client().run(get_repo_metadata_async(owner, repo))
+
+def get_readme(owner: str, repo: str) -> str:
+    return get_github_client().run(get_readme_async(owner, repo))
+
+def get_commits(owner: str, repo: str, limit: int = 10) -> list[str]:
+    return get_github_client().run(get_commits_async(owner, repo, limit))
+
+def get_issues(owner: str, repo: str, limit: int = 10) -> list[str]:
+    return get_github_client().run(get_issues_async(owner, repo, limit))
+
+def get_pull_requests(owner: str, repo: str, limit: int = 10) -> list[str]:
+    return get_github_client().run(get_pull_requests_async(owner, repo, limit))
+
+def get_repo_snapshot(owner: str, repo: str, modes=("readme", "commits", "issues", "pulls"),
+                      marks: dict = None) -> dict:
+    return get_github_client().run(get_repo_snapshot_async(owner, repo, modes, marks))
+
+def get_repo_snapshots(wanted: dict, marks: dict = None) -> dict:
+    return get_github_client().run(get_repo_snapshots_async(wanted, marks))
+
+def get_rate_limit_budget() -> dict:
+    """Remaining GitHub quota and health per credential, for pacing batch refreshes."""
+    return get_github_client().rate_limit_budget()
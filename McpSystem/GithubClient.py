@@ -0,0 +1,219 @@
+# GithubClient.py
+# ===========================================================
+# Shared async HTTP client for the GitHub API
+# -----------------------------------------------------------
+# - One pooled keep-alive httpx.AsyncClient per process
+#   (HTTP/2 when the h2 package is installed)
+# - Runs on its own event loop thread, so async callers (FastAPI)
+#   and sync callers (Summarizer worker threads) share the same
+#   connection pool
+# - Timeouts and max in-flight requests are configurable
+# - Optional conditional-request cache: stored ETag / Last-Modified
+#   are sent back and a 304 is answered from the stored body
+#   (GitHub does not count 304s against the rate limit)
+# - Every request uses the best credential of the CredentialPool and
+#   passes the RateLimitScheduler of that credential
+# - GITHUB_RECORD_CASSETTE=<file> records every response for offline
+#   replay (see GithubReplayServer)
+# ===========================================================
+
+import asyncio
+import os
+import threading
+
+from typing import Any, Awaitable, Optional
+
+import httpx
+
+from DAL.Cassette_Repository import CassetteRepository
+from DAL.HttpCache_Repository import HttpCacheRepository
+from GithubCredentials import CredentialPool
+from GithubRateLimiter import MAX_RATE_LIMIT_RETRIES, RateLimitScheduler
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+GITHUB_TIMEOUT_SECONDS = float(os.getenv("GITHUB_TIMEOUT_SECONDS", "15"))
+GITHUB_CONNECT_TIMEOUT_SECONDS = float(os.getenv("GITHUB_CONNECT_TIMEOUT_SECONDS", "5"))
+GITHUB_MAX_CONCURRENCY = int(os.getenv("GITHUB_MAX_CONCURRENCY", "8"))
+GITHUB_HTTP_CACHE = os.getenv("GITHUB_HTTP_CACHE", "true").lower() == "true"
+GITHUB_RECORD_CASSETTE = os.getenv("GITHUB_RECORD_CASSETTE")
+
+# Response headers kept with a cached body
+_CACHED_HEADERS = ("content-type", "etag", "last-modified", "link")
+
+
+class GithubClient:
+    def __init__(self,
+                 base_url: str,
+                 timeout: float = GITHUB_TIMEOUT_SECONDS,
+                 connect_timeout: float = GITHUB_CONNECT_TIMEOUT_SECONDS,
+                 max_concurrency: int = GITHUB_MAX_CONCURRENCY,
+                 cache: Optional[HttpCacheRepository] = None,
+                 credentials: Optional[CredentialPool] = None,
+                 recorder: Optional[CassetteRepository] = None):
+        self.base_url = base_url
+        if cache is None and GITHUB_HTTP_CACHE:
+            cache = HttpCacheRepository()
+        self.cache = cache
+        self.cache_stats = {"revalidated": 0, "stored": 0}
+        self.rate_limiter = RateLimitScheduler()
+        self.credentials = credentials or CredentialPool()
+        if recorder is None and GITHUB_RECORD_CASSETTE:
+            recorder = CassetteRepository(GITHUB_RECORD_CASSETTE)
+            print(f"📼 Recording GitHub responses to {GITHUB_RECORD_CASSETTE}", flush=True)
+        self.recorder = recorder
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.max_concurrency = max_concurrency
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._start_lock = threading.Lock()
+
+    # -------------------------------------------------------
+    # Requests
+    # -------------------------------------------------------
+    async def get(self, endpoint: str, headers: Optional[dict] = None,
+                  params: Optional[dict] = None) -> httpx.Response:
+        """GET a path (or absolute URL) on the shared connection pool; awaitable from any loop."""
+        return await self.call(self._get(endpoint, headers, params))
+
+    def get_sync(self, endpoint: str, headers: Optional[dict] = None,
+                 params: Optional[dict] = None) -> httpx.Response:
+        return self.run(self._get(endpoint, headers, params))
+
+    async def post(self, endpoint: str, json: Any, headers: Optional[dict] = None) -> httpx.Response:
+        """POST a JSON body (GraphQL); not cached, but rate limited and credential-rotated like GET."""
+        return await self.call(self._send("POST", endpoint, dict(headers or {}), json=json))
+
+    async def _get(self, endpoint: str, headers: Optional[dict], params: Optional[dict]) -> httpx.Response:
+        headers = dict(headers or {})
+        key, entry = None, None
+        if self.cache is not None:
+            key = self._cache_key(endpoint, headers, params)
+            entry = await asyncio.to_thread(self.cache.load_entry, key)
+            if entry:
+                if entry.get("etag"):
+                    headers["If-None-Match"] = entry["etag"]
+                if entry.get("last_modified"):
+                    headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = await self._send("GET", endpoint, headers, params=params)
+
+        if entry and response.status_code == 304:
+            self.cache_stats["revalidated"] += 1
+            return httpx.Response(200, headers=entry["headers"], content=entry["body"].encode("utf-8"),
+                                  request=response.request)
+
+        if key and response.status_code == 200 and ("etag" in response.headers or "last-modified" in response.headers):
+            await asyncio.to_thread(self.cache.save_entry, key, {
+                "url": str(response.request.url),
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "headers": {name: response.headers[name] for name in _CACHED_HEADERS if name in response.headers},
+                "body": response.text,
+            })
+            self.cache_stats["stored"] += 1
+        return response
+
+    async def _send(self, method: str, endpoint: str, headers: dict,
+                    params: Optional[dict] = None, json: Any = None) -> httpx.Response:
+        """Send with the best credential, retrying on rate-limit answers and rejected credentials."""
+        # GraphQL has its own quota (points), separate from the REST one
+        bucket_suffix = ":graphql" if endpoint.endswith("/graphql") else ""
+
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            credential = self.credentials.pick(self.rate_limiter)
+            authorization = await credential.authorization(self._client)
+            if authorization:
+                headers["Authorization"] = authorization
+            else:
+                headers.pop("Authorization", None)
+
+            bucket = credential.name + bucket_suffix
+            await self.rate_limiter.acquire(bucket)
+            try:
+                async with self._semaphore:
+                    response = await self._client.request(method, endpoint, headers=headers,
+                                                          params=params, json=json)
+            except httpx.TransportError:
+                credential.record_failure()
+                raise
+            credential.record_status(response.status_code)
+            if self.recorder is not None:
+                await asyncio.to_thread(self.recorder.record, response)
+
+            rate_limited = self.rate_limiter.record(bucket, response)
+            retry = rate_limited or (response.status_code == 401 and credential is not self.credentials.anonymous)
+            if not retry or attempt == MAX_RATE_LIMIT_RETRIES:
+                return response
+            print(f"⚠️ GitHub {response.status_code} with '{credential.name}', retrying {endpoint}", flush=True)
+
+    def _cache_key(self, endpoint: str, headers: dict, params: Optional[dict]) -> str:
+        url = str(self._client.build_request("GET", endpoint, params=params).url)
+        # All pool credentials belong to this deployment, so entries are shared between them
+        return HttpCacheRepository.make_key(url, headers.get("Accept", ""))
+
+    def rate_limit_budget(self) -> dict:
+        """Remaining quota, sustainable request rate and health per credential."""
+        budget = self.rate_limiter.budget()
+        for name, health in self.credentials.status().items():
+            budget.setdefault(name, {}).update(health)
+        return budget
+
+    # -------------------------------------------------------
+    # Running coroutines on the client loop
+    # -------------------------------------------------------
+    async def call(self, coro: Awaitable) -> Any:
+        """Await a coroutine on the client loop from whatever loop the caller runs on."""
+        loop = self._ensure_started()
+        try:
+            if asyncio.get_running_loop() is loop:
+                return await coro
+        except RuntimeError:
+            pass
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def run(self, coro: Awaitable) -> Any:
+        """Run a coroutine on the client loop and block until it finishes (sync callers)."""
+        loop = self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def close(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop = None
+        self._thread = None
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name="github-client", daemon=True)
+                self._thread.start()
+                asyncio.run_coroutine_threadsafe(self._open(), loop).result()
+                self._loop = loop
+        return self._loop
+
+    async def _open(self):
+        # Created on the client loop, which owns the pool and the semaphore
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=HTTP2_AVAILABLE,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.max_concurrency,
+                                max_keepalive_connections=self.max_concurrency),
+            follow_redirects=True,
+        )
+        print(f"🌐 GitHub client ready ({'HTTP/2' if HTTP2_AVAILABLE else 'HTTP/1.1'}, "
+              f"max {self.max_concurrency} concurrent)", flush=True)
+
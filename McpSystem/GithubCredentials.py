@@ -0,0 +1,182 @@
+# GithubCredentials.py
+# ===========================================================
+# Pool of GitHub credentials
+# -----------------------------------------------------------
+# - Personal access tokens (GITHUB_TOKENS="tok1,tok2", or the
+#   single GITHUB_TOKEN)
+# - GitHub App installation tokens (GITHUB_APP_ID,
+#   GITHUB_APP_INSTALLATION_IDS, GITHUB_APP_PRIVATE_KEY_PATH),
+#   minted and refreshed on demand; needs PyJWT
+# - Each request goes to the healthy credential with the most
+#   remaining quota, so throughput grows with the number of
+#   credentials
+# - Health: 401 disables a credential for a while, transport /
+#   5xx errors back it off exponentially
+# ===========================================================
+
+import asyncio
+import os
+import time
+
+from typing import List, Optional
+
+try:
+    import jwt  # PyJWT, only needed for GitHub App credentials
+except ImportError:
+    jwt = None
+
+# How long a credential rejected with 401 is left out
+UNAUTHORIZED_COOLDOWN_SECONDS = 600
+
+# Back-off after transport / server errors: base * 2^(failures-1), capped
+FAILURE_BACKOFF_SECONDS = 5
+MAX_FAILURE_BACKOFF_SECONDS = 300
+
+# Refresh App installation tokens this long before they expire
+APP_TOKEN_REFRESH_MARGIN_SECONDS = 300
+
+
+class Credential:
+    def __init__(self, name: str):
+        self.name = name
+        self.failures = 0
+        self.disabled_until = 0.0
+        self.requests = 0
+
+    async def authorization(self, client) -> Optional[str]:
+        """Value of the Authorization header (None sends the request anonymously)."""
+        return None
+
+    def is_healthy(self, now: float) -> bool:
+        return self.disabled_until <= now
+
+    def record_status(self, status_code: int):
+        self.requests += 1
+        now = time.time()
+        if status_code == 401:
+            self.disabled_until = now + UNAUTHORIZED_COOLDOWN_SECONDS
+            print(f"⚠️ GitHub credential '{self.name}' rejected (401), disabled for "
+                  f"{UNAUTHORIZED_COOLDOWN_SECONDS}s", flush=True)
+        elif status_code >= 500:
+            self.record_failure()
+        else:
+            self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        backoff = min(FAILURE_BACKOFF_SECONDS * 2 ** (self.failures - 1), MAX_FAILURE_BACKOFF_SECONDS)
+        self.disabled_until = time.time() + backoff
+
+    def status(self, now: float) -> dict:
+        return {
+            "healthy": self.is_healthy(now),
+            "failures": self.failures,
+            "requests": self.requests,
+        }
+
+
+class AnonymousCredential(Credential):
+    def __init__(self):
+        super().__init__("anonymous")
+
+    def is_healthy(self, now: float) -> bool:
+        return True  # last resort, never taken out of rotation
+
+
+class TokenCredential(Credential):
+    def __init__(self, token: str, index: int):
+        super().__init__(f"token-{index}")
+        self._token = token
+
+    async def authorization(self, client) -> Optional[str]:
+        return f"Bearer {self._token}"
+
+
+class AppInstallationCredential(Credential):
+    """Installation access token of a GitHub App, refreshed before it expires."""
+
+    def __init__(self, app_id: str, installation_id: str, private_key: str):
+        super().__init__(f"app-{app_id}-{installation_id}")
+        if jwt is None:
+            raise ImportError("GitHub App credentials need the PyJWT package (pip install pyjwt[crypto])")
+        self.app_id = app_id
+        self.installation_id = installation_id
+        self._private_key = private_key
+        self._token = None
+        self._expires_at = 0.0
+        self._refresh_lock = asyncio.Lock()
+
+    async def authorization(self, client) -> Optional[str]:
+        async with self._refresh_lock:
+            if time.time() > self._expires_at - APP_TOKEN_REFRESH_MARGIN_SECONDS:
+                await self._refresh(client)
+        return f"Bearer {self._token}"
+
+    async def _refresh(self, client):
+        now = int(time.time())
+        app_jwt = jwt.encode({"iat": now - 60, "exp": now + 540, "iss": self.app_id},
+                             self._private_key, algorithm="RS256")
+        response = await client.post(
+            f"/app/installations/{self.installation_id}/access_tokens",
+            headers={"Authorization": f"Bearer {app_jwt}", "Accept": "application/vnd.github+json"},
+        )
+        if response.status_code != 201:
+            self.record_failure()
+            raise Exception(f"GitHub App token refresh failed {response.status_code}: {response.text}")
+
+        data = response.json()
+        self._token = data["token"]
+        # Installation tokens live one hour; expires_at is ISO 8601, keep a safe local estimate
+        self._expires_at = time.time() + 3600
+        print(f"🔑 Refreshed GitHub App token for installation {self.installation_id}", flush=True)
+
+
+class CredentialPool:
+    def __init__(self, credentials: Optional[List[Credential]] = None):
+        self.credentials = credentials or []
+        self.anonymous = AnonymousCredential()
+
+    def pick(self, rate_limiter) -> Credential:
+        """
+        Healthy credential with the most remaining quota. When all of them are
+        rate limited, the one that is unblocked first; anonymous when none is healthy.
+        """
+        now = time.time()
+        healthy = [credential for credential in self.credentials if credential.is_healthy(now)]
+        if not healthy:
+            return self.anonymous
+
+        def score(credential):
+            budget = rate_limiter.budget(credential.name)
+            if budget["blocked_for_seconds"] > 0:
+                return (False, -budget["blocked_for_seconds"])
+            return (True, budget["remaining"])
+
+        return max(healthy, key=score)
+
+    def status(self) -> dict:
+        now = time.time()
+        return {credential.name: credential.status(now) for credential in self.credentials + [self.anonymous]}
+
+
+def load_credentials_from_env() -> List[Credential]:
+    """Credentials configured through environment variables (tokens first, then App installations)."""
+    credentials: List[Credential] = []
+
+    tokens = [t.strip() for t in os.getenv("GITHUB_TOKENS", "").split(",") if t.strip()]
+    single = os.getenv("GITHUB_TOKEN")
+    if single and single not in tokens:
+        tokens.append(single)
+    for index, token in enumerate(tokens, start=1):
+        credentials.append(TokenCredential(token, index))
+
+    app_id = os.getenv("GITHUB_APP_ID")
+    key_path = os.getenv("GITHUB_APP_PRIVATE_KEY_PATH")
+    installations = [i.strip() for i in os.getenv("GITHUB_APP_INSTALLATION_IDS", "").split(",") if i.strip()]
+    if app_id and key_path and installations:
+        with open(key_path, "r", encoding="utf-8") as f:
+            private_key = f.read()
+        for installation_id in installations:
+            credentials.append(AppInstallationCredential(app_id, installation_id, private_key))
+
+    return credentials
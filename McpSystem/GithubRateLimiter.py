@@ -0,0 +1,158 @@
+# GithubRateLimiter.py
+# ===========================================================
+# Rate-limit aware scheduling for GitHub requests
+# -----------------------------------------------------------
+# - One budget per credential, fed from the X-RateLimit-* headers
+#   of every response
+# - Requests go out unthrottled while the remaining quota is above a
+#   reserve; only the reserve is spread over the time left until reset,
+#   so the quota is never burned in one go but interactive calls are
+#   not slowed down while there is plenty left
+# - The sustainable rate (remaining quota / time to reset) is reported
+#   in the budget so batch callers can pace themselves
+# - 403/429 rate-limit answers (primary or secondary, Retry-After)
+#   park the credential and the request is retried instead of failing
+# ===========================================================
+
+import asyncio
+import os
+import time
+
+from typing import Dict, Optional
+
+import httpx
+
+# Longest a request may be held back before giving up with an error
+GITHUB_MAX_RATE_WAIT_SECONDS = float(os.getenv("GITHUB_MAX_RATE_WAIT_SECONDS", "900"))
+
+# Quota kept back at the end of a window and only spent paced:
+# a twentieth of the quota, at least MIN_RESERVE
+MIN_RESERVE = 5
+
+# Retries of a single request after a rate-limit answer
+MAX_RATE_LIMIT_RETRIES = 3
+
+# Assumed quota until the first response tells us the real one
+ANONYMOUS_LIMIT = 60
+AUTHENTICATED_LIMIT = 5000
+DEFAULT_WINDOW_SECONDS = 3600
+
+
+class GithubRateLimitError(Exception):
+    """Quota exhausted and the reset is further away than we are willing to wait."""
+
+
+class CredentialBudget:
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self.remaining = limit
+        self.reset_at = time.time() + DEFAULT_WINDOW_SECONDS
+        self.blocked_until = 0.0  # set by Retry-After / secondary limits
+        self._next_paced_at = 0.0   # earliest next request once inside the reserve
+
+    def reserve(self) -> int:
+        return max(MIN_RESERVE, self.limit // 20)
+
+    def refill_rate(self, now: float) -> float:
+        """Requests per second that use up the remaining quota exactly at reset."""
+        return max(self.remaining, 0) / max(self.reset_at - now, 1.0)
+
+    def wait_seconds(self, now: float) -> float:
+        """How long the next request has to wait; 0 means it may go now."""
+        if self.reset_at <= now:
+            # New window; assume the full quota until a response says otherwise
+            self.remaining = self.limit
+            self.reset_at = now + DEFAULT_WINDOW_SECONDS
+        if self.blocked_until > now:
+            return self.blocked_until - now
+        if self.remaining <= 0:
+            return self.reset_at - now
+
+        if self.remaining > self.reserve():
+            return 0.0
+        return max(self._next_paced_at - now, 0.0)
+
+    def take(self, now: float):
+        """Account for one request going out now."""
+        self.remaining -= 1
+        rate = self.refill_rate(now)
+        self._next_paced_at = now + 1 / rate if rate > 0 else self.reset_at
+
+    def snapshot(self, now: float) -> dict:
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reserve": self.reserve(),
+            "reset_in_seconds": round(max(self.reset_at - now, 0.0), 1),
+            "blocked_for_seconds": round(max(self.blocked_until - now, 0.0), 1),
+            "sustainable_requests_per_second": round(self.refill_rate(now), 3),
+        }
+
+
+class RateLimitScheduler:
+    def __init__(self, max_wait_seconds: float = GITHUB_MAX_RATE_WAIT_SECONDS):
+        self.max_wait_seconds = max_wait_seconds
+        self._budgets: Dict[str, CredentialBudget] = {}
+        self._lock = asyncio.Lock()
+
+    def _budget(self, credential: str) -> CredentialBudget:
+        if credential not in self._budgets:
+            limit = ANONYMOUS_LIMIT if credential == "anonymous" else AUTHENTICATED_LIMIT
+            self._budgets[credential] = CredentialBudget(credential, limit)
+        return self._budgets[credential]
+
+    async def acquire(self, credential: str):
+        """Wait until the credential may send one more request, then take a token."""
+        waited = 0.0
+        while True:
+            async with self._lock:
+                budget = self._budget(credential)
+                now = time.time()
+                wait = budget.wait_seconds(now)
+                if wait <= 0:
+                    budget.take(now)
+                    return
+            if waited + wait > self.max_wait_seconds:
+                raise GithubRateLimitError(
+                    f"GitHub rate limit for '{credential}' exhausted; resets in {budget.reset_at - now:.0f}s")
+            if wait > 5:
+                print(f"⏳ GitHub rate limit: waiting {wait:.0f}s ({credential})", flush=True)
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def record(self, credential: str, response: httpx.Response) -> bool:
+        """
+        Update the credential budget from a response.
+        Returns True when the response was a rate-limit answer and the request should be retried.
+        """
+        budget = self._budget(credential)
+        headers = response.headers
+        now = time.time()
+
+        if "x-ratelimit-limit" in headers:
+            budget.limit = int(headers["x-ratelimit-limit"])
+        if "x-ratelimit-remaining" in headers:
+            budget.remaining = int(headers["x-ratelimit-remaining"])
+        if "x-ratelimit-reset" in headers:
+            budget.reset_at = float(headers["x-ratelimit-reset"])
+
+        if response.status_code not in (403, 429):
+            return False
+
+        retry_after = headers.get("retry-after")
+        if retry_after is not None:
+            budget.blocked_until = now + float(retry_after)
+            return True
+        if budget.remaining <= 0 or response.status_code == 429:
+            # Primary limit: wait for the reset; secondary without Retry-After: back off a minute
+            budget.blocked_until = budget.reset_at if budget.remaining <= 0 else now + 60
+            return True
+        return False  # a real permission error
+
+    def budget(self, credential: Optional[str] = None) -> dict:
+        """Current budget of one credential, or of all of them keyed by name."""
+        now = time.time()
+        if credential is not None:
+            return self._budget(credential).snapshot(now)
+        return {name: budget.snapshot(now) for name, budget in self._budgets.items()}
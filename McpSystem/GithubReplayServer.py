@@ -0,0 +1,234 @@
+# GithubReplayServer.py
+# ===========================================================
+# Local stand-in for api.github.com, replaying a cassette
+# -----------------------------------------------------------
+# - Cassettes are recorded by GithubClient with
+#   GITHUB_RECORD_CASSETTE=cassettes/<name>.json
+# - Point GithubApi at the server with GITHUB_API_URL=http://127.0.0.1:<port>
+# - Answers conditional requests (If-None-Match / If-Modified-Since)
+#   with 304 like GitHub, and rewrites Link headers to itself so
+#   pagination stays on the replay server
+# - Injectable: per-request latency, a rate-limit quota (403 once
+#   used up, X-RateLimit-* headers on every answer), random server
+#   errors and secondary rate limits (429 + Retry-After).
+#   Injection is seeded, so benchmark runs are reproducible
+#
+# Usage:
+#   python GithubReplayServer.py cassettes/bench.json --port 8765 \
+#       --latency-ms 80 --rate-limit 60 --error-rate 0.05
+# ===========================================================
+
+import argparse
+import json
+import random
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+
+from DAL.Cassette_Repository import CassetteRepository
+
+
+class ReplayConfig:
+    def __init__(self,
+                 latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0,
+                 rate_limit: Optional[int] = None,
+                 rate_window_seconds: float = 3600,
+                 error_rate: float = 0.0,
+                 error_status: int = 502,
+                 secondary_limit_rate: float = 0.0,
+                 retry_after_seconds: int = 1,
+                 seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit  # None keeps the recorded X-RateLimit-* headers
+        self.rate_window_seconds = rate_window_seconds
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.secondary_limit_rate = secondary_limit_rate
+        self.retry_after_seconds = retry_after_seconds
+        self.seed = seed
+
+
+class ReplayState:
+    """Shared by all handler threads: cassette, quota and injection counters."""
+
+    def __init__(self, cassette: CassetteRepository, config: ReplayConfig):
+        self.cassette = cassette
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.remaining = config.rate_limit
+        self.reset_at = time.time() + config.rate_window_seconds
+        self.stats = {"requests": 0, "replayed": 0, "not_modified": 0, "missing": 0,
+                      "rate_limited": 0, "secondary_limited": 0, "errors": 0}
+
+    def take_quota(self) -> Tuple[bool, dict]:
+        """Count one request against the quota. Returns (allowed, rate-limit headers)."""
+        if self.config.rate_limit is None:
+            return True, {}
+        now = time.time()
+        if now >= self.reset_at:
+            self.remaining = self.config.rate_limit
+            self.reset_at = now + self.config.rate_window_seconds
+        allowed = self.remaining > 0
+        if allowed:
+            self.remaining -= 1
+        return allowed, self.rate_headers()
+
+    def rate_headers(self) -> dict:
+        if self.config.rate_limit is None:
+            return {}
+        return {
+            "X-RateLimit-Limit": str(self.config.rate_limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(int(self.reset_at)),
+        }
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: ReplayState = None  # set per server by start_replay_server
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._replay()
+
+    def do_POST(self):
+        self._replay()
+
+    def _replay(self):
+        state, config = self.state, self.state.config
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8") if length else None
+        url = urlsplit(self.path)
+
+        if config.latency_ms or config.jitter_ms:
+            with state.lock:
+                delay = config.latency_ms + state.random.uniform(0, config.jitter_ms)
+            time.sleep(delay / 1000)
+
+        with state.lock:
+            status, headers, body = self._answer(url.path, url.query, body)
+        self._send(status, headers, body)
+
+    def _answer(self, path: str, query: str, body) -> Tuple[int, dict, str]:
+        """Pick the answer for one request (called under the state lock)."""
+        state, config = self.state, self.state.config
+        state.stats["requests"] += 1
+        roll = state.random.random()
+        if roll < config.error_rate:
+            state.stats["errors"] += 1
+            return config.error_status, {}, json.dumps({"message": "Injected server error"})
+        if roll < config.error_rate + config.secondary_limit_rate:
+            state.stats["secondary_limited"] += 1
+            return 429, {"Retry-After": str(config.retry_after_seconds)}, \
+                json.dumps({"message": "You have exceeded a secondary rate limit."})
+
+        recorded = state.cassette.next_response(self.command, path, query, body)
+        if recorded is None:
+            state.stats["missing"] += 1
+            return 404, {}, json.dumps({"message": f"No recorded interaction for {self.command} {self.path}"})
+
+        headers = dict(recorded["headers"])
+        if self._not_modified(headers):
+            # GitHub does not count 304s against the quota
+            state.stats["not_modified"] += 1
+            return 304, {**self._validators(headers), **state.rate_headers()}, ""
+
+        allowed, rate_headers = state.take_quota()
+        if not allowed:
+            state.stats["rate_limited"] += 1
+            return 403, rate_headers, json.dumps({"message": "API rate limit exceeded."})
+        state.stats["replayed"] += 1
+
+        if rate_headers:
+            # Injected quota replaces the recorded one
+            headers = {name: value for name, value in headers.items() if not name.lower().startswith("x-ratelimit-")}
+            headers.update(rate_headers)
+        self._rewrite_links(headers)
+        return recorded["status"], headers, recorded["body"]
+
+    def _not_modified(self, headers: dict) -> bool:
+        validators = {name.lower(): value for name, value in self._validators(headers).items()}
+        etag = self.headers.get("If-None-Match")
+        if etag and etag == validators.get("etag"):
+            return True
+        since = self.headers.get("If-Modified-Since")
+        return bool(since and since == validators.get("last-modified"))
+
+    @staticmethod
+    def _validators(headers: dict) -> dict:
+        return {name: value for name, value in headers.items() if name.lower() in ("etag", "last-modified")}
+
+    def _rewrite_links(self, headers: dict):
+        recorded_base = self.state.cassette.base_url or "https://api.github.com"
+        own_base = f"http://{self.headers.get('Host')}"
+        for name in list(headers):
+            if name.lower() == "link":
+                headers[name] = headers[name].replace(recorded_base, own_base)
+
+    def _send(self, status: int, headers: dict, body: str):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            if name.lower() != "content-type":
+                self.send_header(name, value)
+        content_type = next((v for n, v in headers.items() if n.lower() == "content-type"), None)
+        self.send_header("Content-Type", content_type or "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_replay_server(cassette_path: str, config: Optional[ReplayConfig] = None,
+                        host: str = "127.0.0.1", port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Serve a cassette on a background thread. Returns (server, base_url); the
+    server's replay state (stats, quota) is available as server.state.
+    """
+    state = ReplayState(CassetteRepository(cassette_path), config or ReplayConfig())
+    handler = type("BoundReplayHandler", (ReplayHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.state = state
+    threading.Thread(target=server.serve_forever, name="github-replay", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a recorded GitHub API cassette.")
+    parser.add_argument("cassette")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=None, help="quota per window (default: recorded headers)")
+    parser.add_argument("--rate-window", type=float, default=3600, help="quota window in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=502)
+    parser.add_argument("--secondary-limit-rate", type=float, default=0.0, help="fraction answered 429 + Retry-After")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server, url = start_replay_server(args.cassette, ReplayConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        rate_limit=args.rate_limit, rate_window_seconds=args.rate_window,
+        error_rate=args.error_rate, error_status=args.error_status,
+        secondary_limit_rate=args.secondary_limit_rate, retry_after_seconds=args.retry_after,
+        seed=args.seed,
+    ), host=args.host, port=args.port)
+    print(f"📼 Replaying {len(server.state.cassette.interactions)} interaction(s) on {url}", flush=True)
+    print(f"   GITHUB_API_URL={url}", flush=True)
+    try:
+        while True:
+            time.sleep(60)
+            print(f"📊 {server.state.stats}", flush=True)
+    except KeyboardInterrupt:
+        server.shutdown()
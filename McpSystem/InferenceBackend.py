@@ -0,0 +1,269 @@
+# InferenceBackend.py
+# ===========================================================
+# Inference backends
+# -----------------------------------------------------------
+# - InferenceBackend: what Summarizer needs from a model
+#   (generate, generate_batch, stream + warm-up + stats)
+# - PhiBackend:  Phi-3.5 through ModelCore, or an InferencePool
+#                of ModelCore workers when INFERENCE_WORKERS > 1
+# - FakeBackend: deterministic canned summaries with simulated
+#                prefill / decode latency, no model download.
+#                Lets the API, MCP chain and storage be load-tested
+#                and profiled on their own.
+#
+# Selected with INFERENCE_BACKEND=phi|fake (default phi).
+# ===========================================================
+
+import hashlib
+import os
+import time
+
+from typing import Iterator, List, Protocol, Union
+
+from PromptTemplates import SECTION_HEADERS
+
+# Number of ModelCore replicas; more than one runs them as a multi-process pool
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "1"))
+
+# Simulated cost of the fake backend, in milliseconds per token
+FAKE_PREFILL_MS = float(os.getenv("FAKE_PREFILL_MS", "0.5"))
+FAKE_DECODE_MS = float(os.getenv("FAKE_DECODE_MS", "25"))
+
+
+class InferenceBackend(Protocol):
+    """
+    Model interface used by Summarizer. Keyword arguments follow ModelCore
+    (temperature, prefix/prefixes, stop_check/stop_checks, ...); backends
+    ignore the ones they have no use for.
+    """
+
+    tokenizer: object  # used for prompt token budgets; None means approximate counts
+    model_id: str      # identifies the outputs a backend produces (summary fingerprints)
+
+    def generate(self, prompt: str, max_new_tokens: int = 400, **kwargs) -> str: ...
+
+    def generate_batch(self, prompts: List[str], max_new_tokens: Union[int, List[int]] = 400,
+                       **kwargs) -> List[str]: ...
+
+    def stream(self, prompt: str, max_new_tokens: int = 400, **kwargs) -> Iterator[str]: ...
+
+    def warm(self, prefixes: List[str]) -> None: ...
+
+    def stats(self) -> dict: ...
+
+    def close(self) -> None: ...
+
+
+# ===========================================================
+# 🧠 Phi-3.5 (transformers)
+# ===========================================================
+class PhiBackend:
+    model_id = "microsoft/Phi-3.5-mini-instruct"
+
+    def __init__(self, workers: int = INFERENCE_WORKERS):
+        # Imported here so the fake backend never pulls in torch / transformers
+        if workers > 1:
+            from InferencePool import get_inference_pool
+            self.core = get_inference_pool(workers=workers)
+        else:
+            from ModelCore import get_model_instance
+            self.core = get_model_instance()
+
+    @property
+    def tokenizer(self):
+        return self.core.tokenizer
+
+    def generate(self, prompt: str, max_new_tokens: int = 400, **kwargs) -> str:
+        return self.core.generate_response(prompt, max_new_tokens=max_new_tokens, **kwargs)
+
+    def generate_batch(self, prompts: List[str], max_new_tokens: Union[int, List[int]] = 400,
+                       **kwargs) -> List[str]:
+        return self.core.generate_batch(prompts, max_new_tokens=max_new_tokens, **kwargs)
+
+    def stream(self, prompt: str, max_new_tokens: int = 400, **kwargs) -> Iterator[str]:
+        return self.core.generate_stream(prompt, max_new_tokens=max_new_tokens, **kwargs)
+
+    def warm(self, prefixes: List[str]):
+        """Precompute the KV state of the constant prompt prefixes."""
+        if hasattr(self.core, "wait_ready"):
+            for prefix in prefixes:
+                self.core.cache_prefix(prefix)
+            self.core.start()  # workers build the prefixes they are started with
+            return
+        print("Caching prompt prefixes...", flush=True)
+        for prefix in prefixes:
+            self.core.cache_prefix(prefix)
+
+    def stats(self) -> dict:
+        """Load time, RSS and decode throughput of the model (pool totals and per worker)."""
+        return self.core.get_stats()
+
+    def close(self):
+        """Drop the model (or stop the worker pool) so the next backend loads from scratch."""
+        if hasattr(self.core, "wait_ready"):
+            from InferencePool import reset_inference_pool
+            reset_inference_pool()
+        else:
+            from ModelCore import reset_model_instance
+            reset_model_instance()
+
+
+# ===========================================================
+# 🧪 Fake (deterministic, no model)
+# ===========================================================
+class FakeBackend:
+    """
+    Returns a summary shaped like the real templates, derived only from the
+    prompt text, so identical prompts always produce identical output.
+    Sleeps prefill_ms per prompt token and decode_ms per output token.
+    Words stand in for tokens.
+    """
+
+    tokenizer = None
+    model_id = "fake"
+
+    def __init__(self, prefill_ms: float = FAKE_PREFILL_MS, decode_ms: float = FAKE_DECODE_MS):
+        self.prefill_ms = prefill_ms
+        self.decode_ms = decode_ms
+        self._generated_tokens = 0
+        self._decode_seconds = 0.0
+
+    def generate(self, prompt: str, max_new_tokens: int = 400, **kwargs) -> str:
+        return "".join(self.stream(prompt, max_new_tokens=max_new_tokens, **kwargs)).strip()
+
+    def generate_batch(self, prompts: List[str], max_new_tokens: Union[int, List[int]] = 400,
+                       **kwargs) -> List[str]:
+        budgets = max_new_tokens if isinstance(max_new_tokens, list) else [max_new_tokens] * len(prompts)
+        stop_checks = kwargs.get("stop_checks") or [None] * len(prompts)
+
+        # One prefill for the whole batch, then decode steps until the longest row is done
+        start = time.perf_counter()
+        self._sleep_ms(self.prefill_ms * sum(len(p.split()) for p in prompts))
+        outputs = [
+            self._decode(self._canned_words(prompt), budget, stop_check)
+            for prompt, budget, stop_check in zip(prompts, budgets, stop_checks)
+        ]
+        self._sleep_ms(self.decode_ms * max((len(words) for words in outputs), default=0))
+        self._record(sum(len(words) for words in outputs), time.perf_counter() - start)
+        return ["".join(words).strip() for words in outputs]
+
+    def stream(self, prompt: str, max_new_tokens: int = 400, **kwargs) -> Iterator[str]:
+        start = time.perf_counter()
+        self._sleep_ms(self.prefill_ms * len(prompt.split()))
+        words = self._decode(self._canned_words(prompt), max_new_tokens, kwargs.get("stop_check"))
+        sent = 0
+        try:
+            for word in words:
+                self._sleep_ms(self.decode_ms)
+                sent += 1
+                yield word
+        finally:
+            self._record(sent, time.perf_counter() - start)
+
+    def warm(self, prefixes: List[str]):
+        pass
+
+    def stats(self) -> dict:
+        """Same keys as ModelCore.get_stats(); there is no model to load or hold in memory."""
+        seconds = self._decode_seconds
+        return {
+            "precision": None,
+            "load_seconds": 0.0,
+            "rss_mb": None,
+            "generated_tokens": self._generated_tokens,
+            "decode_seconds": round(seconds, 2),
+            "tokens_per_sec": round(self._generated_tokens / seconds, 2) if seconds else None,
+        }
+
+    def close(self):
+        pass
+
+    # -------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------
+    def _record(self, tokens: int, elapsed: float):
+        self._generated_tokens += tokens
+        self._decode_seconds += elapsed
+
+    @staticmethod
+    def _decode(words: List[str], budget: int, stop_check) -> List[str]:
+        """Apply the token budget and stop check the way ModelCore would."""
+        out = []
+        for word in words[:budget]:
+            out.append(word)
+            if stop_check and "\n" in word and stop_check("".join(out)):
+                break
+        return out
+
+    @staticmethod
+    def _canned_words(prompt: str) -> List[str]:
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        mode = "readme"
+        for candidate, headers in SECTION_HEADERS.items():
+            if all(header in prompt for header in headers):
+                mode = candidate
+                break
+
+        lines = []
+        for i, header in enumerate(SECTION_HEADERS[mode], start=1):
+            lines.append(f"**{i}. {header}**\n")
+            lines.append(f"- Simulated finding {digest[i * 4:i * 4 + 8]} for this section.\n")
+            if mode == "readme" and i == len(SECTION_HEADERS[mode]):
+                lines.append(f"- Score: {int(digest[:2], 16) % 10 + 1}/10\n")
+            lines.append("\n")
+
+        # Split into word-sized pieces that keep their whitespace, like decoded tokens
+        return [piece for line in lines for piece in _split_keep_space(line)]
+
+    @staticmethod
+    def _sleep_ms(ms: float):
+        if ms > 0:
+            time.sleep(ms / 1000)
+
+
+def _split_keep_space(text: str) -> List[str]:
+    pieces, current = [], ""
+    for ch in text:
+        current += ch
+        if ch.isspace():
+            pieces.append(current)
+            current = ""
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+# ===========================================================
+# 🔌 Selection
+# ===========================================================
+BACKENDS = {
+    "phi": PhiBackend,
+    "fake": FakeBackend,
+}
+
+_backend_instance: InferenceBackend = None
+
+def get_backend_model_id(name: str = None) -> str:
+    """model_id of the configured backend, without loading it."""
+    if _backend_instance is not None:
+        return _backend_instance.model_id
+    name = (name or os.getenv("INFERENCE_BACKEND", "phi")).lower()
+    return BACKENDS[name].model_id if name in BACKENDS else name
+
+def get_backend(name: str = None, **kwargs) -> InferenceBackend:
+    """Shared backend for the process, chosen by INFERENCE_BACKEND unless a name is given."""
+    global _backend_instance
+    if _backend_instance is None:
+        name = (name or os.getenv("INFERENCE_BACKEND", "phi")).lower()
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown inference backend '{name}', expected one of {list(BACKENDS)}")
+        print(f"🔌 Using '{name}' inference backend", flush=True)
+        _backend_instance = BACKENDS[name](**kwargs)
+    return _backend_instance
+
+def reset_backend():
+    """Close and drop the shared backend (e.g. after a failed warm-up); the next get_backend() starts over."""
+    global _backend_instance
+    backend, _backend_instance = _backend_instance, None
+    if backend is not None:
+        backend.close()
@@ -0,0 +1,388 @@
+# InferencePool.py
+# ===========================================================
+# Multi-replica inference pool
+# -----------------------------------------------------------
+# - Runs N ModelCore workers, each in its own process
+# - Pins every worker to its own slice of CPU cores / intra-op threads
+# - Requests go on one shared queue, so whichever worker is free
+#   picks up the next one
+# - Exposes the same generate_* methods as ModelCore
+# - A stream the caller stops reading is cancelled in its worker
+# - Workers report their ModelCore stats after every request
+# ===========================================================
+
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+
+from typing import Iterator, List, Optional, Union
+
+# How often callers re-check worker health while waiting for a result
+_POLL_SECONDS = 1.0
+
+
+# ===========================================================
+# 🧵 Worker process
+# ===========================================================
+def _worker_main(worker_id: int, cores: List[int], threads: int, model_kwargs: dict,
+                 prefixes: List[str], task_queue, result_queue, control_queue):
+    """
+    Worker entry point (runs in a spawned process).
+    Thread limits must be set before torch is imported, so ModelCore is imported here.
+    """
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+
+    import torch
+    torch.set_num_threads(threads)
+
+    from ModelCore import ModelCore
+
+    try:
+        core = ModelCore(**model_kwargs)
+        for prefix in prefixes:
+            core.cache_prefix(prefix)
+    except Exception as ex:
+        result_queue.put(("failed", worker_id, f"{type(ex).__name__}: {ex}"))
+        return
+
+    result_queue.put(("ready", worker_id, core.get_stats()))
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+
+        task_id, method, args, kwargs = task
+        try:
+            if method == "generate_stream":
+                result_queue.put(("started", task_id, worker_id))
+                stream = core.generate_stream(*args, **kwargs)
+                for chunk in stream:
+                    if _is_cancelled(control_queue, task_id):
+                        stream.close()  # stops decoding at the next token
+                        break
+                    result_queue.put(("chunk", task_id, chunk))
+                result_queue.put(("done", task_id, None))
+            else:
+                result_queue.put(("done", task_id, getattr(core, method)(*args, **kwargs)))
+        except Exception as ex:
+            result_queue.put(("error", task_id, f"{type(ex).__name__}: {ex}"))
+        result_queue.put(("stats", worker_id, core.get_stats()))
+
+
+def _is_cancelled(control_queue, task_id: int) -> bool:
+    """Drain the worker's cancel messages; ids of earlier tasks are stale and dropped."""
+    cancelled = False
+    while True:
+        try:
+            cancelled = control_queue.get_nowait() == task_id or cancelled
+        except queue.Empty:
+            return cancelled
+
+
+# ===========================================================
+# 🧠 Pool (parent process)
+# ===========================================================
+class InferencePool:
+    """
+    Pool of ModelCore replicas in separate processes.
+
+    Every worker holds its own copy of the weights in memory; only the checkpoint
+    files are shared, through the OS page cache, when the workers load them. With
+    precision="bf16" the checkpoint dtype is kept and no per-worker conversion pass
+    is needed.
+    """
+
+    def __init__(self,
+                 workers: int = 2,
+                 threads_per_worker: int = None,
+                 pin_cores: bool = True,
+                 prefixes: Optional[List[str]] = None,
+                 **model_kwargs):
+        self.workers = max(1, workers)
+        cpu_count = os.cpu_count() or 1
+        self.threads_per_worker = threads_per_worker or max(1, cpu_count // self.workers)
+        self.pin_cores = pin_cores
+        self.prefixes = list(prefixes or [])
+        self.model_kwargs = model_kwargs
+
+        self._ctx = mp.get_context("spawn")
+        self._task_queue = None
+        self._result_queue = None
+        self._processes = []
+        self._control_queues = []  # per worker, carries ids of cancelled streams
+        self._pending = {}  # task id -> queue.Queue of (kind, payload)
+        self._owners = {}   # stream task id -> id of the worker running it
+        self._worker_stats = {}  # worker id -> ModelCore.get_stats() after its last request
+        self._pending_lock = threading.Lock()
+        self._task_ids = itertools.count(1)
+        self._ready = 0
+        self._ready_event = threading.Event()
+        self._failure: Optional[str] = None
+        self._dispatcher = None
+        self._start_lock = threading.Lock()
+        self._tokenizer = None
+
+    # -------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------
+    def start(self, wait: bool = True):
+        with self._start_lock:
+            if not self._processes:
+                self._spawn_workers()
+        if wait:
+            self.wait_ready()
+
+    def _spawn_workers(self):
+        print(f"[POOL] 🚀 Starting {self.workers} inference worker(s), "
+              f"{self.threads_per_worker} thread(s) each...", flush=True)
+
+        self._task_queue = self._ctx.Queue()
+        self._result_queue = self._ctx.Queue()
+
+        cpu_count = os.cpu_count() or 1
+        for worker_id in range(self.workers):
+            cores = []
+            if self.pin_cores and self.workers * self.threads_per_worker <= cpu_count:
+                first = worker_id * self.threads_per_worker
+                cores = list(range(first, first + self.threads_per_worker))
+
+            control_queue = self._ctx.Queue()
+            proc = self._ctx.Process(
+                target=_worker_main,
+                args=(worker_id, cores, self.threads_per_worker, self.model_kwargs,
+                      self.prefixes, self._task_queue, self._result_queue, control_queue),
+                daemon=True,
+            )
+            proc.start()
+            self._processes.append(proc)
+            self._control_queues.append(control_queue)
+
+        self._dispatcher = threading.Thread(target=self._dispatch_results, args=(self._result_queue,),
+                                            daemon=True)
+        self._dispatcher.start()
+
+    def wait_ready(self, timeout: float = None):
+        """
+        Block until every worker has loaded. A worker that fails (or dies without
+        a word) stops the pool, so the next start() spawns fresh workers.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while not self._ready_event.wait(_POLL_SECONDS if deadline is None
+                                         else max(0.0, min(_POLL_SECONDS, deadline - time.time()))):
+            processes = self._processes
+            if not processes:
+                raise RuntimeError("Inference pool was stopped while starting")
+            dead = [p.pid for p in processes if not p.is_alive()]
+            if dead:
+                self._failure = self._failure or f"worker process(es) {dead} exited while loading"
+                break
+            if deadline is not None and time.time() >= deadline:
+                raise TimeoutError("Inference workers did not become ready in time")
+
+        failure = self._failure
+        if failure:
+            self.stop()
+            raise RuntimeError(f"Inference worker failed to start: {failure}")
+        if not self._processes:
+            raise RuntimeError("Inference pool was stopped while starting")
+
+    def stop(self):
+        """Stop the workers and reset the pool; pending requests fail, start() begins anew."""
+        with self._start_lock:
+            if not self._processes:
+                return
+            print("[POOL] 🛑 Stopping inference workers...", flush=True)
+            for _ in self._processes:
+                self._task_queue.put(None)
+            for proc in self._processes:
+                proc.join(timeout=10)
+                if proc.is_alive():
+                    proc.terminate()
+            self._result_queue.put(("stopped", None, None))  # ends this pool's dispatcher
+
+            self._processes = []
+            self._control_queues = []
+            self._ready = 0
+            self._ready_event.clear()
+            self._failure = None
+            with self._pending_lock:
+                self._owners.clear()
+                self._worker_stats.clear()
+                for results in self._pending.values():
+                    results.put(("error", "Inference pool stopped"))
+
+    def is_ready(self) -> bool:
+        return self._ready_event.is_set() and not self._failure
+
+    # -------------------------------------------------------
+    # ModelCore-compatible API
+    # -------------------------------------------------------
+    def generate_response(self, prompt: str, max_new_tokens: int = 400, temperature: float = 0.3,
+                          prefix: Optional[str] = None, **kwargs) -> str:
+        return self._call("generate_response", prompt, max_new_tokens=max_new_tokens,
+                          temperature=temperature, prefix=prefix, **kwargs)
+
+    def generate_batch(self, prompts: List[str], max_new_tokens: Union[int, List[int]] = 400,
+                       temperature: float = 0.3, **kwargs) -> List[str]:
+        return self._call("generate_batch", prompts, max_new_tokens=max_new_tokens,
+                          temperature=temperature, **kwargs)
+
+    def generate_stream(self, prompt: str, max_new_tokens: int = 400, temperature: float = 0.3,
+                        prefix: Optional[str] = None, **kwargs) -> Iterator[str]:
+        task_id = self._submit("generate_stream", (prompt,), dict(
+            max_new_tokens=max_new_tokens, temperature=temperature, prefix=prefix, **kwargs))
+        try:
+            while True:
+                kind, payload = self._next_result(task_id)
+                if kind != "chunk":
+                    return
+                yield payload
+        finally:
+            # Consumer went away early: cancel the stream in its worker
+            self._forget(task_id)
+
+    @property
+    def tokenizer(self):
+        """Tokenizer of the worker model, loaded in this process for prompt budgeting."""
+        if self._tokenizer is None:
+            from ModelCore import load_tokenizer
+            model_name = self.model_kwargs.get("model_name")
+            self._tokenizer = load_tokenizer(model_name) if model_name else load_tokenizer()
+        return self._tokenizer
+
+    def get_stats(self) -> dict:
+        """
+        Pool totals plus each worker's ModelCore stats, as of that worker's last
+        request. rss_mb adds up the workers; tokens_per_sec is per worker.
+        """
+        with self._pending_lock:
+            workers = [self._worker_stats[key] for key in sorted(self._worker_stats)]
+        tokens = sum(w["generated_tokens"] for w in workers)
+        seconds = sum(w["decode_seconds"] for w in workers)
+        return {
+            "precision": workers[0]["precision"] if workers else None,
+            "load_seconds": max((w["load_seconds"] or 0.0 for w in workers), default=None),
+            "rss_mb": round(sum(w["rss_mb"] or 0.0 for w in workers), 1) if workers else None,
+            "generated_tokens": tokens,
+            "decode_seconds": round(seconds, 2),
+            "tokens_per_sec": round(tokens / seconds, 2) if seconds else None,
+            "workers": workers,
+        }
+
+    def cache_prefix(self, prefix: str):
+        """Workers build prefix states on first use; prefixes passed at start are prebuilt."""
+        if prefix not in self.prefixes:
+            self.prefixes.append(prefix)
+
+    # -------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------
+    def _call(self, method: str, *args, **kwargs):
+        task_id = self._submit(method, args, kwargs)
+        _, payload = self._next_result(task_id)
+        return payload
+
+    def _submit(self, method: str, args: tuple, kwargs: dict) -> int:
+        self.start()
+        task_id = next(self._task_ids)
+        with self._pending_lock:
+            self._pending[task_id] = queue.Queue()
+        self._task_queue.put((task_id, method, args, kwargs))
+        return task_id
+
+    def _next_result(self, task_id: int):
+        """Wait for the next message of a task; raises if the task failed or a worker died."""
+        with self._pending_lock:
+            results = self._pending[task_id]
+        while True:
+            try:
+                kind, payload = results.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                dead = [p.pid for p in self._processes if not p.is_alive()]
+                if dead:
+                    self._forget(task_id)
+                    raise RuntimeError(f"Inference worker process(es) {dead} exited unexpectedly")
+                continue
+
+            if kind == "error":
+                self._forget(task_id)
+                raise RuntimeError(payload)
+            if kind == "done":
+                self._forget(task_id)
+            return kind, payload
+
+    def _forget(self, task_id: int):
+        """Stop routing a task's messages; a stream still running in a worker is cancelled."""
+        with self._pending_lock:
+            self._pending.pop(task_id, None)
+            worker_id = self._owners.pop(task_id, None)
+        if worker_id is not None:
+            self._cancel(worker_id, task_id)
+
+    def _cancel(self, worker_id: int, task_id: int):
+        control_queues = self._control_queues
+        if worker_id < len(control_queues):
+            control_queues[worker_id].put(task_id)
+
+    def _dispatch_results(self, result_queue):
+        """Route worker messages to the queue of the task they belong to."""
+        while True:
+            try:
+                kind, key, payload = result_queue.get()
+            except (EOFError, OSError):
+                return
+
+            if kind == "stopped":
+                return
+            if kind in ("ready", "stats"):
+                with self._pending_lock:
+                    self._worker_stats[key] = payload
+            if kind == "stats":
+                continue
+            if kind == "ready":
+                self._ready += 1
+                print(f"[POOL] ✅ Worker {key} ready ({self._ready}/{self.workers})", flush=True)
+                if self._ready == self.workers:
+                    self._ready_event.set()
+                continue
+            if kind == "failed":
+                self._failure = payload
+                self._ready_event.set()
+                continue
+
+            with self._pending_lock:
+                results = self._pending.get(key)
+                if kind == "started":
+                    if results is not None:
+                        self._owners[key] = payload
+                        continue
+                elif kind in ("done", "error"):
+                    self._owners.pop(key, None)
+            if kind == "started":
+                self._cancel(payload, key)  # caller already gave up on this stream
+            elif results is not None:
+                results.put((kind, payload))
+
+
+# Shared pool for the process, created on first use
+_pool_instance: InferencePool = None
+
+def get_inference_pool(**kwargs) -> InferencePool:
+    global _pool_instance
+    if _pool_instance is None:
+        _pool_instance = InferencePool(**kwargs)
+    return _pool_instance
+
+def reset_inference_pool():
+    """Stop and drop the shared pool (e.g. after a failed load); the next get_inference_pool() starts over."""
+    global _pool_instance
+    pool, _pool_instance = _pool_instance, None
+    if pool is not None:
+        pool.stop()
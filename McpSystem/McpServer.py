@@ -3,7 +3,8 @@
 import json
 import sys
 import asyncio
-from Summarizer import Summarizer
+from Summarizer import Summarizer, model_warmup
+from GithubApi import get_rate_limit_budget
 from Tools import tool, TOOLS
 
 summarizer = None
@@ -16,20 +17,39 @@ def get_summarizer():
     return summarizer
 
 @tool("summarize.readme")
-async def summarize_readme(owner: str, repo: str):
-    return get_summarizer().summarize_repo_readme(owner, repo)
+async def summarize_readme(owner: str, repo: str, force: bool = False):
+    return get_summarizer().summarize_repo_readme(owner, repo, force)
 
 @tool("summarize.commits")
-async def summarize_commits(owner: str, repo: str):
-    return get_summarizer().summarize_commits(owner, repo)
+async def summarize_commits(owner: str, repo: str, force: bool = False):
+    return get_summarizer().summarize_commits(owner, repo, force)
 
 @tool("summarize.issues")
-async def summarize_issues(owner: str, repo: str):
-    return get_summarizer().summarize_issues(owner, repo)
+async def summarize_issues(owner: str, repo: str, force: bool = False):
+    return get_summarizer().summarize_issues(owner, repo, force)
 
 @tool("summarize.pull_requests")
-async def summarize_pull_requests(owner: str, repo: str):
-    return get_summarizer().summarize_pull_requests(owner, repo)
+async def summarize_pull_requests(owner: str, repo: str, force: bool = False):
+    return get_summarizer().summarize_pull_requests(owner, repo, force)
+
+@tool("summarize.all")
+async def summarize_all(owner: str, repo: str, force: bool = False):
+    # All four modes from one snapshot, decoded as one batch
+    return get_summarizer().summarize_all(owner, repo, force)
+
+@tool("summarize.batch")
+async def summarize_batch(jobs: list, force: bool = False):
+    # jobs: [[owner, repo, mode], ...] decoded together in one batch
+    return get_summarizer().summarize_batch(jobs, force)
+
+
+@tool("model.status")
+async def model_status():
+    return model_warmup.status()
+
+@tool("github.rate_limit")
+async def github_rate_limit():
+    return get_rate_limit_budget()
 
 
 # ✅ Updated to prevent VS debugger from stopping on 'await' TypeError
@@ -39,6 +59,7 @@ async def main(input_stream=None):
     If input_stream is an asyncio.Queue → read via queue (debug/in-process mode)
     """
     print("⚙ MCP Server running (awaiting JSON-RPC)...", file=sys.stderr, flush=True)
+    model_warmup.start()  # load the model in the background while we accept requests
 
     while True:
         try:
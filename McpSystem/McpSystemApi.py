@@ -15,16 +15,28 @@ import uvicorn
 import os
 import json
 
-from typing import Any, Dict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from starlette.concurrency import iterate_in_threadpool
 from McpHost import McpHostController
+from SummaryJobs import JobQueueFullError, SummaryJobQueue
 from fastapi.middleware.cors import CORSMiddleware
 
 # 🔧 Debug mode: True = direct calls (VS debugger friendly), False = subprocess mode
 # Set to True to avoid Windows subprocess pipe issues
 DEBUG_MODE = True # os.getenv("MCP_DEBUG_MODE", "true").lower() == "true"
 
+# Summary mode (URL / file name) → JSON-RPC method
+MODE_METHODS = {
+    "readme": "summarize.readme",
+    "commits": "summarize.commits",
+    "issues": "summarize.issues",
+    "pulls": "summarize.pull_requests",
+}
+
 
 # ===========================================================
 # 🧪 Debug Mode Controller (Direct Calls - No Subprocesses)
@@ -39,11 +51,29 @@ class McpDebugController:
     async def start(self):
         if not self._started:
             print("[DEBUG API] 🐛 Starting MCP in DEBUG mode (direct calls, no subprocesses)...", flush=True)
-            # Import here to avoid circular dependency
-            from Summarizer import Summarizer
-            self._summarizer = Summarizer()
+            # Importing pulls in torch/transformers; do it off the event loop.
+            # The model itself keeps loading in the background after this returns.
+            self._summarizer = await asyncio.to_thread(self._create_summarizer)
             self._started = True
-            print("[DEBUG API] ✅ MCP DEBUG mode ready.", flush=True)
+            print("[DEBUG API] ✅ MCP DEBUG mode ready (model warming up in background).", flush=True)
+
+    @staticmethod
+    def _create_summarizer():
+        # Import here to avoid circular dependency
+        from Summarizer import Summarizer
+        return Summarizer()
+
+    async def model_status(self) -> dict:
+        """Model readiness: idle / loading / warming / ready / failed."""
+        if not self._started:
+            return {"state": "idle", "error": None, "elapsed_seconds": None, "stats": None}
+        from Summarizer import model_warmup
+        return model_warmup.status()
+
+    async def github_rate_limit(self) -> dict:
+        """Remaining GitHub quota per credential."""
+        from GithubApi import get_rate_limit_budget
+        return get_rate_limit_budget()
 
     async def stop(self):
         print("[DEBUG API] 🛑 Stopping DEBUG mode...", flush=True)
@@ -87,21 +117,50 @@ class McpDebugController:
         with open(path, "r", encoding="utf-8") as f:
             return json.load(f)
 
+    def stream_summary(self, owner: str, repo: str, mode: str, force: bool = False):
+        """
+        Sync generator (consumed from a worker thread) of ("token", chunk) events,
+        then ("done", summary) with the summary as it was saved.
+        """
+        stream = self._summarizer.summarize_stream(owner, repo, mode, force)
+        try:
+            while True:
+                try:
+                    chunk = next(stream)
+                except StopIteration as finished:
+                    yield "done", finished.value
+                    return
+                yield "token", chunk
+        finally:
+            stream.close()  # client went away: stop generating
+
     async def send_request(self, request: dict) -> dict:
-        """Handle request by directly calling tool methods."""
+        """
+        Handle request by directly calling tool methods.
+        Summaries run in a worker thread so the event loop stays free and
+        concurrent requests can use every inference worker.
+        """
         method = request.get("method")
         params = request.get("params", {})
         request_id = request.get("id", 1)
 
         try:
             if method == "summarize.readme":
-                result = self._summarizer.summarize_repo_readme(**params)
+                result = await asyncio.to_thread(self._summarizer.summarize_repo_readme, **params)
             elif method == "summarize.commits":
-                result = self._summarizer.summarize_commits(**params)
+                result = await asyncio.to_thread(self._summarizer.summarize_commits, **params)
             elif method == "summarize.issues":
-                result = self._summarizer.summarize_issues(**params)
+                result = await asyncio.to_thread(self._summarizer.summarize_issues, **params)
             elif method == "summarize.pull_requests":
-                result = self._summarizer.summarize_pull_requests(**params)
+                result = await asyncio.to_thread(self._summarizer.summarize_pull_requests, **params)
+            elif method == "summarize.all":
+                result = await asyncio.to_thread(self._summarizer.summarize_all, **params)
+            elif method == "summarize.batch":
+                result = await asyncio.to_thread(self._summarizer.summarize_batch, **params)
+            elif method == "model.status":
+                result = await self.model_status()
+            elif method == "github.rate_limit":
+                result = await self.github_rate_limit()
             elif method == "ping":
                 result = {"ok": True, "mode": "debug"}
             else:
@@ -133,8 +192,13 @@ class McpSystemApi:
             print("[SYSTEM API] 🚀 Using PRODUCTION mode (subprocesses)", flush=True)
             self.host = McpHostController()
         self._started = False
+        self._start_lock = asyncio.Lock()
 
     async def start_system(self):
+        async with self._start_lock:
+            await self._start_system()
+
+    async def _start_system(self):
         if not self._started:
             print("[SYSTEM API] 🚀 Starting MCP system (Host + Client + Server)...", flush=True)
             await self.host.start()
@@ -152,47 +216,102 @@ class McpSystemApi:
         else:
             print("[SYSTEM API] 💤 MCP system not running.", flush=True)
 
-    async def summarize_repo(self, owner: str, repo: str) -> Dict[str, Any]:
+    async def summarize_repo(self, owner: str, repo: str, force: bool = False) -> Dict[str, Any]:
         await self.start_system()
         request = {
             "jsonrpc": "2.0",
             "id": 1,
             "method": "summarize.readme",
-            "params": {"owner": owner, "repo": repo},
+            "params": {"owner": owner, "repo": repo, "force": force},
         }
         print(f"[SYSTEM API] 📨 summarize_repo({owner}/{repo})...")
         return await self.host.send_request(request)
 
-    async def summarize_commits(self, owner: str, repo: str) -> Dict[str, Any]:
+    async def summarize_commits(self, owner: str, repo: str, force: bool = False) -> Dict[str, Any]:
         await self.start_system()
         req = {
             "jsonrpc": "2.0",
             "id": 2,
             "method": "summarize.commits",
-            "params": {"owner": owner, "repo": repo},
+            "params": {"owner": owner, "repo": repo, "force": force},
         }
         return await self.host.send_request(req)
 
-    async def summarize_issues(self, owner: str, repo: str) -> Dict[str, Any]:
+    async def summarize_issues(self, owner: str, repo: str, force: bool = False) -> Dict[str, Any]:
         await self.start_system()
         req = {
             "jsonrpc": "2.0",
             "id": 3,
             "method": "summarize.issues",
-            "params": {"owner": owner, "repo": repo},
+            "params": {"owner": owner, "repo": repo, "force": force},
         }
         return await self.host.send_request(req)
 
-    async def summarize_pulls(self, owner: str, repo: str) -> Dict[str, Any]:
+    async def summarize_pulls(self, owner: str, repo: str, force: bool = False) -> Dict[str, Any]:
         await self.start_system()
         req = {
             "jsonrpc": "2.0",
             "id": 4,
             "method": "summarize.pull_requests",
-            "params": {"owner": owner, "repo": repo},
+            "params": {"owner": owner, "repo": repo, "force": force},
+        }
+        return await self.host.send_request(req)
+
+    async def summarize_all(self, owner: str, repo: str, force: bool = False) -> Dict[str, Any]:
+        """All four summaries in one request: {mode: summary} in result."""
+        await self.start_system()
+        req = {
+            "jsonrpc": "2.0",
+            "id": 8,
+            "method": "summarize.all",
+            "params": {"owner": owner, "repo": repo, "force": force},
         }
+        print(f"[SYSTEM API] 📨 summarize_all({owner}/{repo})...")
         return await self.host.send_request(req)
 
+    async def summarize_stream(self, owner: str, repo: str, mode: str, force: bool = False) -> AsyncIterator[tuple]:
+        """
+        Yield ("token", chunk) events as the summary is generated, then
+        ("done", summary) with the summary as it was saved.
+        Hosts without token streaming (subprocess mode) send the full summary as one chunk.
+        """
+        await self.start_system()
+        print(f"[SYSTEM API] 📡 summarize_stream({owner}/{repo}, {mode})...")
+
+        if hasattr(self.host, "stream_summary"):
+            async for event in iterate_in_threadpool(self.host.stream_summary(owner, repo, mode, force)):
+                yield event
+            return
+
+        req = {
+            "jsonrpc": "2.0",
+            "id": 5,
+            "method": MODE_METHODS[mode],
+            "params": {"owner": owner, "repo": repo, "force": force},
+        }
+        resp = await self.host.send_request(req)
+        if "error" in resp:
+            raise RuntimeError(str(resp["error"]))
+        summary = resp.get("result", "")
+        yield "token", summary
+        yield "done", summary
+
+    async def model_status(self) -> Dict[str, Any]:
+        """Readiness of the inference model, without waiting for it."""
+        if not self._started:
+            return {"state": "idle", "error": None, "elapsed_seconds": None, "stats": None}
+        req = {"jsonrpc": "2.0", "id": 6, "method": "model.status", "params": {}}
+        resp = await self.host.send_request(req)
+        return resp.get("result", {"state": "unknown", "error": resp.get("error")})
+
+    async def github_rate_limit(self) -> Dict[str, Any]:
+        """Remaining GitHub quota per credential, as seen by the MCP server."""
+        if not self._started:
+            return {}
+        req = {"jsonrpc": "2.0", "id": 7, "method": "github.rate_limit", "params": {}}
+        resp = await self.host.send_request(req)
+        return resp.get("result", {})
+
     async def ping(self) -> bool:
         try:
             await self.start_system()
@@ -209,7 +328,36 @@ class McpSystemApi:
 # 🌐 Integrated FastAPI server
 # ===========================================================
 
-app = FastAPI(title="MCP System API", version="1.0.0")
+api = McpSystemApi()  # Will auto-detect DEBUG_MODE from environment
+
+async def run_summary_job(params: dict) -> Any:
+    """Work of one background job: the same call the matching /summarize endpoint makes."""
+    summarize = {
+        "readme": api.summarize_repo,
+        "commits": api.summarize_commits,
+        "issues": api.summarize_issues,
+        "pulls": api.summarize_pulls,
+        "all": api.summarize_all,
+    }[params["mode"]]
+    resp = await summarize(params["owner"], params["repo"], params["force"])
+    if "error" in resp:
+        raise RuntimeError(resp["error"].get("message", str(resp["error"])))
+    return resp.get("result")
+
+jobs = SummaryJobQueue(run=run_summary_job)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start the MCP system (and model warm-up) in the background so the
+    # server binds and serves cached /summary reads immediately.
+    startup = asyncio.create_task(api.start_system())
+    jobs.start()
+    yield
+    await jobs.stop()
+    startup.cancel()
+    await api.stop_system()
+
+app = FastAPI(title="MCP System API", version="1.0.0", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],      # or ["http://localhost:63641"] to be strict
@@ -218,11 +366,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-api = McpSystemApi()  # Will auto-detect DEBUG_MODE from environment
-
 class RepoRequest(BaseModel):
     owner: str
     repo: str
+    force: bool = False  # regenerate even when the GitHub inputs are unchanged
+
+# ---- System / model readiness ----
+@app.get("/status")
+async def status():
+    try:
+        model = await api.model_status()
+        github = await api.github_rate_limit()
+        return {
+            "status": "ok",
+            "data": {
+                "mode": "debug" if api.debug else "production",
+                "system_started": api._started,
+                "model": model,
+                "github": github,
+                "jobs": jobs.stats(),
+            },
+        }
+    except Exception as ex:
+        raise HTTPException(status_code=500, detail=str(ex))
 
 # ---- Cached Summary Endpoints (placeholders only) ----
 @app.get("/summaries")
@@ -250,7 +416,7 @@ async def get_summary(owner: str, repo: str, mode: str):
 @app.post("/summarize/readme")
 async def summarize_readme(req: RepoRequest):
     try:
-        result = await api.summarize_repo(req.owner, req.repo)
+        result = await api.summarize_repo(req.owner, req.repo, req.force)
         return {"status": "ok", "data": result}
     except Exception as ex:
         raise HTTPException(status_code=500, detail=str(ex))
@@ -258,7 +424,7 @@ async def summarize_readme(req: RepoRequest):
 @app.post("/summarize/commits")
 async def summarize_commits(req: RepoRequest):
     try:
-        result = await api.summarize_commits(req.owner, req.repo)
+        result = await api.summarize_commits(req.owner, req.repo, req.force)
         return {"status": "ok", "data": result}
     except Exception as ex:
         raise HTTPException(status_code=500, detail=str(ex))
@@ -266,7 +432,7 @@ async def summarize_commits(req: RepoRequest):
 @app.post("/summarize/issues")
 async def summarize_issues(req: RepoRequest):
     try:
-        result = await api.summarize_issues(req.owner, req.repo)
+        result = await api.summarize_issues(req.owner, req.repo, req.force)
         return {"status": "ok", "data": result}
     except Exception as ex:
         raise HTTPException(status_code=500, detail=str(ex))
@@ -274,11 +440,77 @@ async def summarize_issues(req: RepoRequest):
 @app.post("/summarize/pulls")
 async def summarize_pulls(req: RepoRequest):
     try:
-        result = await api.summarize_pulls(req.owner, req.repo)
+        result = await api.summarize_pulls(req.owner, req.repo, req.force)
         return {"status": "ok", "data": result}
     except Exception as ex:
         raise HTTPException(status_code=500, detail=str(ex))
 
+@app.post("/summarize/all")
+async def summarize_all(req: RepoRequest):
+    try:
+        result = await api.summarize_all(req.owner, req.repo, req.force)
+        return {"status": "ok", "data": result}
+    except Exception as ex:
+        raise HTTPException(status_code=500, detail=str(ex))
+
+# ---- Background Job Endpoints (submit, then poll) ----
+class JobRequest(RepoRequest):
+    mode: str = "all"  # readme | commits | issues | pulls | all
+
+@app.post("/jobs", status_code=202)
+async def submit_job(req: JobRequest):
+    if req.mode not in MODE_METHODS and req.mode != "all":
+        raise HTTPException(status_code=400, detail=f"Unknown summary mode: {req.mode}")
+    try:
+        job = jobs.submit({"owner": req.owner, "repo": req.repo, "mode": req.mode, "force": req.force})
+        return {"status": "ok", "data": job}
+    except JobQueueFullError as ex:
+        raise HTTPException(status_code=429, detail=str(ex))
+
+@app.get("/jobs")
+async def list_jobs():
+    return {"status": "ok", "data": jobs.list()}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return {"status": "ok", "data": job}
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    job = jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return {"status": "ok", "data": job}
+
+# ---- Streaming Summary Endpoints (Server-Sent Events) ----
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/summarize/{mode}/stream")
+async def summarize_stream(mode: str, req: RepoRequest):
+    if mode not in MODE_METHODS:
+        raise HTTPException(status_code=404, detail=f"Unknown summary mode: {mode}")
+
+    async def events():
+        try:
+            async for event, text in api.summarize_stream(req.owner, req.repo, mode, req.force):
+                if event == "token":
+                    yield _sse("token", {"text": text})
+                else:
+                    # The stored summary (finalized), not just the joined tokens
+                    yield _sse("done", {"summary": text})
+        except Exception as ex:
+            yield _sse("error", {"message": str(ex)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 if __name__ == "__main__":
     print("[MCP SYSTEM API] 🚀 Launching web server on http://localhost:8000", flush=True)
     uvicorn.run("McpSystemApi:app", 
@@ -2,18 +2,48 @@
 import warnings
 import contextlib
 import io
+import queue
 import torch
 import time
+import threading
+import transformers
 
-from transformers import AutoTokenizer, AutoModelForCausalLM
+from collections import OrderedDict
+
+from transformers import (
+    AutoTokenizer,
+    AutoModelForCausalLM,
+    DynamicCache,
+    LogitsProcessorList,
+    RepetitionPenaltyLogitsProcessor,
+    TemperatureLogitsWarper,
+    TopPLogitsWarper,
+)
 from huggingface_hub import snapshot_download  # external Hugging Face utility
+from GenerationCache import GenerationCache
 
 try:
     from peft import PeftModel
 except ImportError:
     PeftModel = None
 
-from typing import List
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+
+# Stop check: text generated so far -> True when the row is done
+StopCheck = Callable[[str], bool]
+
+# Weight precision modes: name → dtype the checkpoint is loaded in.
+# "int8" loads fp32 weights, then swaps nn.Linear layers for dynamically quantized ones.
+PRECISION_MODES = {
+    "fp32": torch.float32,
+    "bf16": torch.bfloat16,
+    "int8": torch.float32,
+}
 
 # Core class that wraps Phi-3 Model.
 class ModelCore:
@@ -24,7 +54,12 @@ class ModelCore:
                 safe_mode = True,
                 max_new_tokens: int = 300,
                 temperature: float = 0.5,
-                top_p: float = 0.9):
+                top_p: float = 0.9,
+                prefix_cache_size: int = 8,
+                precision: str = None,
+                deterministic: bool = None,
+                seed: int = 0,
+                generation_cache: Optional[GenerationCache] = None):
         
         self.model_name = model_name
         self.adapter_path = adapter_path
@@ -33,9 +68,32 @@ class ModelCore:
         self.max_new_tokens = max_new_tokens
         self.temperature = temperature
         self.top_p = top_p
+        self.prefix_cache_size = prefix_cache_size
+        self.precision = (precision or os.getenv("MODEL_PRECISION", "fp32")).lower()
+        if self.precision not in PRECISION_MODES:
+            raise ValueError(f"Unknown precision '{self.precision}', expected one of {list(PRECISION_MODES)}")
+
+        # Deterministic mode samples with a fixed seed, which makes sampled outputs cacheable
+        if deterministic is None:
+            deterministic = os.getenv("MODEL_DETERMINISTIC", "false").lower() == "true"
+        self.deterministic = deterministic
+        self.seed = seed
+        if generation_cache is None and os.getenv("MODEL_GENERATION_CACHE", "true").lower() == "true":
+            generation_cache = GenerationCache()
+        self.generation_cache = generation_cache
+        self.adapter_loaded = False
         
         self.model = None
         self.tokenizer = None
+        self._prefix_cache: "OrderedDict[str, dict]" = OrderedDict()  # prefix text -> cached KV state
+        self._lock = threading.RLock()  # one generation at a time per replica
+        self.stats = {
+            "precision": self.precision,
+            "load_seconds": None,
+            "rss_mb": None,
+            "generated_tokens": 0,
+            "decode_seconds": 0.0,
+        }
         self._load_model()
     
     def _load_model(self):
@@ -50,6 +108,7 @@ class ModelCore:
         start_time = time.time()
         print(f"\n🧠 Loading model: {self.model_name}")
         print(f"Safe mode: {'ON' if self.safe_mode else 'OFF'}")
+        print(f"Precision: {self.precision}")
 
         # --------------------------------------------
         # Safe-mode environment setup
@@ -107,7 +166,7 @@ class ModelCore:
         self.model = AutoModelForCausalLM.from_pretrained(
             model_dir,
             trust_remote_code=trust_remote,
-            torch_dtype=torch.float32,
+            torch_dtype=PRECISION_MODES[self.precision],
             device_map=self.device,
             low_cpu_mem_usage=True
         )
@@ -122,39 +181,557 @@ class ModelCore:
         ):
             print(f"Loading LoRA adapters from {self.adapter_path}...", flush=True)
             self.model = PeftModel.from_pretrained(self.model, self.adapter_path)
+            self.adapter_loaded = True
             print("Adapters loaded successfully.", flush=True)
         else:
             print("Skipping adapter load for safety or missing path.", flush=True)
 
+        # --------------------------------------------
+        # Weight-only int8 quantization
+        # --------------------------------------------
+        if self.precision == "int8":
+            self._quantize_int8()
+
         elapsed = time.time() - start_time
-        print(f"✅ Model ready (loaded in {elapsed:.2f} seconds)\n", flush=True)
+        self.stats["load_seconds"] = round(elapsed, 2)
+        self.stats["rss_mb"] = current_rss_mb()
+        print(f"✅ Model ready (loaded in {elapsed:.2f} seconds, "
+              f"precision {self.precision}, RSS {self.stats['rss_mb']} MB)\n", flush=True)
+
+    def _quantize_int8(self):
+        """
+        Replace every nn.Linear with a dynamically quantized int8 version (weights int8,
+        activations quantized on the fly). LoRA adapters are merged first so they are
+        quantized together with the base weights.
+        """
+        print("Quantizing linear layers to int8 (dynamic)...", flush=True)
+        if PeftModel and isinstance(self.model, PeftModel):
+            self.model = self.model.merge_and_unload()
+        self.model = torch.ao.quantization.quantize_dynamic(
+            self.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        self.model.eval()
+
+    def get_stats(self) -> dict:
+        """Load time, resident memory and decode throughput for the current precision mode."""
+        stats = dict(self.stats)
+        stats["rss_mb"] = current_rss_mb()
+        seconds = stats["decode_seconds"]
+        stats["decode_seconds"] = round(seconds, 2)
+        stats["tokens_per_sec"] = round(stats["generated_tokens"] / seconds, 2) if seconds else None
+        stats["generation_cache"] = self.generation_cache.stats() if self.generation_cache else None
+        return stats
 
     # ModelCore.py  (replace your generate_response with this)
-    def generate_response(self, prompt: str, max_new_tokens: int = 400, temperature: float = 0.3) -> str:
-        inputs = self.tokenizer(prompt, return_tensors="pt").to(self.device)
+    def generate_response(self, prompt: str, max_new_tokens: int = 400, temperature: float = 0.3,
+                          prefix: Optional[str] = None, seed: Optional[int] = None,
+                          top_p: float = None, repetition_penalty: float = 1.05,
+                          stop_check: Optional[StopCheck] = None) -> str:
+        return self.generate_batch([prompt], max_new_tokens=max_new_tokens, temperature=temperature,
+                                   top_p=top_p, repetition_penalty=repetition_penalty,
+                                   prefixes=[prefix], seed=seed, stop_checks=[stop_check])[0]
+
+    def generate_batch(self,
+                       prompts: List[str],
+                       max_new_tokens: Union[int, List[int]] = 400,
+                       temperature: float = 0.3,
+                       top_p: float = None,
+                       repetition_penalty: float = 1.05,
+                       prefixes: Optional[List[Optional[str]]] = None,
+                       seed: Optional[int] = None,
+                       stop_checks: Optional[List[Optional[StopCheck]]] = None) -> List[str]:
+        """
+        Generate responses for several prompts in one padded batch.
+        - Prompts are left-padded so every row decodes from the same position.
+        - max_new_tokens may be a single value or one value per prompt.
+        - A row leaves the batch as soon as it hits EOS or its own token budget,
+          so the remaining rows keep decoding with a smaller forward pass.
+        - prefixes (optional, one per prompt): constant leading text of the prompt.
+          Its KV state comes from the prefix cache and only the rest is prefilled.
+        - seed: sample every row from its own generator with this seed (defaults to
+          self.seed in deterministic mode). Greedy or seeded results are served from
+          and stored in the generation cache.
+        - stop_checks (optional, one per prompt): called with the row's text each time
+          it completes a line; returning True ends that row like EOS would.
+        Returns one response per prompt, in the same order.
+        """
+        if not prompts:
+            return []
+
+        budgets = self._per_prompt_budgets(prompts, max_new_tokens)
+        top_p = self.top_p if top_p is None else top_p
+        prefixes = prefixes or [None] * len(prompts)
+        stop_checks = stop_checks or [None] * len(prompts)
+        seed = self._resolve_seed(temperature, seed)
 
-        outputs = self.model.generate(
-            **inputs,
+        keys = [
+            self._generation_key(prompt, budget, temperature, top_p, repetition_penalty, seed, stop_check)
+            for prompt, budget, stop_check in zip(prompts, budgets, stop_checks)
+        ]
+        results: List[Optional[str]] = [
+            self.generation_cache.get(key) if key else None for key in keys
+        ]
+        misses = [i for i, text in enumerate(results) if text is None]
+        if len(misses) < len(prompts):
+            print(f"💾 Generation cache: {len(prompts) - len(misses)}/{len(prompts)} hit(s)", flush=True)
+        if not misses:
+            return results
+
+        with self._lock:
+            batch = self._build_batch([prompts[i] for i in misses], [prefixes[i] for i in misses])
+            generated = self._decode_loop(
+                **batch,
+                budgets=[budgets[i] for i in misses],
+                temperature=temperature,
+                top_p=top_p,
+                repetition_penalty=repetition_penalty,
+                seed=seed,
+                stop_checks=[stop_checks[i] for i in misses],
+            )
+
+        # ⚠️ Only decode the newly generated tokens (exclude the prompt)
+        for i, ids in zip(misses, generated):
+            results[i] = self.tokenizer.decode(ids, skip_special_tokens=True).strip()
+            if keys[i]:
+                self.generation_cache.put(keys[i], results[i])
+        return results
+
+    def generate_stream(self,
+                        prompt: str,
+                        max_new_tokens: int = 400,
+                        temperature: float = 0.3,
+                        prefix: Optional[str] = None,
+                        top_p: float = None,
+                        repetition_penalty: float = 1.05,
+                        seed: Optional[int] = None,
+                        stop_check: Optional[StopCheck] = None) -> Iterator[str]:
+        """
+        Stream one response as text chunks while it is being decoded.
+        Chunks joined together equal generate_response() output (minus trailing whitespace).
+        A generation cache hit is yielded as a single chunk.
+        Decoding runs on its own thread (which holds the replica lock) and hands chunks
+        over through a queue, so the stream may be consumed from any thread(s);
+        closing the stream early stops decoding at the next token.
+        """
+        top_p = self.top_p if top_p is None else top_p
+        seed = self._resolve_seed(temperature, seed)
+        key = self._generation_key(prompt, max_new_tokens, temperature, top_p, repetition_penalty, seed,
+                                   stop_check)
+
+        cached = self.generation_cache.get(key) if key else None
+        if cached is not None:
+            print("💾 Generation cache: 1/1 hit(s)", flush=True)
+            yield cached
+            return
+
+        chunks: queue.Queue = queue.Queue()
+        closed = threading.Event()
+        decoder = threading.Thread(
+            target=self._stream_decode,
+            args=(chunks, closed, key, prompt, prefix),
+            kwargs=dict(
+                budgets=[max_new_tokens],
+                temperature=temperature,
+                top_p=top_p,
+                repetition_penalty=repetition_penalty,
+                seed=seed,
+                stop_checks=[stop_check],
+            ),
+            name="model-stream",
+            daemon=True,
+        )
+        decoder.start()
+        try:
+            while True:
+                kind, value = chunks.get()
+                if kind == "chunk":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    return
+        finally:
+            closed.set()
+
+    def _stream_decode(self, chunks: queue.Queue, closed: threading.Event, key: Optional[str],
+                       prompt: str, prefix: Optional[str], **decode_kwargs):
+        """Decode thread of generate_stream: puts ("chunk", text) items, then ("done" | "error", ...)."""
+        try:
+            with self._lock:
+                batch = self._build_batch([prompt], [prefix])
+
+                token_ids: List[int] = []
+                emitted = ""
+                steps = self._decode_steps(**batch, **decode_kwargs)
+                try:
+                    for _, token in steps:
+                        if closed.is_set():
+                            return  # consumer went away; free the replica
+                        token_ids.append(token)
+                        text = self.tokenizer.decode(token_ids, skip_special_tokens=True).lstrip()
+                        # Hold back partial multi-byte characters until the next token completes them
+                        if text.endswith("\ufffd") or len(text) <= len(emitted):
+                            continue
+                        chunk, emitted = text[len(emitted):], text
+                        chunks.put(("chunk", chunk))
+                finally:
+                    steps.close()
+
+            # Only reached when the stream ran to completion
+            if key:
+                final = self.tokenizer.decode(token_ids, skip_special_tokens=True).strip()
+                self.generation_cache.put(key, final)
+            chunks.put(("done", None))
+        except BaseException as ex:
+            chunks.put(("error", ex))
+
+    # --------------------------------------------
+    # Generation cache
+    # --------------------------------------------
+    def _resolve_seed(self, temperature: float, seed: Optional[int]) -> Optional[int]:
+        if temperature <= 0:
+            return None  # greedy needs no seed
+        if seed is None and self.deterministic:
+            return self.seed
+        return seed
+
+    def _generation_key(self, prompt: str, max_new_tokens: int, temperature: float, top_p: float,
+                        repetition_penalty: float, seed: Optional[int],
+                        stop_check: Optional[StopCheck] = None) -> Optional[str]:
+        """Cache key for a deterministic generation, None when the output would not be reproducible."""
+        if self.generation_cache is None or (temperature > 0 and seed is None):
+            return None
+        return GenerationCache.make_key(
+            model=self.model_name,
+            adapter=self.adapter_path if self.adapter_loaded else None,
+            precision=self.precision,
+            prompt=prompt,
             max_new_tokens=max_new_tokens,
             temperature=temperature,
-            do_sample=True,
-            top_p=0.9,
-            repetition_penalty=1.05,
-            eos_token_id=self.tokenizer.eos_token_id,
+            top_p=top_p if temperature > 0 else None,
+            repetition_penalty=repetition_penalty,
+            seed=seed,
+            stop=repr(stop_check) if stop_check else None,
         )
 
-        # ⚠️ Only decode the newly generated tokens (exclude the prompt)
-        generated_ids = outputs[0][inputs.input_ids.shape[-1]:]
-        text = self.tokenizer.decode(generated_ids, skip_special_tokens=True)
-        return text.strip()
+    # --------------------------------------------
+    # Shared-prefix KV cache
+    # --------------------------------------------
+    def _prefix_cache_version(self) -> str:
+        """Identifies the tokenizer/model pair a cached prefix state was computed with."""
+        config = getattr(self.model, "config", None)
+        return "|".join(str(part) for part in (
+            self.model_name,
+            getattr(config, "_commit_hash", None) or getattr(config, "_name_or_path", ""),
+            getattr(self.tokenizer, "name_or_path", ""),
+            len(self.tokenizer),
+            self.precision,
+            type(self.model).__name__,
+            transformers.__version__,
+        ))
+
+    @torch.inference_mode()
+    def cache_prefix(self, prefix: str) -> dict:
+        """
+        Return the cached KV state for a constant prompt prefix, computing it on first use.
+        Entries made with a different tokenizer/model version are recomputed.
+        """
+        with self._lock:
+            return self._cache_prefix_locked(prefix)
+
+    def _cache_prefix_locked(self, prefix: str) -> dict:
+        version = self._prefix_cache_version()
+        entry = self._prefix_cache.get(prefix)
+        if entry is not None and entry["version"] == version:
+            self._prefix_cache.move_to_end(prefix)
+            return entry
+
+        input_ids = self.tokenizer(prefix, return_tensors="pt").input_ids.to(self.device)
+        outputs = self.model(input_ids=input_ids, past_key_values=DynamicCache(), use_cache=True)
+        entry = {
+            "version": version,
+            "input_ids": input_ids[0],
+            "layers": self._cache_tensors(outputs.past_key_values),
+        }
+
+        self._prefix_cache[prefix] = entry
+        self._prefix_cache.move_to_end(prefix)
+        while len(self._prefix_cache) > self.prefix_cache_size:
+            self._prefix_cache.popitem(last=False)
+        return entry
+
+    def clear_prefix_cache(self):
+        self._prefix_cache.clear()
+
+    @staticmethod
+    def _cache_tensors(past_key_values) -> List[tuple]:
+        """(key, value) tensors per layer, whichever cache layout transformers returned."""
+        if hasattr(past_key_values, "layers"):
+            return [(layer.keys, layer.values) for layer in past_key_values.layers]
+        if hasattr(past_key_values, "key_cache"):
+            return list(zip(past_key_values.key_cache, past_key_values.value_cache))
+        return [tuple(layer[:2]) for layer in past_key_values]
+
+    # --------------------------------------------
+    # Batched decode helpers
+    # --------------------------------------------
+    def _build_batch(self, prompts: List[str], prefixes: List[Optional[str]]) -> dict:
+        """
+        Tokenize a batch, reusing cached prefix states where a prompt starts with its prefix.
+        Layout per row: [pad][prefix (cached)][pad][rest of prompt], with the attention
+        mask zeroing both pads; positions are derived from the mask.
+        """
+        if len(prefixes) != len(prompts):
+            raise ValueError(f"Expected {len(prompts)} prefixes, got {len(prefixes)}")
+
+        pad_id = self.tokenizer.pad_token_id
+        if pad_id is None:
+            pad_id = self.tokenizer.eos_token_id
+
+        entries, suffix_ids = [], []
+        for prompt, prefix in zip(prompts, prefixes):
+            if prefix and prompt.startswith(prefix):
+                entries.append(self.cache_prefix(prefix))
+                suffix_ids.append(self.tokenizer(prompt[len(prefix):], add_special_tokens=False).input_ids)
+            else:
+                entries.append(None)
+                suffix_ids.append(self.tokenizer(prompt).input_ids)
+
+        prefix_len = max((len(e["input_ids"]) for e in entries if e is not None), default=0)
+        suffix_len = max(max(len(ids) for ids in suffix_ids), 1)
+
+        def left_pad(ids, length):
+            ids = torch.as_tensor(ids, dtype=torch.long)
+            pad = torch.full((length - len(ids),), pad_id, dtype=torch.long)
+            mask = torch.cat([torch.zeros(length - len(ids), dtype=torch.long), torch.ones(len(ids), dtype=torch.long)])
+            return torch.cat([pad, ids]), mask
+
+        rows_ids, rows_mask = [], []
+        for entry, ids in zip(entries, suffix_ids):
+            prefix_ids, prefix_mask = left_pad(entry["input_ids"].cpu() if entry else [], prefix_len)
+            rest_ids, rest_mask = left_pad(ids, suffix_len)
+            rows_ids.append(torch.cat([prefix_ids, rest_ids]))
+            rows_mask.append(torch.cat([prefix_mask, rest_mask]))
+
+        sequences = torch.stack(rows_ids).to(self.device)
+        attention_mask = torch.stack(rows_mask).to(self.device)
+
+        past_key_values = DynamicCache()
+        if prefix_len:
+            template = next(e for e in entries if e is not None)["layers"]
+            for layer_idx, (key_like, value_like) in enumerate(template):
+                keys, values = [], []
+                for entry in entries:
+                    if entry is None:
+                        shape = (1, key_like.shape[1], prefix_len, key_like.shape[-1])
+                        keys.append(key_like.new_zeros(shape))
+                        values.append(value_like.new_zeros(shape[:-1] + (value_like.shape[-1],)))
+                    else:
+                        key, value = entry["layers"][layer_idx]
+                        missing = prefix_len - key.shape[-2]
+                        keys.append(torch.nn.functional.pad(key, (0, 0, missing, 0)))
+                        values.append(torch.nn.functional.pad(value, (0, 0, missing, 0)))
+                past_key_values.update(torch.cat(keys), torch.cat(values), layer_idx)
+
+        return {
+            "input_ids": sequences[:, prefix_len:],
+            "attention_mask": attention_mask,
+            "sequences": sequences,
+            "past_key_values": past_key_values,
+        }
+
+    @staticmethod
+    def _per_prompt_budgets(prompts: List[str], max_new_tokens: Union[int, List[int]]) -> List[int]:
+        if isinstance(max_new_tokens, int):
+            return [max_new_tokens] * len(prompts)
+        if len(max_new_tokens) != len(prompts):
+            raise ValueError(
+                f"Expected {len(prompts)} max_new_tokens values, got {len(max_new_tokens)}"
+            )
+        return list(max_new_tokens)
+
+    def _stop_token_ids(self) -> set:
+        """EOS ids from the tokenizer plus any extra ones in the generation config (e.g. <|end|>)."""
+        stop_ids = {self.tokenizer.eos_token_id}
+        config_eos = getattr(getattr(self.model, "generation_config", None), "eos_token_id", None)
+        if isinstance(config_eos, int):
+            stop_ids.add(config_eos)
+        elif config_eos:
+            stop_ids.update(config_eos)
+        stop_ids.discard(None)
+        return stop_ids
+
+    @staticmethod
+    def _logits_processors(temperature: float, top_p: float, repetition_penalty: float) -> LogitsProcessorList:
+        processors = LogitsProcessorList()
+        if repetition_penalty and repetition_penalty != 1.0:
+            processors.append(RepetitionPenaltyLogitsProcessor(repetition_penalty))
+        if temperature > 0:
+            processors.append(TemperatureLogitsWarper(temperature))
+            if top_p < 1.0:
+                processors.append(TopPLogitsWarper(top_p))
+        return processors
+
+    @staticmethod
+    def _select_cache_rows(past_key_values, rows: torch.Tensor):
+        """Keep only the given batch rows of the KV cache."""
+        if hasattr(past_key_values, "batch_select_indices"):
+            past_key_values.batch_select_indices(rows)
+            return past_key_values
+        return tuple(tuple(t[rows] for t in layer) for layer in past_key_values)
+
+    def _decode_loop(self, budgets: List[int], **kwargs) -> List[List[int]]:
+        """Run _decode_steps to completion and return the generated token ids per row."""
+        generated: List[List[int]] = [[] for _ in budgets]
+        for row, token in self._decode_steps(budgets=budgets, **kwargs):
+            generated[row].append(token)
+        return generated
+
+    @torch.inference_mode()
+    def _decode_steps(self,
+                     input_ids: torch.Tensor,
+                     attention_mask: torch.Tensor,
+                     sequences: torch.Tensor,
+                     past_key_values,
+                     budgets: List[int],
+                     temperature: float,
+                     top_p: float,
+                     repetition_penalty: float,
+                     seed: Optional[int] = None,
+                     stop_checks: Optional[List[Optional[StopCheck]]] = None) -> Iterator[Tuple[int, int]]:
+        """
+        Token-by-token decode over a left-padded batch.
+        - input_ids: tokens still to prefill (everything after the cached prefix).
+        - attention_mask / sequences: cover the cached prefix plus input_ids.
+        Finished rows are dropped from the batch (and from the KV cache) right away.
+        With a seed every row samples from its own generator, so a row's output does
+        not depend on what else is in the batch.
+        stop_checks are evaluated on a row's decoded text whenever a token ends a line.
+        Yields (row, token_id) for every generated token as soon as it is decoded.
+        """
+        stop_ids = self._stop_token_ids()
+        processors = self._logits_processors(temperature, top_p, repetition_penalty)
+
+        generators = None
+        if seed is not None and temperature > 0:
+            generators = [torch.Generator(device=sequences.device).manual_seed(seed) for _ in budgets]
+
+        stop_checks = stop_checks or [None] * len(budgets)
+        row_tokens: List[List[int]] = [[] for _ in budgets]
+
+        generated_counts = [0] * len(budgets)
+        active = [row for row, budget in enumerate(budgets) if budget > 0]
+        if not active:
+            return
+
+        if len(active) < len(budgets):
+            rows = torch.tensor(active, device=sequences.device)
+            past_key_values = self._select_cache_rows(past_key_values, rows)
+            input_ids, attention_mask, sequences = input_ids[rows], attention_mask[rows], sequences[rows]
+
+        step_ids = input_ids
+        position_ids = (attention_mask.long().cumsum(-1) - 1).clamp(min=0)[:, -step_ids.shape[-1]:]
+        start_time = time.time()
+
+        try:
+            while active:
+                outputs = self.model(
+                    input_ids=step_ids,
+                    attention_mask=attention_mask,
+                    position_ids=position_ids,
+                    past_key_values=past_key_values,
+                    use_cache=True,
+                )
+                past_key_values = outputs.past_key_values
+                scores = processors(sequences, outputs.logits[:, -1, :].float())
+
+                if temperature > 0 and generators:
+                    probs = torch.softmax(scores, dim=-1)
+                    next_tokens = torch.cat([
+                        torch.multinomial(probs[i], num_samples=1, generator=generators[row])
+                        for i, row in enumerate(active)
+                    ])
+                elif temperature > 0:
+                    next_tokens = torch.multinomial(torch.softmax(scores, dim=-1), num_samples=1).squeeze(-1)
+                else:
+                    next_tokens = torch.argmax(scores, dim=-1)
+
+                keep = []
+                for i, token in enumerate(next_tokens.tolist()):
+                    row = active[i]
+                    if token in stop_ids:
+                        continue
+                    generated_counts[row] += 1
+                    yield row, token
+                    if generated_counts[row] >= budgets[row]:
+                        continue
+                    if stop_checks[row] and self._row_should_stop(row_tokens[row], token, stop_checks[row]):
+                        continue
+                    keep.append(i)
+
+                if not keep:
+                    break
+
+                if len(keep) < len(active):
+                    rows = torch.tensor(keep, device=sequences.device)
+                    past_key_values = self._select_cache_rows(past_key_values, rows)
+                    sequences = sequences[rows]
+                    attention_mask = attention_mask[rows]
+                    next_tokens = next_tokens[rows]
+                    active = [active[i] for i in keep]
+
+                step_ids = next_tokens.unsqueeze(-1)
+                sequences = torch.cat([sequences, step_ids], dim=-1)
+                attention_mask = torch.cat([attention_mask, attention_mask.new_ones((len(active), 1))], dim=-1)
+                position_ids = attention_mask.long().sum(-1, keepdim=True) - 1
+        finally:
+            self._record_decode(sum(generated_counts), time.time() - start_time)
+
+    def _row_should_stop(self, tokens: List[int], token: int, stop_check: StopCheck) -> bool:
+        """Track a row's tokens and run its stop check once the new token ends a line."""
+        tokens.append(token)
+        if "\n" not in self.tokenizer.decode([token]):
+            return False
+        return stop_check(self.tokenizer.decode(tokens, skip_special_tokens=True))
+
+    def _record_decode(self, tokens: int, elapsed: float):
+        """Accumulate decode throughput (prefill included) for get_stats()."""
+        self.stats["generated_tokens"] += tokens
+        self.stats["decode_seconds"] += elapsed
+        if elapsed > 0:
+            print(f"⚡ Generated {tokens} tokens in {elapsed:.2f}s "
+                  f"({tokens / elapsed:.2f} tok/s, {self.precision})", flush=True)
     
+def load_tokenizer(model_name: str = "microsoft/Phi-3.5-mini-instruct"):
+    """Load only the tokenizer from the local model cache (no weights), e.g. for prompt budgeting."""
+    cache_dir = os.getenv("HF_HUB_CACHE", os.path.expanduser("~/.cache/huggingface"))
+    model_dir = os.path.join(cache_dir, model_name.replace("/", "--"))
+    return AutoTokenizer.from_pretrained(model_dir, trust_remote_code=False)
+
+def current_rss_mb() -> Optional[float]:
+    """Resident set size of this process in MB (peak RSS when psutil is unavailable)."""
+    if psutil:
+        return round(psutil.Process().memory_info().rss / (1024 * 1024), 1)
+    try:
+        import resource
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)  # KB on Linux
+    except ImportError:
+        return None
+
 # Singleton instance for shared use
 _model_instance: ModelCore = None
 
-def get_model_instance(**kwargs) -> ModelCore:
+def get_model_instance(precision: str = None, **kwargs) -> ModelCore:
+    """
+    Shared ModelCore. precision ("fp32" / "bf16" / "int8") defaults to MODEL_PRECISION;
+    asking for a different precision than the loaded one reloads the model.
+    """
     global _model_instance
+    if _model_instance is not None and precision and precision.lower() != _model_instance.precision:
+        print(f"Switching model precision {_model_instance.precision} → {precision}", flush=True)
+        _model_instance = None
     if _model_instance is None:
-       _model_instance = ModelCore(**kwargs)
+       _model_instance = ModelCore(precision=precision, **kwargs)
     return _model_instance
 
 def reset_model_instance():
@@ -167,7 +744,10 @@ if __name__ == "__main__":
     print("🧠 Starting local Summarizer test (safe mode ON)\n", flush=True)
     print("Type your prompt and press Enter. Type 'exit' or 'quit' to stop.\n", flush=True)
 
-    s = ModelCore(safe_mode=True)
+    # Optional first argument selects the precision mode, e.g. `python ModelCore.py bf16`
+    import sys
+    precision = sys.argv[1] if len(sys.argv) > 1 else None
+    s = ModelCore(safe_mode=True, precision=precision)
 
     while True:
         try:
@@ -181,6 +761,7 @@ if __name__ == "__main__":
             print("\n--- Model Response ---\n", flush=True)
             print(response, flush=True)
             print("\n----------------------\n", flush=True)
+            print(f"📊 {s.get_stats()}\n", flush=True)
         except KeyboardInterrupt:
             print("\nInterrupted. Exiting Summarizer.", flush=True)
             break
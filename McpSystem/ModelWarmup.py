@@ -0,0 +1,114 @@
+# ModelWarmup.py
+# Role: Load the inference model in a background thread and report readiness.
+#
+# States:
+#   idle    → warm-up not started yet
+#   loading → model weights are being loaded
+#   warming → model loaded, prompt prefix caches being built
+#   ready   → requests can be served; status() includes the model's stats
+#   failed  → loading raised; error holds the message. reset() (if given)
+#             drops the half-loaded model, and the next start() (e.g. from
+#             wait_ready) after a backoff loads again, so a transient failure
+#             (OOM, download error) is not permanent
+
+import os
+import threading
+import time
+
+from typing import Any, Callable, Optional
+
+# Wait before the first retry after a failed load; doubles per failure up to the max
+MODEL_WARMUP_RETRY_SECONDS = float(os.getenv("MODEL_WARMUP_RETRY_SECONDS", "15"))
+MODEL_WARMUP_MAX_RETRY_SECONDS = float(os.getenv("MODEL_WARMUP_MAX_RETRY_SECONDS", "600"))
+
+
+class ModelWarmup:
+    def __init__(self, load: Callable[[], Any], warm: Optional[Callable[[Any], None]] = None,
+                 reset: Optional[Callable[[], None]] = None,
+                 stats: Optional[Callable[[Any], dict]] = None):
+        self._load = load
+        self._warm = warm
+        self._reset = reset
+        self._stats = stats
+        self._lock = threading.Lock()
+        self._ready_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.state = "idle"
+        self.error: Optional[str] = None
+        self.model = None
+        self._started_at: Optional[float] = None
+        self._ready_at: Optional[float] = None
+        self.failures = 0
+        self._retry_at = 0.0
+
+    def start(self):
+        """
+        Kick off loading in a daemon thread. No-op while loading or once ready;
+        after a failure, loads again once the retry backoff has passed.
+        """
+        with self._lock:
+            if self._thread is not None and (self.state != "failed" or self._thread.is_alive()):
+                return
+            if self.state == "failed":
+                if time.time() < self._retry_at:
+                    return
+                print(f"[WARMUP] 🔁 Retrying model load (attempt {self.failures + 1})...", flush=True)
+                self.error = None
+                self._ready_at = None
+                self._ready_event.clear()
+            self.state = "loading"
+            self._started_at = time.time()
+            self._thread = threading.Thread(target=self._run, name="model-warmup", daemon=True)
+            self._thread.start()
+
+    def wait_ready(self, timeout: float = None):
+        """Block until the model is ready and return it; starts warm-up if needed."""
+        self.start()
+        if not self._ready_event.wait(timeout):
+            raise TimeoutError(f"Model not ready after {timeout} seconds (state: {self.state})")
+        if self.state == "failed":
+            retry_in = max(self._retry_at - time.time(), 0.0)
+            raise RuntimeError(f"Model failed to load: {self.error} (retrying in {retry_in:.0f}s)")
+        return self.model
+
+    def is_ready(self) -> bool:
+        return self.state == "ready"
+
+    def status(self) -> dict:
+        end = self._ready_at or time.time()
+        return {
+            "state": self.state,
+            "error": self.error,
+            "failures": self.failures,
+            "elapsed_seconds": round(end - self._started_at, 2) if self._started_at else None,
+            "stats": self._stats(self.model) if self._stats and self.state == "ready" else None,
+        }
+
+    def _run(self):
+        try:
+            print("[WARMUP] 🧠 Loading model in background...", flush=True)
+            model = self._load()
+            self.state = "warming"
+            print("[WARMUP] 🔥 Warming model caches...", flush=True)
+            if self._warm:
+                self._warm(model)
+            self.model = model
+            self.failures = 0
+            self.state = "ready"
+            print("[WARMUP] ✅ Model ready.", flush=True)
+        except Exception as ex:
+            self.error = f"{type(ex).__name__}: {ex}"
+            self.failures += 1
+            backoff = min(MODEL_WARMUP_RETRY_SECONDS * 2 ** (self.failures - 1), MODEL_WARMUP_MAX_RETRY_SECONDS)
+            self._retry_at = time.time() + backoff
+            print(f"[WARMUP] ❌ Model warm-up failed: {self.error} (retry in {backoff:.0f}s)", flush=True)
+            if self._reset:
+                try:
+                    self._reset()
+                except Exception as reset_ex:
+                    print(f"[WARMUP] ⚠️ Reset after failure raised: {reset_ex}", flush=True)
+            self.state = "failed"
+        finally:
+            self._ready_at = time.time()
+            self._ready_event.set()
@@ -0,0 +1,138 @@
+# PromptBuilder.py
+# Role: Assemble summary prompts within a fixed token budget per section.
+#
+# Each mode gets a token budget per data section (metadata, README, commits,
+# issues, PRs), counted with the model tokenizer. Lists are filled in order
+# (newest first, as GitHub returns them) and stop when the budget runs out,
+# so the oldest / lowest-value items are the ones dropped. Together with the
+# constant prefix this bounds prefill cost for every mode.
+
+import re
+
+from typing import Dict, List, Optional
+
+from PromptTemplates import (
+    PROMPT_PREFIXES,
+    build_prompt,
+    format_metadata,
+    format_readme_data,
+    format_commits_data,
+    format_issues_data,
+    format_pulls_data,
+    format_delta_data,
+)
+
+# Token budget per data section, per mode
+SECTION_BUDGETS: Dict[str, Dict[str, int]] = {
+    "readme": {"metadata": 96, "readme": 1536},
+    "commits": {"commits": 768},
+    "issues": {"issues": 768},
+    "pulls": {"pulls": 768},
+}
+
+# Budget of the previous summary quoted in a delta prompt (the new items use the mode's budget)
+PREVIOUS_SUMMARY_BUDGET = 512
+
+# No single list entry (commit message, issue, PR) may take more than this
+ITEM_TOKEN_CAP = 96
+
+# Rough characters-per-token ratio used when no tokenizer is available
+APPROX_CHARS_PER_TOKEN = 4
+
+# README noise that costs tokens without helping the analysis
+_README_NOISE = [
+    re.compile(r"<!--.*?-->", re.DOTALL),             # HTML comments
+    re.compile(r"^\s*\[?!\[[^\]]*\]\([^)]*\)\]?(\([^)]*\))?\s*$", re.MULTILINE),  # badge / image-only lines
+    re.compile(r"<img[^>]*>", re.IGNORECASE),         # inline HTML images
+    re.compile(r"</?(p|div|a|picture|source|br)[^>]*>", re.IGNORECASE),  # layout-only HTML tags
+]
+
+
+class PromptBuilder:
+    def __init__(self, tokenizer=None, budgets: Optional[Dict[str, Dict[str, int]]] = None,
+                 item_token_cap: int = ITEM_TOKEN_CAP):
+        self.tokenizer = tokenizer
+        self.budgets = budgets or SECTION_BUDGETS
+        self.item_token_cap = item_token_cap
+
+    # -------------------------------------------------------
+    # Prompt per mode
+    # -------------------------------------------------------
+    def build_readme(self, metadata: dict, readme_content: str) -> str:
+        budget = self.budgets["readme"]
+        metadata_text = self.truncate(format_metadata(metadata or {}), budget["metadata"])
+        readme_text = self.truncate(clean_readme(readme_content or ""), budget["readme"])
+        return build_prompt("readme", format_readme_data(metadata_text, readme_text))
+
+    def build_commits(self, repo_name: str, commits: List[str]) -> str:
+        kept = self.fit_items(commits, self.budgets["commits"]["commits"])
+        return build_prompt("commits", format_commits_data(repo_name, kept))
+
+    def build_issues(self, repo_name: str, issues: List[str]) -> str:
+        kept = self.fit_items(issues, self.budgets["issues"]["issues"])
+        return build_prompt("issues", format_issues_data(repo_name, kept))
+
+    def build_pulls(self, repo_name: str, pull_requests: List[str]) -> str:
+        kept = self.fit_items(pull_requests, self.budgets["pulls"]["pulls"])
+        return build_prompt("pulls", format_pulls_data(repo_name, kept))
+
+    def build_delta(self, mode: str, repo_name: str, previous_summary: str, items: List[str]) -> str:
+        """Prompt that updates a previous summary with only the items added since."""
+        previous = self.truncate(previous_summary or "", PREVIOUS_SUMMARY_BUDGET)
+        kept = self.fit_items(items, self.budgets[mode][mode])
+        return build_prompt(mode, format_delta_data(mode, repo_name, previous, kept))
+
+    def max_prompt_tokens(self, mode: str) -> int:
+        """Upper bound on prompt length for a mode (prefix + all section budgets + framing)."""
+        framing = 64  # repo name line, section labels, assistant tag
+        delta = PREVIOUS_SUMMARY_BUDGET if mode != "readme" else 0
+        return self.count_tokens(PROMPT_PREFIXES[mode]) + sum(self.budgets[mode].values()) + delta + framing
+
+    # -------------------------------------------------------
+    # Token helpers
+    # -------------------------------------------------------
+    def count_tokens(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.tokenizer is None:
+            return -(-len(text) // APPROX_CHARS_PER_TOKEN)
+        return len(self.tokenizer(text, add_special_tokens=False).input_ids)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text to at most max_tokens tokens (on a token boundary)."""
+        if not text:
+            return ""
+        if self.tokenizer is None:
+            limit = max_tokens * APPROX_CHARS_PER_TOKEN
+            return text if len(text) <= limit else text[:limit].rstrip() + " …"
+
+        ids = self.tokenizer(text, add_special_tokens=False).input_ids
+        if len(ids) <= max_tokens:
+            return text
+        return self.tokenizer.decode(ids[:max_tokens], skip_special_tokens=True).rstrip() + " …"
+
+    def fit_items(self, items: List[str], budget: int) -> List[str]:
+        """
+        Keep items in order while they fit the section budget.
+        Each item is first capped at item_token_cap; the remaining items are dropped.
+        """
+        kept, used = [], 0
+        for item in items:
+            text = self.truncate(" ".join(item.split()), self.item_token_cap)
+            cost = self.count_tokens(f"- {text}\n")
+            if used + cost > budget:
+                break
+            kept.append(text)
+            used += cost
+
+        if len(kept) < len(items):
+            print(f"✂️ Dropped {len(items) - len(kept)} item(s) over the {budget}-token budget", flush=True)
+        return kept
+
+
+def clean_readme(readme_content: str) -> str:
+    """Strip badges, images, HTML comments and layout tags, and collapse blank runs."""
+    text = readme_content
+    for pattern in _README_NOISE:
+        text = pattern.sub("", text)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
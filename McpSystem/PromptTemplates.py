@@ -0,0 +1,240 @@
+# PromptTemplates.py
+# Role: Prompt text for each summary mode.
+#
+# Every prompt is split into:
+#   - a constant prefix (system block + analysis instructions), and
+#   - the per-repository data appended after it.
+# Keeping the constant part first lets ModelCore reuse the cached KV state
+# of the prefix instead of re-encoding it on every request.
+
+from typing import Dict, List
+
+# Bump when the data sections below change in a way that should regenerate
+# stored summaries (the constant prefixes are fingerprinted automatically)
+PROMPT_VERSION = "1"
+
+# ===========================================================
+# 📄 README
+# ===========================================================
+README_SYSTEM_PROMPT = (
+    "You are an expert software analyst. Your goal is to evaluate a GitHub repository and determine "
+    "whether it is valuable to a potential user or contributor. Do NOT copy the README content. "
+    "Provide thoughtful analysis, not just description."
+)
+
+README_INSTRUCTIONS = (
+    "You will be given the repository metadata and README content.\n\n"
+
+    "📌 Using this information, provide a structured analysis:\n"
+    "## ✅ What Problem This Solves\n"
+    "- Explain the purpose of the project and why it exists.\n\n"
+    "## 🚀 Strengths / Why It’s Valuable\n"
+    "- Key advantages, features, or innovations.\n\n"
+    "## ⚠️ Limitations or Weaknesses\n"
+    "- Missing features, risks, complexity, required skills, etc.\n\n"
+    "## 👥 Ideal Users / Use Cases\n"
+    "- Who should use this? In what scenario?\n\n"
+    "## ⭐ Final Verdict (1–10 Usefulness Score)\n"
+    "- Justify your score briefly.\n\n"
+)
+
+# ===========================================================
+# 📝 Commits
+# ===========================================================
+COMMITS_SYSTEM_PROMPT = (
+    "You are a technical AI that summarizes GitHub repository activity clearly and accurately."
+)
+
+COMMITS_INSTRUCTIONS = """
+            You will be given a list of recent commit messages for a GitHub repository.
+
+            Please analyze them and provide a structured summary using the following format:
+
+            ### ✅ Summary of Recent Development Activity
+
+            **1. 🚀 New Features or Enhancements**
+            - What new capabilities or improvements were added?
+
+            **2. 🐛 Bug Fixes**
+            - What problems or defects were addressed?
+
+            **3. 🛠 Refactoring / Code Improvements**
+            - Any improvements to architecture, performance, or readability?
+
+            **4. ✨ Notable Technical Changes**
+            - Dependencies updated? Major API changes? Breaking updates?
+
+            **5. 📌 Overall Impact**
+            - How do these changes contribute to the project direction or stability?
+"""
+
+# ===========================================================
+# 🛑 Issues
+# ===========================================================
+ISSUES_SYSTEM_PROMPT = (
+    "You are a helpful AI system that analyzes GitHub issues "
+    "and summarizes user pain points and feature requests."
+)
+
+ISSUES_INSTRUCTIONS = """
+            You are given **recent GitHub issues** from a repository.
+
+            Summarize them using the format below:
+
+            ### 🛑 User Issues & Problem Summary
+
+            **1. 🐞 Common Bugs or Errors Reported**
+            - What problems or technical issues are users facing?
+
+            **2. 💡 Feature Requests or Improvements**
+            - What new features or enhancements are users asking for?
+
+            **3. 🎯 Recurring Themes or Root Causes**
+            - Are there repeated complaints or related problems?
+
+            **4. ⚠ Severity & Impact**
+            - Are these issues minor annoyances or major blockers?
+
+            **5. 📌 Overall Insight**
+            - Summarize in 2–3 sentences what the issues suggest about the project's health.
+"""
+
+# ===========================================================
+# 🔄 Pull requests
+# ===========================================================
+PULLS_SYSTEM_PROMPT = (
+    "You are an expert AI that summarizes GitHub pull requests "
+    "for developers, project maintainers, and stakeholders."
+)
+
+PULLS_INSTRUCTIONS = """
+            You are given a list of **open or recent pull requests** from a repository.
+
+            Summarize them using the format below:
+
+            ### 🔄 Pull Request Summary
+
+            **1. 🎯 Purpose of Changes**
+            - What is each pull request trying to accomplish?
+
+            **2. 🛠 Key Technical Changes**
+            - Are they adding new features, fixing bugs, refactoring code, or updating documentation?
+
+            **3. ⚠ Risks or Breaking Changes**
+            - Could these PRs introduce side effects, large refactoring, or failure points?
+
+            **4. ✅ Current Status or Review Notes**
+            - Are PRs approved, under review, or blocked?
+
+            **5. 📌 Overall Insight**
+            - Provide a short summary of the development direction.
+"""
+
+
+# Section headings each mode's answer is expected to contain, in order.
+# The last one closes the answer (used by GenerationLimits to stop early).
+SECTION_HEADERS: Dict[str, List[str]] = {
+    "readme": ["What Problem This Solves", "Strengths", "Limitations or Weaknesses",
+               "Ideal Users", "Final Verdict"],
+    "commits": ["New Features or Enhancements", "Bug Fixes", "Refactoring / Code Improvements",
+                "Notable Technical Changes", "Overall Impact"],
+    "issues": ["Common Bugs or Errors Reported", "Feature Requests or Improvements",
+               "Recurring Themes or Root Causes", "Severity & Impact", "Overall Insight"],
+    "pulls": ["Purpose of Changes", "Key Technical Changes", "Risks or Breaking Changes",
+              "Current Status or Review Notes", "Overall Insight"],
+}
+
+
+def _prefix(system_prompt: str, instructions: str) -> str:
+    return f"<|system|>\n{system_prompt}\n<|user|>\n{instructions}"
+
+
+# Constant prompt prefix per summary mode (mode names match the summary files)
+PROMPT_PREFIXES: Dict[str, str] = {
+    "readme": _prefix(README_SYSTEM_PROMPT, README_INSTRUCTIONS),
+    "commits": _prefix(COMMITS_SYSTEM_PROMPT, COMMITS_INSTRUCTIONS),
+    "issues": _prefix(ISSUES_SYSTEM_PROMPT, ISSUES_INSTRUCTIONS),
+    "pulls": _prefix(PULLS_SYSTEM_PROMPT, PULLS_INSTRUCTIONS),
+}
+
+
+# ===========================================================
+# 🧩 Per-repository data sections
+# ===========================================================
+def format_metadata(metadata: dict) -> str:
+    return (
+        f"The repository has the following metadata:\n"
+        f"- Stars: {metadata.get('stars', 'N/A')}\n"
+        f"- Forks: {metadata.get('forks', 'N/A')}\n"
+        f"- Open Issues: {metadata.get('open_issues', 'N/A')}\n"
+        f"- Main Language: {metadata.get('language', 'N/A')}\n"
+        f"- License: {metadata.get('license', 'N/A')}\n"
+        f"- Last Updated: {metadata.get('updated_at', 'N/A')}\n\n"
+    )
+
+
+def format_readme_data(metadata_text: str, readme_content: str) -> str:
+    return (
+        f"{metadata_text}"
+
+        "Here is the README content:\n"
+        f"{readme_content}\n"
+    )
+
+
+def format_commits_data(repo_name: str, commits: list) -> str:
+    formatted_commits = "\n".join([f"- {msg}" for msg in commits])
+    return f"""
+            Repository: **{repo_name}**
+
+            Here are the commits to analyze:
+            {formatted_commits}
+            """
+
+
+def format_issues_data(repo_name: str, issues: list) -> str:
+    formatted_issues = "\n".join([f"- {issue}" for issue in issues])
+    return f"""
+            Repository: **{repo_name}**
+
+            Here are the issues:
+            {formatted_issues}
+            """
+
+
+def format_pulls_data(repo_name: str, pull_requests: list) -> str:
+    formatted_prs = "\n".join([f"- {pr}" for pr in pull_requests])
+    return f"""
+            Repository: **{repo_name}**
+
+            Here are the PRs to analyze:
+            {formatted_prs}
+            """
+
+
+# Item labels used by delta prompts
+DELTA_LABELS: Dict[str, str] = {
+    "commits": "commits",
+    "issues": "issues (new or updated)",
+    "pulls": "pull requests (new or updated)",
+}
+
+
+def format_delta_data(mode: str, repo_name: str, previous_summary: str, items: list) -> str:
+    formatted_items = "\n".join([f"- {item}" for item in items])
+    return f"""
+            Repository: **{repo_name}**
+
+            This is the previous summary:
+            {previous_summary}
+
+            Since then there are these {DELTA_LABELS[mode]}:
+            {formatted_items}
+
+            Update the previous summary so it also covers them, keeping the same format.
+            """
+
+
+def build_prompt(mode: str, data: str) -> str:
+    """Full chat prompt: constant prefix + repo data + assistant turn."""
+    return f"{PROMPT_PREFIXES[mode]}{data}\n<|assistant|>"
@@ -0,0 +1,73 @@
+# SingleFlight.py
+# Role: Coalesce concurrent identical computations (thread based).
+#
+# The first caller for a key becomes the leader and does the work; callers
+# arriving while it runs wait for the leader's result (or its error)
+# instead of repeating the work. A leader that gives up without a result
+# abandons the call, and its waiters start over (one of them leads).
+
+import threading
+
+from typing import Any, Dict, Hashable, Tuple
+
+
+class AbandonedCall(Exception):
+    """The leader stopped without a result; the waiter should claim the key again."""
+
+
+class InFlightCall:
+    def __init__(self, tag: Any = None):
+        self.tag = tag  # what the leader computes with (e.g. force), for callers that need more
+        self._done = threading.Event()
+        self._result = None
+        self._error = None
+        self._abandoned = False
+
+    def wait(self) -> Any:
+        """Block until the leader finishes; returns its result or raises its error."""
+        self._done.wait()
+        if self._abandoned:
+            raise AbandonedCall()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, InFlightCall] = {}
+        self.coalesced = 0
+
+    def claim(self, key: Hashable, tag: Any = None) -> Tuple[InFlightCall, bool]:
+        """Returns (call, leader). The leader must end the call with resolve, fail or abandon."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                return call, False
+            call = InFlightCall(tag)
+            self._calls[key] = call
+            return call, True
+
+    def resolve(self, key: Hashable, call: InFlightCall, result: Any):
+        call._result = result
+        self._finish(key, call)
+
+    def fail(self, key: Hashable, call: InFlightCall, error: BaseException):
+        call._error = error
+        self._finish(key, call)
+
+    def abandon(self, key: Hashable, call: InFlightCall):
+        call._abandoned = True
+        self._finish(key, call)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"in_flight": len(self._calls), "coalesced": self.coalesced}
+
+    def _finish(self, key: Hashable, call: InFlightCall):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call._done.set()
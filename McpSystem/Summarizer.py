@@ -1,22 +1,52 @@
-﻿
+﻿import hashlib
 import json         # for test load_method()
 import os           # for test load_method()
 
-from ModelCore import get_model_instance
+from InferenceBackend import InferenceBackend, get_backend, get_backend_model_id, reset_backend
+from ModelWarmup import ModelWarmup
 from DAL.Summary_Repository import SummaryRepository
-from GithubApi import get_readme, get_commits, get_issues, get_pull_requests, get_repo_metadata
-from DAL.GithubRepositoriesList_Repository import get_repositories
-
-# Import the shared model core
-model_core = None
-model_core = get_model_instance()
-
-def get_core():
-    global model_core
-    if model_core is None:
-        print("Initializing AI Model...", flush=True)
-        model_core = get_model_instance()
-    return model_core
+from GithubApi import get_repo_snapshot, get_repo_snapshots
+from PromptTemplates import PROMPT_PREFIXES, PROMPT_VERSION, SECTION_HEADERS
+from PromptBuilder import PromptBuilder
+from GenerationLimits import AdaptiveTokenBudget, SectionStopper, finalize_summary
+from SingleFlight import AbandonedCall, SingleFlight
+
+# Summary modes, named after the summary files they produce
+SUMMARY_MODES = ("readme", "commits", "issues", "pulls")
+
+def get_core() -> InferenceBackend:
+    print("Initializing AI Model...", flush=True)
+    return get_backend()
+
+def warm_prompt_cache(backend: InferenceBackend):
+    """Precompute the KV state of every mode's constant prompt prefix."""
+    backend.warm(list(PROMPT_PREFIXES.values()))
+
+def backend_stats(backend: InferenceBackend) -> dict:
+    """Load time, RSS and decode throughput, reported with the model status."""
+    return backend.stats()
+
+def summary_version(mode: str) -> str:
+    """Model + prompt version of a mode; stored summaries of another version are regenerated."""
+    text = json.dumps([get_backend_model_id(), PROMPT_VERSION, PROMPT_PREFIXES[mode], SECTION_HEADERS[mode]])
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+def input_fingerprint(version: str, mode: str, inputs: list, base: str = None) -> str:
+    """
+    Hash of everything a summary was generated from. base is the fingerprint
+    of the summary a delta run builds on.
+    """
+    text = json.dumps({"version": version, "mode": mode, "inputs": inputs, "base": base})
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+# (owner, repo, mode) summaries being computed in this process; concurrent
+# requests for the same one wait for it instead of fetching, generating and
+# writing the same file again
+in_flight = SingleFlight()
+
+# Model loading runs in the background; importing this module no longer blocks on it
+model_warmup = ModelWarmup(load=get_core, warm=warm_prompt_cache, reset=reset_backend,
+                           stats=backend_stats)
 
 # orchestrates repository analysis by using ModelCore to generate focused 
 # summaries for a project’s README, commits, issues, and pull requests.
@@ -24,250 +54,385 @@ class Summarizer:
     def __init__(self, repo_name="unknown-repo"):
         self.repo_name = repo_name  # format "owner/repo"
         self.repo = SummaryRepository()
-        self.model = get_model_instance()        
+        self._prompt_builder = None
+        self.token_budget = AdaptiveTokenBudget()
+        model_warmup.start()
 
         # self.owner, self.repo_short = self._split_repo()
         # self.metadata = get_repo_metadata(self.owner, self.repo_short)
                
+    # =======================================================================
+    # Shared model; waits for the background warm-up on first use
+    # =======================================================================
+    @property
+    def model(self) -> InferenceBackend:
+        if not model_warmup.is_ready():
+            print(f"Waiting for model ({model_warmup.state})...", flush=True);
+        return model_warmup.wait_ready()
+
+    @property
+    def prompt_builder(self) -> PromptBuilder:
+        # Token budgets are counted with the model's tokenizer, so this waits for the model too
+        if self._prompt_builder is None:
+            self._prompt_builder = PromptBuilder(tokenizer=getattr(self.model, "tokenizer", None))
+        return self._prompt_builder
+
     # =======================================================================
     # For provided github repository, summarize readme file
     # =======================================================================
-    def summarize_repo_readme(self, owner: str, repo: str) -> str:
+    def summarize_repo_readme(self, owner: str, repo: str, force: bool = False) -> str:
         print("", flush=True);
         print("sumarize_repo_readme()", flush=True);
-        
-        print("Pulling data...", flush=True);
-        self.repo_name = f"{owner}/{repo}"  
-        readme_content = get_readme(owner, repo)
-        metadata = get_repo_metadata(owner, repo)
-        
-        print("Setting up model request and sending...", flush=True);
-        system_prompt = (
-            "You are an expert software analyst. Your goal is to evaluate a GitHub repository and determine "
-            "whether it is valuable to a potential user or contributor. Do NOT copy the README content. "
-            "Provide thoughtful analysis, not just description."
-        )
-        user_prompt = (
-            f"The repository has the following metadata:\n"
-            f"- Stars: {metadata.get('stars', 'N/A')}\n"
-            f"- Forks: {metadata.get('forks', 'N/A')}\n"
-            f"- Open Issues: {metadata.get('open_issues', 'N/A')}\n"
-            f"- Main Language: {metadata.get('language', 'N/A')}\n"
-            f"- License: {metadata.get('license', 'N/A')}\n"
-            f"- Last Updated: {metadata.get('updated_at', 'N/A')}\n\n"
-
-            "Here is the README content:\n"
-            f"{readme_content}\n\n"
-
-            "📌 Using this information, provide a structured analysis:\n"
-            "## ✅ What Problem This Solves\n"
-            "- Explain the purpose of the project and why it exists.\n\n"
-            "## 🚀 Strengths / Why It’s Valuable\n"
-            "- Key advantages, features, or innovations.\n\n"
-            "## ⚠️ Limitations or Weaknesses\n"
-            "- Missing features, risks, complexity, required skills, etc.\n\n"
-            "## 👥 Ideal Users / Use Cases\n"
-            "- Who should use this? In what scenario?\n\n"
-            "## ⭐ Final Verdict (1–10 Usefulness Score)\n"
-            "- Justify your score briefly.\n"
-        )
-        full_prompt = f"<|system|>\n{system_prompt}\n<|user|>\n{user_prompt}\n<|assistant|>"
-        response = self.model.generate_response(prompt=full_prompt, max_new_tokens=400, temperature=0.3)
-        
-        print("Saving response...", flush=True);
-        self.repo.save_summary(self.repo_name, "readme", {
-            "metadata": metadata,
-            "summary": response
-        })
-        
-        print("Returning response!", flush=True);
-        return response
+        return self.summarize_batch([(owner, repo, "readme")], force)[0]
                 
     # =======================================================================
     # For provided github repository, summarize latest commits
     # =======================================================================
-    def summarize_commits(self, owner: str, repo: str) -> str:
+    def summarize_commits(self, owner: str, repo: str, force: bool = False) -> str:
         print("", flush=True);
         print("summarize_commits()", flush=True);
-        
-        print("Pulling data...", flush=True);     
-        self.repo_name = f"{owner}/{repo}"     
-        commits = get_commits(owner, repo)
-        metadata = get_repo_metadata(owner, repo)
-
-        if not commits:
-            print("⚠️ No commit data available to summarize.", flush=True);
-            response = "No commit data available to summarize."
-            self.repo.save_summary(self.repo_name, "commits", response)
-            return response
-        
-        print("Setting up model request and sending...", flush=True);
-        formatted_commits = "\n".join([f"- {msg}" for msg in commits])
-        system_prompt = (
-            "You are a technical AI that summarizes GitHub repository activity clearly and accurately."
-        )
-        user_prompt = f"""
-            You will be given a list of recent commit messages for the repository **{self.repo_name}**.
-
-            Please analyze them and provide a structured summary using the following format:
-
-            ### ✅ Summary of Recent Development Activity
-
-            **1. 🚀 New Features or Enhancements**
-            - What new capabilities or improvements were added?
-
-            **2. 🐛 Bug Fixes**
-            - What problems or defects were addressed?
-
-            **3. 🛠 Refactoring / Code Improvements**
-            - Any improvements to architecture, performance, or readability?
-
-            **4. ✨ Notable Technical Changes**
-            - Dependencies updated? Major API changes? Breaking updates?
-
-            **5. 📌 Overall Impact**
-            - How do these changes contribute to the project direction or stability?
-
-            Here are the commits to analyze:
-            {formatted_commits}
-            """
-        full_prompt = f"<|system|>\n{system_prompt}\n<|user|>\n{user_prompt}\n<|assistant|>"
-        response = self.model.generate_response(prompt=full_prompt, max_new_tokens=400, temperature=0.3)
-        
-        print("Saving response...", flush=True);
-        # self.repo.save_summary(self.repo_name, "commits", response)
-        self.repo.save_summary(self.repo_name, "commits", {
-            "metadata": metadata,
-            "summary": response
-        })
-        
-        print("Returning response!", flush=True);
-        return response
+        return self.summarize_batch([(owner, repo, "commits")], force)[0]
         
     # =======================================================================
     # For provided github repository, summarize latest issues
     # =======================================================================
-    def summarize_issues(self, owner: str, repo: str) -> str:
+    def summarize_issues(self, owner: str, repo: str, force: bool = False) -> str:
         print("", flush=True);
         print("summarize_issues()", flush=True);
-        
-        print("Pulling data...", flush=True);
-        self.repo_name = f"{owner}/{repo}"  
-        issues = get_issues(owner, repo)
-        metadata = get_repo_metadata(owner, repo)
-
-        if not issues:
-            print("⚠️ No issues found for this repository.", flush=True);
-            response = "⚠️ No issues found for this repository."
-            self.repo.save_summary(self.repo_name, "issues", response)
-            return response        
-        
-        print("Setting up model request and sending...", flush=True);
-        formatted_issues = "\n".join([f"- {issue}" for issue in issues])
-        system_prompt = (
-            "You are a helpful AI system that analyzes GitHub issues "
-            "and summarizes user pain points and feature requests."
-        )
-        user_prompt = f"""
-            You are given **recent GitHub issues** from the repository **{self.repo_name}**.
-
-            Summarize them using the format below:
-
-            ### 🛑 User Issues & Problem Summary
-
-            **1. 🐞 Common Bugs or Errors Reported**
-            - What problems or technical issues are users facing?
-
-            **2. 💡 Feature Requests or Improvements**
-            - What new features or enhancements are users asking for?
-
-            **3. 🎯 Recurring Themes or Root Causes**
-            - Are there repeated complaints or related problems?
-
-            **4. ⚠ Severity & Impact**
-            - Are these issues minor annoyances or major blockers?
-
-            **5. 📌 Overall Insight**
-            - Summarize in 2–3 sentences what the issues suggest about the project's health.
-
-            Here are the issues:
-            {formatted_issues}
-            """
-        full_prompt = f"<|system|>\n{system_prompt}\n<|user|>\n{user_prompt}\n<|assistant|>"
-        response = self.model.generate_response(prompt=full_prompt, max_new_tokens=400, temperature=0.3)
-        
-        print("Saving response...", flush=True);
-        # self.repo.save_summary(self.repo_name, "issues", response)
-        self.repo.save_summary(self.repo_name, "issues", {
-            "metadata": metadata,
-            "summary": response
-        })
-    
-        print("Returning response!", flush=True);
-        return response
+        return self.summarize_batch([(owner, repo, "issues")], force)[0]
         
     # =======================================================================
     # For provided github repository, summarize latest pull requests
     # =======================================================================
-    def summarize_pull_requests(self, owner: str, repo: str) -> str:
+    def summarize_pull_requests(self, owner: str, repo: str, force: bool = False) -> str:
         print("", flush=True);
         print("summarize_pull_requests()", flush=True);
-                
-        print("Pulling data...", flush=True);
-        self.repo_name = f"{owner}/{repo}"  
-        pull_requests = get_pull_requests(owner, repo)
-        metadata = get_repo_metadata(owner, repo)
-
-        if not pull_requests:
-            print("⚠️ No pull requests found for this repository.", flush=True);
-            response = "⚠️ No pull requests found for this repository."
-            self.repo.save_summary(self.repo_name, "pulls", response)
-            return response
-        
-        print("Setting up model request and sending...", flush=True);
-        formatted_prs = "\n".join([f"- {pr}" for pr in pull_requests])
-        system_prompt = (
-            "You are an expert AI that summarizes GitHub pull requests "
-            "for developers, project maintainers, and stakeholders."
-        )
-        user_prompt = f"""
-            You are given a list of **open or recent pull requests** from the repository **{self.repo_name}**.
+        return self.summarize_batch([(owner, repo, "pulls")], force)[0]
 
-            Summarize them using the format below:
+    # =======================================================================
+    # For provided github repository, summarize readme, commits, issues and
+    # pull requests in one pass
+    # =======================================================================
+    def summarize_all(self, owner: str, repo: str, force: bool = False) -> dict:
+        """
+        One snapshot fetch, the four prompts decoded as one batch and all four
+        summary files written together, so a full analysis takes about as long
+        as its slowest mode. Returns {mode: summary}.
+        """
+        print("", flush=True);
+        print("summarize_all()", flush=True);
+        responses = self.summarize_batch([(owner, repo, mode) for mode in SUMMARY_MODES], force)
+        return dict(zip(SUMMARY_MODES, responses))
 
-            ### 🔄 Pull Request Summary
+    # =======================================================================
+    # Summarize several (owner, repo, mode) jobs with one batched generation
+    # =======================================================================
+    def summarize_batch(self, jobs: list, force: bool = False) -> list:
+        """
+        jobs: list of (owner, repo, mode) tuples, mode in SUMMARY_MODES.
+        All prompts are decoded together in one padded batch, so the readme,
+        commits, issues and pulls summaries of one or more repos share a
+        single forward pass per step. Returns responses in job order.
+        Stored summaries whose input fingerprint still matches are returned
+        as they are; force regenerates everything from a full fetch.
+        A job already being computed by another request is not repeated:
+        its result is shared (see in_flight).
+        """
+        keys = [(owner, repo, mode) for owner, repo, mode in jobs]
+        for key in keys:
+            self._check_mode(key[2])
+
+        results, pending = {}, list(dict.fromkeys(keys))
+        while pending:
+            owned, waiting = self.claim_jobs(pending, force)
+            if owned:
+                try:
+                    prepared = self.fetch_jobs([key for key, _ in owned], force)
+                    self.generate_jobs(prepared)
+                except BaseException as ex:
+                    self.settle_jobs(owned, error=ex)
+                    raise
+                responses = [job["response"] for job in prepared]
+                self.settle_jobs(owned, responses)
+                results.update(zip([key for key, _ in owned], responses))
+
+            shared, pending = self.await_jobs(waiting, force)
+            results.update(shared)
 
-            **1. 🎯 Purpose of Changes**
-            - What is each pull request trying to accomplish?
+        print("Returning response!", flush=True);
+        return [results[key] for key in keys]
 
-            **2. 🛠 Key Technical Changes**
-            - Are they adding new features, fixing bugs, refactoring code, or updating documentation?
+    # =======================================================================
+    # Coalescing through in_flight, also used by BatchRunner. A caller must
+    # settle the jobs it owns before it waits for others (await_jobs), so two
+    # callers never wait on each other.
+    # =======================================================================
+    def claim_jobs(self, jobs: list, force: bool = False) -> tuple:
+        """
+        Claim (owner, repo, mode) jobs. Returns (owned, waiting), both lists of
+        (key, call): owned jobs this caller computes and then settles with
+        settle_jobs; waiting jobs are being computed by another request.
+        """
+        owned, waiting = [], []
+        for key in dict.fromkeys(tuple(job) for job in jobs):
+            call, leader = in_flight.claim(key, force)
+            (owned if leader else waiting).append((key, call))
+        return owned, waiting
+
+    @staticmethod
+    def settle_jobs(owned: list, responses: list = None, error: BaseException = None):
+        """
+        Hand the outcome of owned jobs to the requests waiting for them:
+        their responses (same order) or the error that stopped them.
+        An interrupt (not an Exception) abandons them instead; a waiter takes over.
+        """
+        for i, (key, call) in enumerate(owned):
+            if isinstance(error, Exception):
+                in_flight.fail(key, call, error)
+            elif error is not None:
+                in_flight.abandon(key, call)
+            else:
+                in_flight.resolve(key, call, responses[i])
+
+    @staticmethod
+    def await_jobs(waiting: list, force: bool = False) -> tuple:
+        """
+        Wait for jobs computed by other requests. Returns ({key: response}, retry):
+        retry holds the keys to claim again (abandoned, or computed without force
+        while force was asked for). Raises the other request's error.
+        """
+        results, retry = {}, []
+        for key, call in waiting:
+            owner, repo, mode = key
+            try:
+                if force and not call.tag:
+                    call.wait()  # in flight without force; run again once it is done
+                    retry.append(key)
+                    continue
+                print(f"🔗 Waiting for the in-flight {mode} summary of {owner}/{repo}", flush=True);
+                results[key] = call.wait()
+            except AbandonedCall:
+                retry.append(key)
+        return results, retry
 
-            **3. ⚠ Risks or Breaking Changes**
-            - Could these PRs introduce side effects, large refactoring, or failure points?
+    # =======================================================================
+    # The two stages of summarize_batch, also run separately (and overlapped)
+    # by BatchRunner: GitHub fetch + prompt building, then generation + save
+    # =======================================================================
+    def fetch_jobs(self, jobs: list, force: bool = False) -> list:
+        """
+        Fetch the inputs of (owner, repo, mode) jobs and build their prompts.
+        Prompt token budgets are counted with the model's tokenizer, so the
+        first call waits until the model has loaded.
+        """
+        print("Pulling data...", flush=True);
+        wanted, marks, previous = {}, {}, {}
+        for owner, repo, mode in jobs:
+            self._check_mode(mode)
+            wanted.setdefault((owner, repo), set()).add(mode)
+            record = None if force else self._previous_record(f"{owner}/{repo}", mode)
+            if record:
+                previous[(owner, repo, mode)] = record
+                if record.get("high_water"):
+                    marks.setdefault((owner, repo), {})[mode] = record["high_water"]
+        # One concurrent fetch stage, metadata once per repo, only new items where a previous run left a mark
+        snapshots = get_repo_snapshots(wanted, marks)
+
+        return [
+            self._prepare_job(owner, repo, mode, snapshots[(owner, repo)], previous.get((owner, repo, mode)))
+            for owner, repo, mode in jobs
+        ]
+
+    def generate_jobs(self, prepared: list) -> list:
+        """Generate the summaries of prepared jobs as one batch and save them. Returns the jobs."""
+        pending = [job for job in prepared if job["prompt"] is not None]
+
+        if pending:
+            print(f"Setting up model request and sending ({len(pending)} prompt(s))...", flush=True);
+            budgets = [self.token_budget.max_new_tokens(job["mode"]) for job in pending]
+            responses = self.model.generate_batch(
+                [job["prompt"] for job in pending],
+                max_new_tokens=budgets,
+                temperature=0.3,
+                prefixes=[PROMPT_PREFIXES[job["mode"]] for job in pending],
+                stop_checks=[SectionStopper(job["mode"]) for job in pending]
+            )
+            for job, response, budget in zip(pending, responses, budgets):
+                self._finish_job(job, response, budget)
 
-            **4. ✅ Current Status or Review Notes**
-            - Are PRs approved, under review, or blocked?
+        print("Saving response...", flush=True);
+        for job in prepared:
+            self._save_job(job)
+        return prepared
 
-            **5. 📌 Overall Insight**
-            - Provide a short summary of the development direction.
+    # =======================================================================
+    # Stream one summary as text chunks, saving the full text at the end
+    # =======================================================================
+    def summarize_stream(self, owner: str, repo: str, mode: str, force: bool = False):
+        """
+        Generator yielding summary text chunks as the model decodes them.
+        The complete summary is saved once the stream finishes; the generator
+        returns it as saved (cleaned up by finalize_summary, so it can differ
+        from the joined chunks).
+        """
+        print("", flush=True);
+        print(f"summarize_stream({mode})", flush=True);
+        self._check_mode(mode)
+
+        key = (owner, repo, mode)
+        while True:
+            owned, waiting = self.claim_jobs([key], force)
+            if owned:
+                break
+            # Same summary is being generated for another request: wait and send it whole
+            shared, retry = self.await_jobs(waiting, force)
+            if not retry:
+                yield shared[key]
+                return shared[key]
+
+        try:
+            response = yield from self._stream_owned(owner, repo, mode, force)
+        except BaseException as ex:
+            self.settle_jobs(owned, error=ex)  # GeneratorExit (client went away) abandons
+            raise
+        self.settle_jobs(owned, [response])
+        return response
+
+    def _stream_owned(self, owner: str, repo: str, mode: str, force: bool):
+        """Body of summarize_stream for the request leading the computation; returns the summary."""
+        print("Pulling data...", flush=True);
+        record = None if force else self._previous_record(f"{owner}/{repo}", mode)
+        marks = {mode: record["high_water"]} if record and record.get("high_water") else None
+        job = self._prepare_job(owner, repo, mode, get_repo_snapshot(owner, repo, (mode,), marks), record)
+
+        if job["prompt"] is None:
+            yield job["response"]
+        else:
+            print("Streaming model response...", flush=True);
+            budget = self.token_budget.max_new_tokens(mode)
+            chunks = []
+            for chunk in self.model.stream(
+                job["prompt"],
+                max_new_tokens=budget,
+                temperature=0.3,
+                prefix=PROMPT_PREFIXES[mode],
+                stop_check=SectionStopper(mode)
+            ):
+                chunks.append(chunk)
+                yield chunk
+            self._finish_job(job, "".join(chunks), budget)
 
-            Here are the PRs to analyze:
-            {formatted_prs}
-            """
-        full_prompt = f"<|system|>\n{system_prompt}\n<|user|>\n{user_prompt}\n<|assistant|>"
-        response = self.model.generate_response(prompt=full_prompt, max_new_tokens=400, temperature=0.3)
-        
         print("Saving response...", flush=True);
-        # Changed from "pull_requests" to "pulls" to match API endpoint naming
-        self.repo.save_summary(self.repo_name, "pulls", {
-            "metadata": metadata,
-            "summary": response
-        })
-        
-        print("Returning response!", flush=True);
-        return response
-    
+        self._save_job(job)
+        return job["response"]
+
+    def _finish_job(self, job: dict, response: str, budget: int):
+        """
+        Record the output length for budget learning and store the cleaned-up
+        text (and its token count) on the job.
+        An output that used the whole budget was cut off, so its last line is dropped.
+        """
+        mode = job["mode"]
+        tokens = self.prompt_builder.count_tokens(response)
+        truncated = tokens >= budget - 1  # re-tokenizing may differ by a token
+        if truncated:
+            print(f"✂️ {mode} summary hit its {budget}-token budget", flush=True);
+        self.token_budget.record(mode, tokens, truncated)
+        job["output_tokens"] = tokens
+        job["response"] = finalize_summary(response, mode, truncated)
+
+    def _save_job(self, job: dict):
+        self.repo_name = job["repo_name"]
+        if job["unchanged"]:
+            return  # stored summary is still current
+        if job["prompt"] is None:
+            self.repo.save_summary(job["repo_name"], job["mode"], job["response"])
+        else:
+            self.repo.save_summary(job["repo_name"], job["mode"], {
+                "metadata": job["metadata"],
+                "summary": job["response"],
+                "high_water": job["high_water"],
+                "fingerprint": job["fingerprint"],
+                "version": job["version"]
+            })
+
+    def _previous_record(self, repo_name: str, mode: str):
+        """Stored summary record of the current model / prompt version, or None."""
+        file_path = os.path.join(self.repo.base_dir, repo_name, f"{mode}_summary.json")
+        if not os.path.exists(file_path):
+            return None
+        record = self.repo.load_summary(repo_name, mode)
+        if isinstance(record, dict) and record.get("summary") and record.get("version") == summary_version(mode):
+            return record
+        return None
+
+    def _check_mode(self, mode: str):
+        if mode not in SUMMARY_MODES:
+            raise ValueError(f"Unknown summary mode: {mode}")
+
+    def _prepare_job(self, owner: str, repo: str, mode: str, snapshot: dict, previous: dict = None) -> dict:
+        """
+        Build the prompt for one job from the repo snapshot (GitHub data
+        fetched up front, see GithubApi.get_repo_snapshot).
+        When there is nothing to summarize, prompt is None and response
+        already holds the message to store.
+        A previous record with the same input fingerprint is reused as it is
+        (unchanged=True). A previous record with a high-water mark means the
+        snapshot only holds what changed since; a delta prompt then updates
+        the previous summary.
+        """
+        repo_name = f"{owner}/{repo}"
+        version = summary_version(mode)
+        inputs = snapshot["inputs"].get(mode, [])
+        incremental = bool(previous and previous.get("high_water")) and mode != "readme"
+        if incremental and not inputs:
+            fingerprint = previous["fingerprint"]
+        else:
+            fingerprint = input_fingerprint(version, mode, inputs, previous["fingerprint"] if incremental else None)
+
+        job = {"repo_name": repo_name, "mode": mode, "metadata": snapshot["metadata"],
+               "prompt": None, "response": None, "unchanged": False, "output_tokens": 0,
+               "high_water": snapshot["high_water"].get(mode),
+               "fingerprint": fingerprint, "version": version}
+
+        if previous and previous.get("fingerprint") == fingerprint:
+            print(f"⏭️ {mode} inputs unchanged since the last summary of {repo_name}, skipping.", flush=True);
+            job["response"] = previous["summary"]
+            job["unchanged"] = True
+
+        elif incremental:
+            print(f"🔁 {len(snapshot[mode])} new {mode} item(s) since the last summary", flush=True);
+            job["prompt"] = self.prompt_builder.build_delta(mode, repo_name, previous["summary"], snapshot[mode])
+
+        elif mode == "readme":
+            job["prompt"] = self.prompt_builder.build_readme(job["metadata"], snapshot["readme"])
+
+        elif mode == "commits":
+            commits = snapshot["commits"]
+            if not commits:
+                print("⚠️ No commit data available to summarize.", flush=True);
+                job["response"] = "No commit data available to summarize."
+            else:
+                job["prompt"] = self.prompt_builder.build_commits(repo_name, commits)
+
+        elif mode == "issues":
+            issues = snapshot["issues"]
+            if not issues:
+                print("⚠️ No issues found for this repository.", flush=True);
+                job["response"] = "⚠️ No issues found for this repository."
+            else:
+                job["prompt"] = self.prompt_builder.build_issues(repo_name, issues)
+
+        else:
+            pull_requests = snapshot["pulls"]
+            if not pull_requests:
+                print("⚠️ No pull requests found for this repository.", flush=True);
+                job["response"] = "⚠️ No pull requests found for this repository."
+            else:
+                job["prompt"] = self.prompt_builder.build_pulls(repo_name, pull_requests)
+
+        return job
+
     # =======================================================================
     # Local load method to write out summaries (test only)
     # =======================================================================
@@ -289,20 +454,6 @@ class Summarizer:
 
 # local test run entry point
 if __name__ == "__main__":
-    print("🧠 Starting Summarizer", flush=True)
-
-    repos = get_repositories()
-    for repo_name in repos:
-        print(f"\n🚀 Processing {repo_name}\n", flush=True)
-        s = Summarizer(repo_name)
-
-        s.summarize_repo_readme()
-        s.load_summary("microsoft/vscode", "readme")
-        s.summarize_commits()
-        s.load_summary("microsoft/vscode", "commits")
-        s.summarize_issues()
-        s.load_summary("microsoft/vscode", "issues")
-        s.summarize_pull_requests()
-        s.load_summary("microsoft/vscode", "pull_requests")
-
-    
+    # Batch run over the tracked repositories (see BatchRunner for the options)
+    from BatchRunner import main
+    main()
@@ -0,0 +1,182 @@
+# SummaryJobs.py
+# ===========================================================
+# Background summarization jobs
+# -----------------------------------------------------------
+# - submit() queues a job and returns its id at once; a pool of
+#   worker tasks on the API event loop works through the queue
+# - Clients poll get() for status and result instead of holding a
+#   connection open for the whole generation
+# - cancel(): a queued job is dropped; a running job is detached
+#   (its result is discarded, but a generation that already started
+#   finishes in the background and keeps its slot until then, so no
+#   more than `workers` generations ever run at the same time)
+# - Finished jobs are kept for SUMMARY_JOB_RETENTION_SECONDS
+#
+# States: queued → running → completed | failed | cancelled
+# ===========================================================
+
+import asyncio
+import os
+import time
+import uuid
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+SUMMARY_JOB_WORKERS = int(os.getenv("SUMMARY_JOB_WORKERS", "2"))
+SUMMARY_JOB_MAX_QUEUED = int(os.getenv("SUMMARY_JOB_MAX_QUEUED", "100"))
+SUMMARY_JOB_RETENTION_SECONDS = float(os.getenv("SUMMARY_JOB_RETENTION_SECONDS", "3600"))
+
+FINISHED_STATES = ("completed", "failed", "cancelled")
+
+
+class JobQueueFullError(Exception):
+    pass
+
+
+class SummaryJobQueue:
+    def __init__(self,
+                 run: Callable[[dict], Awaitable[Any]],
+                 workers: int = SUMMARY_JOB_WORKERS,
+                 max_queued: int = SUMMARY_JOB_MAX_QUEUED,
+                 retention_seconds: float = SUMMARY_JOB_RETENTION_SECONDS):
+        self._run = run  # coroutine doing the work of one job (receives its params)
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+        self.retention_seconds = retention_seconds
+
+        self._jobs: Dict[str, dict] = {}
+        self._waiters: Dict[str, asyncio.Future] = {}  # job id → what its worker awaits
+        self._running: Set[asyncio.Task] = set()        # job work, including detached jobs
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._workers: List[asyncio.Task] = []
+
+    # -------------------------------------------------------
+    # Lifecycle (on the API event loop)
+    # -------------------------------------------------------
+    def start(self):
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._workers = [asyncio.create_task(self._worker(i), name=f"summary-job-worker-{i}")
+                         for i in range(self.workers)]
+        print(f"[JOBS] 🧵 {self.workers} summary job worker(s) started", flush=True)
+
+    async def stop(self):
+        for task in self._workers + list(self._running):
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    # -------------------------------------------------------
+    # Jobs
+    # -------------------------------------------------------
+    def submit(self, params: dict) -> dict:
+        """Queue a job; returns its public view (with the id to poll)."""
+        self._prune()
+        queued = sum(1 for job in self._jobs.values() if job["status"] == "queued")
+        if queued >= self.max_queued:
+            raise JobQueueFullError(f"{queued} jobs already queued, try again later")
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "params": params,
+            "status": "queued",
+            "result": None,
+            "error": None,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        self._jobs[job["id"]] = job
+        self._queue.put_nowait(job["id"])
+        return self.view(job)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        job = self._jobs.get(job_id)
+        return self.view(job) if job else None
+
+    def list(self) -> List[dict]:
+        self._prune()
+        return [self.view(job, with_result=False) for job in self._jobs.values()]
+
+    def cancel(self, job_id: str) -> Optional[dict]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if job["status"] not in FINISHED_STATES:
+            job["status"] = "cancelled"
+            job["finished_at"] = time.time()
+            waiter = self._waiters.get(job_id)
+            if waiter:
+                waiter.cancel()  # the worker stops waiting; the work itself runs on
+        return self.view(job)
+
+    def stats(self) -> dict:
+        counts = {}
+        for job in self._jobs.values():
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return {"workers": self.workers, "jobs": counts}
+
+    @staticmethod
+    def view(job: dict, with_result: bool = True) -> dict:
+        view = {key: value for key, value in job.items() if key != "result" or with_result}
+        if job["started_at"]:
+            end = job["finished_at"] or time.time()
+            view["elapsed_seconds"] = round(end - job["started_at"], 1)
+        if job["status"] == "queued":
+            view["queue_seconds"] = round(time.time() - job["created_at"], 1)
+        return view
+
+    # -------------------------------------------------------
+    # Workers
+    # -------------------------------------------------------
+    async def _worker(self, index: int):
+        while True:
+            job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] != "queued":
+                continue  # cancelled (or pruned) while waiting
+
+            # Wait for a slot: a detached (cancelled) job still holds one until its work ends
+            await self._slots.acquire()
+            if job["status"] != "queued":
+                self._slots.release()
+                continue  # cancelled while waiting for a slot
+
+            job["status"] = "running"
+            job["started_at"] = time.time()
+            work = asyncio.create_task(self._run(job["params"]))
+            self._running.add(work)
+            work.add_done_callback(self._work_done)
+            waiter = asyncio.shield(work)
+            self._waiters[job_id] = waiter
+            try:
+                result = await waiter
+                if job["status"] != "cancelled":  # cancel() may land after the work finished
+                    job["result"] = result
+                    job["status"] = "completed"
+            except asyncio.CancelledError:
+                if job["status"] != "cancelled":
+                    raise  # the worker itself is shutting down
+            except Exception as ex:
+                if job["status"] != "cancelled":
+                    job["status"] = "failed"
+                    job["error"] = str(ex)
+            finally:
+                self._waiters.pop(job_id, None)
+                job["finished_at"] = job["finished_at"] or time.time()
+            print(f"[JOBS] {job['status']}: {job_id} {job['params']}", flush=True)
+
+    def _work_done(self, work: asyncio.Task):
+        self._running.discard(work)
+        self._slots.release()
+        if not work.cancelled():
+            work.exception()  # retrieved here too, in case nobody awaits a detached job
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_seconds
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job["status"] in FINISHED_STATES and job["finished_at"] < cutoff]:
+            del self._jobs[job_id]
@@ -0,0 +1,7 @@
+# tests/conftest.py
+# McpSystem modules import each other as top-level modules (run from McpSystem/)
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,65 @@
+# tests/test_batch_runner.py
+
+import threading
+
+import pytest
+
+from BatchRunner import BatchRunner
+from DAL.BatchProgress_Repository import BatchProgressRepository
+
+
+class StubSummarizer:
+    """Summarizer stand-in: every job is 'generated' without GitHub or a model."""
+
+    def __init__(self, broken=()):
+        self.broken = set(broken)
+        self.fetched = []
+
+    def claim_jobs(self, jobs, force=False):
+        if jobs[0][1] in self.broken:
+            raise RuntimeError("claim failed")
+        return [(tuple(job), None) for job in jobs], []
+
+    def fetch_jobs(self, jobs, force=False):
+        self.fetched += jobs
+        return [{"prompt": "p", "unchanged": False, "output_tokens": 1, "response": "r"} for _ in jobs]
+
+    def generate_jobs(self, prepared):
+        return prepared
+
+    @staticmethod
+    def settle_jobs(owned, responses=None, error=None):
+        pass
+
+    @staticmethod
+    def await_jobs(waiting, force=False):
+        return {}, []
+
+
+def _run(summarizer, repositories, tmp_path):
+    runner = BatchRunner(summarizer=summarizer, progress=BatchProgressRepository(str(tmp_path)))
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(
+        runner.run(repositories, modes=("readme",), resume=False)), daemon=True)
+    thread.start()
+    thread.join(10)
+    assert not thread.is_alive(), "batch run hung"
+    return result
+
+
+def test_failed_claim_is_reported_instead_of_hanging(tmp_path):
+    report = _run(StubSummarizer(broken={"b"}), ["o/a", "o/b"], tmp_path)
+    assert report["succeeded"] == 1
+    assert "claim failed" in report["failed"]["o/b"]
+
+
+def test_repo_listed_twice_runs_once(tmp_path):
+    summarizer = StubSummarizer()
+    report = _run(summarizer, ["o/a", "o/a", "o/b"], tmp_path)
+    assert report["repos"] == 2
+    assert sorted(summarizer.fetched) == [("o", "a", "readme"), ("o", "b", "readme")]
+
+
+def test_names_without_owner_are_rejected_up_front(tmp_path):
+    with pytest.raises(ValueError, match="badname"):
+        BatchRunner(summarizer=StubSummarizer(), progress=BatchProgressRepository(str(tmp_path))).run(["badname"])
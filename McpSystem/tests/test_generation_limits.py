@@ -0,0 +1,42 @@
+# tests/test_generation_limits.py
+
+import json
+import os
+
+from GenerationLimits import SectionStopper, finalize_summary
+
+SUMMARIES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "summaries")
+
+
+def _stored_summary(repo_name: str, mode: str) -> str:
+    path = os.path.join(SUMMARIES_DIR, repo_name, f"{mode}_summary.json")
+    with open(path, "r", encoding="utf-8-sig") as f:
+        return json.load(f)["summary"]
+
+
+def test_finalize_keeps_stored_commits_summary():
+    # Section 1's only bullet mentions "new features or enhancements"; it is not a repeated heading
+    text = _stored_summary("openai/whisper", "commits")
+    assert finalize_summary(text, "commits", False) == text.rstrip()
+
+
+def test_stopper_runs_through_stored_commits_summary():
+    text = _stored_summary("openai/whisper", "commits")
+    stopper = SectionStopper("commits")
+    lines = text.split("\n")
+    for end in range(1, len(lines)):
+        assert not stopper("\n".join(lines[:end]) + "\n"), lines[end - 1]
+
+
+def test_stopper_ends_after_final_section():
+    text = _stored_summary("openai/whisper", "commits")
+    assert SectionStopper("commits")(text + "\n\n")
+
+
+def test_body_line_mentioning_final_section_is_not_its_heading():
+    text = ("**1. 🚀 New Features or Enhancements**\n"
+            "   - Mostly groundwork; the overall impact shows in the next release.\n"
+            "   - Plugin API drafted.\n"
+            "\n"
+            "**2. 🐛 Bug Fixes**\n")
+    assert not SectionStopper("commits")(text + "   - Fixed a crash.\n")
@@ -0,0 +1,74 @@
+# tests/test_github_api.py
+
+import asyncio
+
+import GithubApi
+
+
+def _pr(number: int, updated_at: str) -> dict:
+    return {"number": number, "title": f"pr {number}", "body": "", "updated_at": updated_at}
+
+
+def _serve(monkeypatch, items: list, calls: list = None):
+    async def paginate(endpoint, per_page, params=None):
+        if calls is not None:
+            calls.append(params)
+        for item in items:
+            yield item
+    monkeypatch.setattr(GithubApi, "_paginate_async", paginate)
+
+
+def test_mark_is_latest_server_update():
+    items = [{"number": 1, "updated_at": "2026-01-02T00:00:00Z"},
+             {"number": 2, "updated_at": "2026-01-05T00:00:00Z"},
+             {"number": 3, "updated_at": "2026-01-05T00:00:00Z"}]
+    assert GithubApi._updated_mark(items, None) == {"updated_at": "2026-01-05T00:00:00Z", "numbers": [2, 3]}
+
+
+def test_nothing_fetched_keeps_previous_mark():
+    previous = {"updated_at": "2026-01-05T00:00:00Z", "numbers": [2]}
+    assert GithubApi._updated_mark([], previous) is previous
+
+
+def test_items_at_the_mark_are_not_fetched_again(monkeypatch):
+    _serve(monkeypatch, [_pr(3, "2026-01-06T00:00:00Z"), _pr(2, "2026-01-05T00:00:00Z"),
+                         _pr(1, "2026-01-04T00:00:00Z")])
+    prs = asyncio.run(GithubApi.get_pull_request_items_async(
+        "o", "r", since="2026-01-05T00:00:00Z", seen={2}))
+    assert [pr["number"] for pr in prs] == [3]
+
+
+def test_truncated_pull_window_resumes_where_it_stopped(monkeypatch):
+    # 5 PRs updated since the mark, limit 2: the mark must not move past the 3 left out
+    updates = [_pr(n, f"2026-01-1{n}T00:00:00Z") for n in range(5, 0, -1)]
+    _serve(monkeypatch, updates)
+    mark, fetched = {"updated_at": "2026-01-01T00:00:00Z", "numbers": []}, []
+    for _ in range(3):
+        since, seen = GithubApi._split_updated_mark(mark)
+        prs = asyncio.run(GithubApi.get_pull_request_items_async("o", "r", limit=2, since=since, seen=seen))
+        fetched += [pr["number"] for pr in prs]
+        mark = GithubApi._updated_mark(prs, mark)
+    assert fetched == [1, 2, 3, 4, 5]
+
+
+def test_issue_delta_reads_oldest_update_first(monkeypatch):
+    calls = []
+    _serve(monkeypatch, [], calls)
+    asyncio.run(GithubApi.get_issue_items_async("o", "r", since="2026-01-01T00:00:00Z"))
+    assert calls[0]["direction"] == "asc"
+
+
+def test_older_string_marks_still_work():
+    assert GithubApi._split_updated_mark("2026-01-01T00:00:00Z") == ("2026-01-01T00:00:00Z", set())
+
+
+def test_missing_language_is_the_same_for_rest_and_graphql(monkeypatch):
+    async def request(endpoint, params=None):
+        return {"full_name": "o/r", "language": None}
+    monkeypatch.setattr(GithubApi, "_make_request", request)
+    rest = asyncio.run(GithubApi.get_repo_metadata_async("o", "r"))
+
+    node = {"nameWithOwner": "o/r", "primaryLanguage": None, "openIssues": {"totalCount": 0},
+            "openPulls": {"totalCount": 0}, "watchers": {"totalCount": 0}}
+    graphql = GithubApi._graphql_snapshot(node, ())["metadata"]
+    assert rest["language"] == graphql["language"] == ""
@@ -0,0 +1,59 @@
+# tests/test_github_rate_limiter.py
+
+import asyncio
+import time
+
+import httpx
+
+from GithubRateLimiter import CredentialBudget, RateLimitScheduler
+
+
+def _response(remaining: int, reset_in: float, limit: int = 60, status: int = 200) -> httpx.Response:
+    return httpx.Response(status, headers={
+        "x-ratelimit-limit": str(limit),
+        "x-ratelimit-remaining": str(remaining),
+        "x-ratelimit-reset": str(time.time() + reset_in),
+    })
+
+
+def test_anonymous_requests_are_not_paced_while_quota_is_left():
+    # 10 requests already spent, most of the window left: the next ones must go out at once
+    scheduler = RateLimitScheduler(max_wait_seconds=1)
+    scheduler.record("anonymous", _response(remaining=50, reset_in=3591))
+
+    async def burst():
+        for _ in range(40):
+            await scheduler.acquire("anonymous")
+
+    started = time.time()
+    asyncio.run(burst())
+    assert time.time() - started < 1
+    assert scheduler.budget("anonymous")["remaining"] == 10
+
+
+def test_reserve_is_spread_until_reset():
+    budget = CredentialBudget("anonymous", 60)
+    now = time.time()
+    budget.remaining = budget.reserve()
+    budget.reset_at = now + 100
+
+    assert budget.wait_seconds(now) == 0
+    budget.take(now)
+    wait = budget.wait_seconds(now)
+    assert abs(wait - 100 / (budget.reserve() - 1)) < 1
+
+
+def test_acquire_gives_up_when_reserve_wait_is_too_long():
+    scheduler = RateLimitScheduler(max_wait_seconds=1)
+    scheduler.record("anonymous", _response(remaining=2, reset_in=3000))
+
+    async def two():
+        await scheduler.acquire("anonymous")
+        await scheduler.acquire("anonymous")
+
+    try:
+        asyncio.run(two())
+    except Exception as ex:
+        assert "rate limit" in str(ex)
+    else:
+        raise AssertionError("second request should have been paced past max_wait_seconds")
@@ -0,0 +1,50 @@
+# tests/test_inference_pool.py
+
+import queue
+
+import pytest
+
+from InferencePool import InferencePool, _is_cancelled
+
+
+class _DeadProcess:
+    """Stands in for a worker that exited while loading without reporting."""
+    pid = 4242
+
+    def is_alive(self):
+        return False
+
+    def join(self, timeout=None):
+        pass
+
+    def terminate(self):
+        pass
+
+
+def test_silently_dead_worker_fails_start_and_resets_pool(monkeypatch):
+    monkeypatch.setattr("InferencePool._POLL_SECONDS", 0.01)
+    pool = InferencePool(workers=2)
+
+    def spawn():
+        pool._task_queue = queue.Queue()
+        pool._result_queue = queue.Queue()
+        pool._processes = [_DeadProcess(), _DeadProcess()]
+
+    monkeypatch.setattr(pool, "_spawn_workers", spawn)
+
+    with pytest.raises(RuntimeError, match="exited while loading"):
+        pool.start()
+    assert pool._processes == [] and pool._failure is None
+
+    # The failure is not sticky: a retry spawns a fresh set of workers
+    with pytest.raises(RuntimeError, match="exited while loading"):
+        pool.start()
+
+
+def test_cancel_only_matches_the_running_stream():
+    control = queue.Queue()
+    control.put(3)  # stale cancel for a stream that already finished
+    assert not _is_cancelled(control, 4)
+    control.put(4)
+    assert _is_cancelled(control, 4)
+    assert control.empty()
@@ -0,0 +1,55 @@
+# tests/test_model_warmup.py
+
+import time
+
+import pytest
+
+import ModelWarmup
+from ModelWarmup import ModelWarmup as Warmup
+
+
+def test_failed_load_is_retried_after_backoff(monkeypatch):
+    monkeypatch.setattr(ModelWarmup, "MODEL_WARMUP_RETRY_SECONDS", 0.1)
+    attempts = []
+
+    def load():
+        attempts.append(time.time())
+        if len(attempts) == 1:
+            raise MemoryError("out of memory")
+        return "model"
+
+    warmup = Warmup(load)
+    with pytest.raises(RuntimeError, match="out of memory"):
+        warmup.wait_ready(5)
+    with pytest.raises(RuntimeError):
+        warmup.wait_ready(5)  # still inside the backoff: no new attempt
+    assert len(attempts) == 1
+
+    time.sleep(0.15)
+    assert warmup.wait_ready(5) == "model"
+    assert warmup.status()["error"] is None
+    assert len(attempts) == 2
+
+
+def test_failed_load_calls_reset_before_retry(monkeypatch):
+    monkeypatch.setattr(ModelWarmup, "MODEL_WARMUP_RETRY_SECONDS", 0)
+    events = []
+
+    def load():
+        events.append("load")
+        if events.count("load") == 1:
+            raise RuntimeError("worker died")
+        return "model"
+
+    warmup = Warmup(load, reset=lambda: events.append("reset"))
+    with pytest.raises(RuntimeError, match="worker died"):
+        warmup.wait_ready(5)
+    assert warmup.wait_ready(5) == "model"
+    assert events == ["load", "reset", "load"]
+
+
+def test_status_reports_model_stats_once_ready():
+    warmup = Warmup(lambda: "model", stats=lambda model: {"model": model, "tokens_per_sec": 12.5})
+    assert warmup.status()["stats"] is None
+    warmup.wait_ready(5)
+    assert warmup.status()["stats"] == {"model": "model", "tokens_per_sec": 12.5}
@@ -0,0 +1,64 @@
+# tests/test_summary_jobs.py
+
+import asyncio
+import threading
+import time
+
+from SummaryJobs import SummaryJobQueue
+
+
+async def _until_finished(queue: SummaryJobQueue, job_id: str):
+    while queue.get(job_id)["status"] not in ("completed", "failed", "cancelled"):
+        await asyncio.sleep(0.01)
+    return queue.get(job_id)
+
+
+def test_cancel_after_work_finished_stays_cancelled():
+    async def scenario():
+        queue = None
+
+        async def run(params):
+            # cancel() lands after the work is done but before the worker picks up its result
+            asyncio.get_running_loop().call_soon(queue.cancel, params["id"])
+            return "summary"
+
+        queue = SummaryJobQueue(run=run, workers=1)
+        queue.start()
+        job = queue.submit({})
+        job["params"]["id"] = job["id"]
+        await _until_finished(queue, job["id"])
+        await asyncio.sleep(0.05)  # let the worker pick up the result
+        await queue.stop()
+        return queue.get(job["id"])
+
+    job = asyncio.run(scenario())
+    assert job["status"] == "cancelled"
+    assert job["result"] is None
+
+
+def test_cancelled_jobs_keep_their_slot_until_the_work_ends():
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def generate():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.2)
+        with lock:
+            running[0] -= 1
+
+    async def scenario():
+        queue = SummaryJobQueue(run=lambda params: asyncio.to_thread(generate), workers=2)
+        queue.start()
+        first = [queue.submit({})["id"] for _ in range(2)]
+        await asyncio.sleep(0.05)
+        for job_id in first:
+            queue.cancel(job_id)
+        second = [queue.submit({})["id"] for _ in range(2)]
+        results = [await _until_finished(queue, job_id) for job_id in second]
+        await queue.stop()
+        return results
+
+    results = asyncio.run(scenario())
+    assert [job["status"] for job in results] == ["completed", "completed"]
+    assert peak[0] == 2
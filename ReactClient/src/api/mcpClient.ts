@@ -51,6 +51,137 @@ export async function summarizePullRequests(
     return await postSummary('summarize/pulls', owner, repo);
 }
 
+// All four modes in one pass: one GitHub fetch and one batched generation on the server.
+// Runs as a background job, so no connection is held open while the model works.
+// data.result holds { readme, commits, issues, pulls }.
+export async function summarizeAll(
+    owner: string,
+    repo: string
+): Promise<SummaryResponse>
+{
+    const job = await submitJob("all", owner, repo);
+    const finished = await waitForJob(job.id);
+    return { status: "ok", data: { result: finished.result } };
+}
+
+// Background jobs: submit returns at once, then poll until the job has finished
+export interface SummaryJob
+{
+    id: string;
+    status: "queued" | "running" | "completed" | "failed" | "cancelled";
+    result?: any;
+    error?: string;
+}
+
+export async function submitJob(
+    mode: string,
+    owner: string,
+    repo: string
+): Promise<SummaryJob>
+{
+    const response = await fetch(`${API_BASE}/jobs`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ mode, owner, repo })
+    });
+
+    if (!response.ok) {
+        throw new Error(`Request failed: ${response.status} (jobs)`);
+    }
+
+    return (await response.json()).data as SummaryJob;
+}
+
+export async function waitForJob(id: string, intervalMs: number = 2000): Promise<SummaryJob>
+{
+    while (true) {
+        const response = await fetch(`${API_BASE}/jobs/${id}`);
+        if (!response.ok) {
+            throw new Error(`Request failed: ${response.status} (jobs/${id})`);
+        }
+
+        const job = (await response.json()).data as SummaryJob;
+        if (job.status === "completed") {
+            return job;
+        }
+        if (job.status === "failed" || job.status === "cancelled") {
+            throw new Error(job.error ?? `Job ${job.status}`);
+        }
+
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+}
+
+export async function cancelJob(id: string): Promise<SummaryJob>
+{
+    const response = await fetch(`${API_BASE}/jobs/${id}`, { method: "DELETE" });
+    return (await response.json()).data as SummaryJob;
+}
+
+// Streaming summarize (Server-Sent Events over a POST response body).
+// onToken receives each text chunk as it is decoded; resolves with the full summary.
+export async function streamSummary(
+    mode: string,
+    owner: string,
+    repo: string,
+    onToken: (text: string) => void
+): Promise<string>
+{
+    const response = await fetch(`${API_BASE}/summarize/${mode}/stream`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ owner, repo })
+    });
+
+    if (!response.ok || !response.body) {
+        throw new Error(`Request failed: ${response.status} (summarize/${mode}/stream)`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    let summary = "";
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) {
+            break;
+        }
+
+        buffer += decoder.decode(value, { stream: true });
+
+        // SSE events are separated by a blank line
+        let boundary = buffer.indexOf("\n\n");
+        while (boundary !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            boundary = buffer.indexOf("\n\n");
+
+            let eventName = "message";
+            let data = "";
+            for (const line of rawEvent.split("\n")) {
+                if (line.startsWith("event: ")) {
+                    eventName = line.slice(7);
+                } else if (line.startsWith("data: ")) {
+                    data += line.slice(6);
+                }
+            }
+
+            const payload = data ? JSON.parse(data) : {};
+            if (eventName === "token") {
+                summary += payload.text;
+                onToken(payload.text);
+            } else if (eventName === "done") {
+                summary = payload.summary;
+            } else if (eventName === "error") {
+                throw new Error(payload.message);
+            }
+        }
+    }
+
+    return summary;
+}
+
 // summary API methods
 export async function listSummaries()
 {
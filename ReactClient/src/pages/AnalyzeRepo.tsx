@@ -5,10 +5,8 @@ import { useState } from "react";
 import { useSearchParams } from "react-router-dom";
 import
     {
-        summarizeReadme,
-        summarizeCommits,
-        summarizeIssues,
-        summarizePullRequests
+        summarizeAll,
+        streamSummary
     } from "../api/mcpClient";
 
 type ModeType = "readme" | "commits" | "issues" | "pulls";
@@ -45,27 +43,22 @@ const AnalyzeRepo: FC = () =>
             return;
         }
 
-        let response: SummaryResponse;
-
-        switch (mode) {
-            case "readme":
-                response = await summarizeReadme(owner, repo);
-                break;
-            case "commits":
-                response = await summarizeCommits(owner, repo);
-                break;
-            case "issues":
-                response = await summarizeIssues(owner, repo);
-                break;
-            case "pulls":
-                response = await summarizePullRequests(owner, repo);
-                break;
-            default:
-                return;
-        }
-
-        setResult(response);
         setAllResults([]); // Clear all results when doing single analysis
+
+        // Stream tokens into the result panel as they are generated
+        let text = "";
+        setResult({ status: "streaming", data: { result: text } });
+
+        try {
+            const summary = await streamSummary(mode, owner, repo, (chunk) =>
+            {
+                text += chunk;
+                setResult({ status: "streaming", data: { result: text } });
+            });
+            setResult({ status: "ok", data: { result: summary } });
+        } catch (error) {
+            setResult({ status: "error", data: { result: String(error) } });
+        }
     }
 
     async function handleAnalyzeAll()
@@ -79,54 +72,28 @@ const AnalyzeRepo: FC = () =>
         setResult(null); // Clear single result
 
         const modes: ModeType[] = ["readme", "commits", "issues", "pulls"];
-        const initialResults: ModeResult[] = modes.map(m => ({ mode: m, status: "pending" as ModeStatus }));
-        setAllResults(initialResults);
-
-        // Process each mode serially with manual state tracking
-        const finalResults: ModeResult[] = [...initialResults];
-
-        for (let i = 0; i < modes.length; i++) {
-            const currentMode = modes[i];
-
-            // Update status to running
-            finalResults[i] = { ...finalResults[i], status: "running" };
-            setAllResults([...finalResults]);
-
-            // Add small delay to ensure state update is visible
-            await new Promise(resolve => setTimeout(resolve, 100));
-
-            try {
-                let response: SummaryResponse;
-
-                switch (currentMode) {
-                    case "readme":
-                        response = await summarizeReadme(owner, repo);
-                        break;
-                    case "commits":
-                        response = await summarizeCommits(owner, repo);
-                        break;
-                    case "issues":
-                        response = await summarizeIssues(owner, repo);
-                        break;
-                    case "pulls":
-                        response = await summarizePullRequests(owner, repo);
-                        break;
-                }
-
-                // Update with completed result
-                finalResults[i] = { ...finalResults[i], status: "completed", response };
-                setAllResults([...finalResults]);
-
-                // Auto-expand first completed result
-                if (i === 0) {
-                    setExpandedModes(new Set([currentMode]));
-                }
-
-            } catch (error) {
-                // Update with error
-                finalResults[i] = { ...finalResults[i], status: "error", error: String(error) };
-                setAllResults([...finalResults]);
-            }
+        // One request: the server fetches the repo once and generates all modes as one batch,
+        // so every mode is running until the combined result comes back
+        setAllResults(modes.map(m => ({ mode: m, status: "running" as ModeStatus })));
+
+        try {
+            const response = await summarizeAll(owner, repo);
+            const summaries = (response.data as any)?.result ?? {};
+            const error = (response.data as any)?.error;
+
+            setAllResults(modes.map(m => error
+                ? { mode: m, status: "error" as ModeStatus, error: String(error.message ?? error) }
+                : {
+                    mode: m,
+                    status: "completed" as ModeStatus,
+                    response: { status: response.status, data: { result: summaries[m] } }
+                }));
+
+            // Auto-expand first result
+            setExpandedModes(new Set([modes[0]]));
+
+        } catch (error) {
+            setAllResults(modes.map(m => ({ mode: m, status: "error" as ModeStatus, error: String(error) })));
         }
 
         setIsAnalyzingAll(false);